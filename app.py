@@ -1,5 +1,8 @@
 import streamlit as st
 
+from utils.metrics import start_metrics_server
+from utils.model_registry import start_prewarm, start_reload_watcher
+
 # -------------------------------------------------
 # PAGE CONFIG
 # -------------------------------------------------
@@ -8,6 +11,21 @@ st.set_page_config(
     layout="wide"
 )
 
+# -------------------------------------------------
+# METRICS ENDPOINT
+# -------------------------------------------------
+start_metrics_server()
+
+# -------------------------------------------------
+# PREWARM DOMAIN MODELS (BACKGROUND THREAD)
+# -------------------------------------------------
+start_prewarm()
+
+# -------------------------------------------------
+# HOT RELOAD OF PUBLISHED MODELS (BACKGROUND THREAD)
+# -------------------------------------------------
+start_reload_watcher()
+
 # -------------------------------------------------
 # Navigation helper
 # -------------------------------------------------
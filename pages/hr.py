@@ -1,22 +1,17 @@
 import streamlit as st
-import pandas as pd
-import joblib
-import os
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-# -------------------------------------------------
-# PAGE CONFIG
-# -------------------------------------------------
-st.set_page_config(
-    page_title="HR & Workforce Analytics",
-    layout="wide"
-)
+from utils.domain_page import DomainSpec, render_domain_page, probability_percent
+from utils.hr_preprocessing import CATEGORICAL_FEATURES, NUMERICAL_FEATURES
+from utils.lazy_imports import lazy_import
+
+# Charting libraries load on first chart, not on page open
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
 
 # -------------------------------------------------
 # DARK ML THEME (UI ONLY)
 # -------------------------------------------------
-st.markdown("""
+CSS = """
 <style>
 
 /* GLOBAL */
@@ -106,171 +101,100 @@ div[data-baseweb="menu"] * {
 }
 
 </style>
-""", unsafe_allow_html=True)
+"""
 
-# -------------------------------------------------
-# SESSION STATE
-# -------------------------------------------------
-for key in ["raw_df", "result_df", "prediction_done", "input_method"]:
-    if key not in st.session_state:
-        st.session_state[key] = None if key != "prediction_done" else False
 
 # -------------------------------------------------
-# LOAD MODEL & PREPROCESSOR
+# MANUAL ENTRY
 # -------------------------------------------------
-@st.cache_resource
-def load_artifacts():
-    model = joblib.load("models/hr_model.pkl")
-    preprocessor = joblib.load("models/hr_preprocessor.pkl")
-    return model, preprocessor
+def manual_form():
+    c1, c2 = st.columns(2)
 
-model, preprocessor = load_artifacts()
+    with c1:
+        age = st.number_input("Age", 18, 65, 30)
+        gender = st.selectbox("Gender", ["Male", "Female"])
+        department = st.selectbox("Department", ["IT", "HR", "Sales", "Finance", "Operations"])
+        job_role = st.text_input("Job Role", "Software Engineer")
 
-# -------------------------------------------------
-# HEADER
-# -------------------------------------------------
-st.title("HR & Workforce Analytics")
-st.write("Predict employee attrition and generate HR-ready insights.")
-st.divider()
-
-# -------------------------------------------------
-# INPUT METHOD
-# -------------------------------------------------
-input_method = st.radio(
-    "Select Data Input Method:",
-    ["Use Sample Dataset", "Manual Entry", "Upload CSV"]
-)
+    with c2:
+        income = st.number_input("Monthly Income", 10000, 200000, 40000)
+        satisfaction = st.selectbox("Job Satisfaction", [1, 2, 3, 4])
+        overtime = st.selectbox("OverTime", ["Yes", "No"])
+        years = st.number_input("Years at Company", 0, 40, 5)
 
-# RESET WHEN METHOD CHANGES
-if st.session_state.input_method != input_method:
-    st.session_state.raw_df = None
-    st.session_state.result_df = None
-    st.session_state.prediction_done = False
-    st.session_state.input_method = input_method
+    return {
+        "Age": age,
+        "Gender": gender,
+        "Department": department,
+        "JobRole": job_role,
+        "MonthlyIncome": income,
+        "JobSatisfaction": satisfaction,
+        "OverTime": overtime,
+        "YearsAtCompany": years
+    }
 
-st.divider()
 
 # -------------------------------------------------
-# OPTION 1: SAMPLE DATASET (FIXED)
+# PREDICTION COLUMNS
 # -------------------------------------------------
-if input_method == "Use Sample Dataset":
-    data_folder = "data"
-    csv_files = [f for f in os.listdir(data_folder) if f.endswith(".csv")] if os.path.exists(data_folder) else []
-
-    if not csv_files:
-        st.warning("No CSV files found in data/ folder.")
-    else:
-        selected_file = st.selectbox("Select sample dataset:", csv_files)
-
-        # 🔑 KEY FIX — button depends on selected file
-        if st.button("Load Sample Dataset", key=f"load_{selected_file}"):
-            st.session_state.raw_df = pd.read_csv(
-                os.path.join(data_folder, selected_file)
-            )
-            st.session_state.prediction_done = False
-            st.success(f"Loaded dataset: {selected_file}")
+def add_predictions(df, result):
+    df["Predicted Attrition"] = result.predictions
+    df["Attrition Probability (%)"] = probability_percent(result)
+    return df
 
-# -------------------------------------------------
-# OPTION 2: MANUAL ENTRY
-# -------------------------------------------------
-elif input_method == "Manual Entry":
-    with st.form("manual_form"):
-        c1, c2 = st.columns(2)
-
-        with c1:
-            age = st.number_input("Age", 18, 65, 30)
-            gender = st.selectbox("Gender", ["Male", "Female"])
-            department = st.selectbox("Department", ["IT", "HR", "Sales", "Finance", "Operations"])
-            job_role = st.text_input("Job Role", "Software Engineer")
-
-        with c2:
-            income = st.number_input("Monthly Income", 10000, 200000, 40000)
-            satisfaction = st.selectbox("Job Satisfaction", [1, 2, 3, 4])
-            overtime = st.selectbox("OverTime", ["Yes", "No"])
-            years = st.number_input("Years at Company", 0, 40, 5)
-
-        if st.form_submit_button("Add Employee"):
-            st.session_state.raw_df = pd.DataFrame([{
-                "Age": age,
-                "Gender": gender,
-                "Department": department,
-                "JobRole": job_role,
-                "MonthlyIncome": income,
-                "JobSatisfaction": satisfaction,
-                "OverTime": overtime,
-                "YearsAtCompany": years
-            }])
-            st.session_state.prediction_done = False
-            st.success("Employee data added.")
 
 # -------------------------------------------------
-# OPTION 3: CSV UPLOAD
+# VISUALS
 # -------------------------------------------------
-elif input_method == "Upload CSV":
-    uploaded = st.file_uploader("Upload HR CSV", type="csv")
+def render_results(df, input_method):
+    if input_method == "Manual Entry":
+        return df
 
-    if uploaded:
-        st.session_state.raw_df = pd.read_csv(uploaded)
-        st.session_state.prediction_done = False
-        st.success("CSV uploaded successfully.")
+    st.subheader("HR Visual Insights")
 
-# -------------------------------------------------
-# DATA PREVIEW
-# -------------------------------------------------
-if st.session_state.raw_df is None:
-    st.info("Please load data to continue.")
-    st.stop()
+    c1, c2 = st.columns(2)
 
-st.subheader("Data Preview")
-st.dataframe(st.session_state.raw_df, use_container_width=True)
+    with c1:
+        fig1, ax1 = plt.subplots()
+        df["Predicted Attrition"].value_counts().plot(
+            kind="bar", ax=ax1, color=["#22c55e", "#ef4444"]
+        )
+        ax1.set_title("Attrition Count")
+        st.pyplot(fig1)
 
-# -------------------------------------------------
-# RUN PREDICTION
-# -------------------------------------------------
-st.divider()
-if st.button("Run Attrition Prediction"):
-    X = st.session_state.raw_df.drop(columns=["Attrition"], errors="ignore")
-    Xp = preprocessor.transform(X)
+    with c2:
+        fig2, ax2 = plt.subplots()
+        sns.boxplot(data=df, x="Department", y="Attrition Probability (%)", ax=ax2)
+        ax2.set_title("Attrition Risk by Department")
+        st.pyplot(fig2)
 
-    df = st.session_state.raw_df.copy()
-    df["Predicted Attrition"] = model.predict(Xp)
-    df["Attrition Probability (%)"] = (model.predict_proba(Xp)[:, 1] * 100).round(2)
+    return df
 
-    st.session_state.result_df = df
-    st.session_state.prediction_done = True
-    st.success("Prediction completed successfully.")
 
 # -------------------------------------------------
-# RESULTS
+# PAGE
 # -------------------------------------------------
-if st.session_state.prediction_done:
-    df = st.session_state.result_df
-
-    st.subheader("Prediction Results")
-    st.dataframe(df, use_container_width=True)
-
-    if input_method != "Manual Entry":
-        st.subheader("HR Visual Insights")
-
-        c1, c2 = st.columns(2)
-
-        with c1:
-            fig1, ax1 = plt.subplots()
-            df["Predicted Attrition"].value_counts().plot(
-                kind="bar", ax=ax1, color=["#22c55e", "#ef4444"]
-            )
-            ax1.set_title("Attrition Count")
-            st.pyplot(fig1)
-
-        with c2:
-            fig2, ax2 = plt.subplots()
-            sns.boxplot(data=df, x="Department", y="Attrition Probability (%)", ax=ax2)
-            ax2.set_title("Attrition Risk by Department")
-            st.pyplot(fig2)
-
-    st.download_button(
-        "⬇️ Download HR Report (CSV)",
-        df.to_csv(index=False).encode("utf-8"),
-        file_name="hr_attrition_report.csv",
-        mime="text/csv"
-    )
\ No newline at end of file
+SPEC = DomainSpec(
+    domain="hr",
+    title="HR & Workforce Analytics",
+    description="Predict employee attrition and generate HR-ready insights.",
+    feature_columns=NUMERICAL_FEATURES + CATEGORICAL_FEATURES,
+    target_column="Attrition",
+    manual_form=manual_form,
+    add_predictions=add_predictions,
+    render_results=render_results,
+    css=CSS,
+    sample_select_label="Select sample dataset:",
+    sample_button_label="Load Sample Dataset",
+    sample_empty_message="No CSV files found in data/ folder.",
+    manual_submit_label="Add Employee",
+    manual_added_message="Employee data added.",
+    upload_label="Upload HR CSV",
+    upload_message="CSV uploaded successfully.",
+    run_button_label="Run Attrition Prediction",
+    run_message="Prediction completed successfully.",
+    download_label="⬇️ Download HR Report (CSV)",
+    download_file="hr_attrition_report.csv"
+)
+
+render_domain_page(SPEC)
@@ -1,22 +1,20 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import joblib
-import os
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-# -------------------------------------------------
-# PAGE CONFIG
-# -------------------------------------------------
-st.set_page_config(
-    page_title="Insurance Risk & Claims Analytics",
-    layout="wide"
-)
+from utils.domain_page import DomainSpec, render_domain_page, probability_percent
+from utils.insurance_preprocessing import CATEGORICAL_FEATURES, NUMERICAL_FEATURES
+from utils.lazy_imports import lazy_import
+from utils.model_registry import get_similarity
+
+# Charting libraries load on first chart, not on page open
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
 
 # -------------------------------------------------
 # DARK ML THEME + RETAIL STYLE BUTTONS
 # -------------------------------------------------
-st.markdown("""
+CSS = """
 <style>
 
 /* GLOBAL */
@@ -103,182 +101,78 @@ div[data-baseweb="menu"] * {
 }
 
 </style>
-""", unsafe_allow_html=True)
-
-# -------------------------------------------------
-# SESSION STATE
-# -------------------------------------------------
-for k in ["raw_df", "result_df", "prediction_done", "input_method"]:
-    if k not in st.session_state:
-        st.session_state[k] = None if k != "prediction_done" else False
-
-# -------------------------------------------------
-# LOAD MODEL & PREPROCESSOR
-# -------------------------------------------------
-@st.cache_resource
-def load_artifacts():
-    model = joblib.load("models/insurance_model.pkl")
-    preprocessor = joblib.load("models/insurance_preprocessor.pkl")
-    return model, preprocessor
-
-model, preprocessor = load_artifacts()
-
-# -------------------------------------------------
-# HEADER
-# -------------------------------------------------
-st.title("Insurance Risk & Claims Analytics")
-st.write("Detect potentially fraudulent insurance claims using machine learning.")
-st.divider()
-
-# -------------------------------------------------
-# INPUT METHOD
-# -------------------------------------------------
-input_method = st.radio(
-    "Select Data Input Method:",
-    ["Use Sample Dataset", "Manual Entry", "Upload CSV"]
-)
+"""
 
-if st.session_state.input_method != input_method:
-    st.session_state.raw_df = None
-    st.session_state.result_df = None
-    st.session_state.prediction_done = False
-    st.session_state.input_method = input_method
-
-st.divider()
-
-# -------------------------------------------------
-# SAMPLE DATASET
-# -------------------------------------------------
-if input_method == "Use Sample Dataset":
-    data_folder = "data"
-    files = [f for f in os.listdir(data_folder) if f.endswith(".csv")] if os.path.exists(data_folder) else []
-
-    if not files:
-        st.warning("No CSV files found.")
-    else:
-        selected = st.selectbox("Select dataset:", files)
-        if st.button("Load Dataset", key=f"insurance_load_{selected}"):
-            st.session_state.raw_df = pd.read_csv(os.path.join(data_folder, selected))
-            st.session_state.prediction_done = False
-            st.success(f"Loaded dataset: {selected}")
 
 # -------------------------------------------------
 # MANUAL ENTRY
 # -------------------------------------------------
-elif input_method == "Manual Entry":
-    with st.form("insurance_manual"):
-        c1, c2 = st.columns(2)
+def manual_form():
+    c1, c2 = st.columns(2)
 
-        with c1:
-            age = st.number_input("Age", 18, 80, 35)
-            gender = st.selectbox("Gender", ["Male", "Female"])
-            policy = st.selectbox("Policy Type", ["Comprehensive", "Third Party"])
-            vehicle = st.selectbox("Vehicle Type", ["Car", "Bike", "Truck"])
-
-        with c2:
-            severity = st.selectbox("Accident Severity", ["Low", "Medium", "High"])
-            claim_type = st.selectbox("Claim Type", ["Collision", "Theft", "Fire"])
-            amount = st.number_input("Claim Amount", 5000, 500000, 50000)
-            tenure = st.number_input("Policy Tenure", 1, 30, 5)
-            prev = st.number_input("Previous Claims", 0, 10, 0)
-
-        if st.form_submit_button("Add Claim"):
-            st.session_state.raw_df = pd.DataFrame([{
-                "Age": age,
-                "Gender": gender,
-                "PolicyType": policy,
-                "VehicleType": vehicle,
-                "AccidentSeverity": severity,
-                "ClaimType": claim_type,
-                "ClaimAmount": amount,
-                "PolicyTenure": tenure,
-                "PreviousClaims": prev
-            }])
-            st.session_state.prediction_done = False
-            st.success("Claim added successfully")
+    with c1:
+        age = st.number_input("Age", 18, 80, 35)
+        gender = st.selectbox("Gender", ["Male", "Female"])
+        policy = st.selectbox("Policy Type", ["Comprehensive", "Third Party"])
+        vehicle = st.selectbox("Vehicle Type", ["Car", "Bike", "Truck"])
 
-# -------------------------------------------------
-# CSV UPLOAD
-# -------------------------------------------------
-elif input_method == "Upload CSV":
-    file = st.file_uploader("Upload Insurance CSV", type="csv")
-    if file:
-        st.session_state.raw_df = pd.read_csv(file)
-        st.session_state.prediction_done = False
-        st.success("CSV uploaded successfully")
+    with c2:
+        severity = st.selectbox("Accident Severity", ["Low", "Medium", "High"])
+        claim_type = st.selectbox("Claim Type", ["Collision", "Theft", "Fire"])
+        amount = st.number_input("Claim Amount", 5000, 500000, 50000)
+        tenure = st.number_input("Policy Tenure", 1, 30, 5)
+        prev = st.number_input("Previous Claims", 0, 10, 0)
 
-# -------------------------------------------------
-# DATA PREVIEW
-# -------------------------------------------------
-if st.session_state.raw_df is None:
-    st.info("Please load data to continue.")
-    st.stop()
+    return {
+        "Age": age,
+        "Gender": gender,
+        "PolicyType": policy,
+        "VehicleType": vehicle,
+        "AccidentSeverity": severity,
+        "ClaimType": claim_type,
+        "ClaimAmount": amount,
+        "PolicyTenure": tenure,
+        "PreviousClaims": prev
+    }
 
-st.subheader("Data Preview")
-st.dataframe(st.session_state.raw_df, use_container_width=True)
 
 # -------------------------------------------------
-# RUN PREDICTION (SAFE)
+# PREDICTION COLUMNS
 # -------------------------------------------------
-st.divider()
-
-if st.button("Run Prediction"):
-    df = st.session_state.raw_df.copy()
-    X = df.drop(columns=["Fraud"], errors="ignore")
-
-    Xp = preprocessor.transform(X)
-    preds = model.predict(Xp)
+def add_predictions(df, result):
+    df["Fraud Prediction"] = result.predictions
+    df["Fraud Probability (%)"] = probability_percent(result)
 
-    df["Fraud Prediction"] = preds
+    # Fraud rings: clusters of near-identical claims in the claim history
+    index = get_similarity("insurance")
+    if index is not None:
+        ids, _, density = index.query(df)
+        df["Claim Cluster Density"] = density.round(2)
+        df["Most Similar Past Claims"] = [", ".join(str(i) for i in row if i >= 0) for row in ids]
 
-    # 🔒 SAFE probability (no multi_class crash)
-    if hasattr(model, "predict_proba") and Xp.shape[0] > 0:
-        try:
-            df["Fraud Probability (%)"] = (model.predict_proba(Xp)[:, 1] * 100).round(2)
-        except Exception:
-            df["Fraud Probability (%)"] = 0.0
-    else:
-        df["Fraud Probability (%)"] = 0.0
+    return df
 
-    st.session_state.result_df = df
-    st.session_state.prediction_done = True
-    st.success("Prediction completed successfully")
 
 # -------------------------------------------------
-# RESULTS + INSIGHTS + VISUALS
+# INSIGHTS + VISUALS
 # -------------------------------------------------
-if st.session_state.prediction_done:
-    df = st.session_state.result_df.copy()
+def risk_bucket(probability):
+    return pd.cut(
+        probability,
+        bins=[-np.inf, 30, 70, np.inf],
+        right=False,
+        labels=["Low Risk", "Medium Risk", "High Risk"]
+    ).astype(str)
 
-    st.subheader("Prediction Results")
-    st.dataframe(df, use_container_width=True)
+
+def render_results(df, input_method):
+    df = df.copy()
 
     # ---------------- BUSINESS INSIGHTS
     st.divider()
     st.subheader("Insurance Business Insights")
 
-    def risk_bucket(p):
-        if p < 30:
-            return "Low Risk"
-        elif p < 70:
-            return "Medium Risk"
-        return "High Risk"
-
-    df["Risk Category"] = df["Fraud Probability (%)"].apply(risk_bucket)
-
-    def explain(row):
-        reasons = []
-        if row["ClaimAmount"] > 100000:
-            reasons.append("High claim amount")
-        if row["AccidentSeverity"] == "High":
-            reasons.append("Severe accident")
-        if row["PreviousClaims"] >= 2:
-            reasons.append("Multiple past claims")
-        if row["PolicyTenure"] <= 2:
-            reasons.append("Short policy tenure")
-        return ", ".join(reasons) if reasons else "No major risk indicators"
-
-    df["Why This Claim Is Risky"] = df.apply(explain, axis=1)
+    df["Risk Category"] = risk_bucket(df["Fraud Probability (%)"])
 
     st.dataframe(
         df[[
@@ -320,10 +214,31 @@ if st.session_state.prediction_done:
             ax2.set_ylabel("Avg Fraud Probability (%)")
             st.pyplot(fig2)
 
-    # ---------------- DOWNLOAD
-    st.download_button(
-        "⬇️ Download Insurance Report",
-        df.to_csv(index=False).encode("utf-8"),
-        file_name="insurance_fraud_report.csv",
-        mime="text/csv"
-    )
+    return df
+
+
+# -------------------------------------------------
+# PAGE
+# -------------------------------------------------
+SPEC = DomainSpec(
+    domain="insurance",
+    title="Insurance Risk & Claims Analytics",
+    description="Detect potentially fraudulent insurance claims using machine learning.",
+    feature_columns=NUMERICAL_FEATURES + CATEGORICAL_FEATURES,
+    target_column="Fraud",
+    manual_form=manual_form,
+    add_predictions=add_predictions,
+    render_results=render_results,
+    explain_column="Why This Claim Is Risky",
+    explain_empty="No major risk indicators",
+    css=CSS,
+    sample_empty_message="No CSV files found.",
+    manual_form_key="insurance_manual",
+    manual_submit_label="Add Claim",
+    manual_added_message="Claim added successfully",
+    upload_label="Upload Insurance CSV",
+    download_label="⬇️ Download Insurance Report",
+    download_file="insurance_fraud_report.csv"
+)
+
+render_domain_page(SPEC)
@@ -1,20 +1,18 @@
 import streamlit as st
-import pandas as pd
-import joblib
-import os
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-# -------------------------------------------------
-# PAGE CONFIG
-# -------------------------------------------------
-st.set_page_config(page_title="Retail & E-Commerce Intelligence", layout="wide")
+from utils.domain_page import DomainSpec, render_domain_page, probability_percent
+from utils.lazy_imports import lazy_import
+from utils.retail_preprocessing import CATEGORICAL_FEATURES, NUMERICAL_FEATURES
+
+# Charting libraries load on first chart, not on page open
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
 
 # -------------------------------------------------
 # DARK ML THEME
 # -------------------------------------------------
-st.markdown("""
+CSS = """
 <style>
 .stApp { background: #020617; color: #e5e7eb; }
 [data-testid="stSidebar"] { display: none; }
@@ -38,144 +36,50 @@ div[data-testid="stForm"] {
     border: 1px solid rgba(56,189,248,0.45);
 }
 </style>
-""", unsafe_allow_html=True)
-
-# -------------------------------------------------
-# SESSION STATE
-# -------------------------------------------------
-for k in ["raw_df", "result_df", "prediction_done", "input_method"]:
-    if k not in st.session_state:
-        st.session_state[k] = None if k != "prediction_done" else False
-
-# -------------------------------------------------
-# LOAD MODEL
-# -------------------------------------------------
-@st.cache_resource
-def load_artifacts():
-    return (
-        joblib.load("models/retail_model.pkl"),
-        joblib.load("models/retail_preprocessor.pkl")
-    )
-
-model, preprocessor = load_artifacts()
+"""
 
-# -------------------------------------------------
-# UTILS
-# -------------------------------------------------
-def sigmoid(x):
-    return 1 / (1 + np.exp(-x))
-
-# -------------------------------------------------
-# HEADER
-# -------------------------------------------------
-st.title("Retail & E-Commerce Intelligence")
-st.write("Predict high-performing products using machine learning.")
-st.divider()
-
-# -------------------------------------------------
-# INPUT METHOD
-# -------------------------------------------------
-input_method = st.radio(
-    "Select Data Input Method:",
-    ["Use Sample Dataset", "Manual Entry", "Upload CSV"]
-)
-
-if st.session_state.input_method != input_method:
-    st.session_state.raw_df = None
-    st.session_state.prediction_done = False
-    st.session_state.input_method = input_method
-
-st.divider()
-
-# -------------------------------------------------
-# SAMPLE DATA
-# -------------------------------------------------
-if input_method == "Use Sample Dataset":
-    files = [f for f in os.listdir("data") if f.endswith(".csv")]
-    selected = st.selectbox("Select dataset:", files)
-    if st.button("Load Dataset"):
-        st.session_state.raw_df = pd.read_csv(f"data/{selected}")
-        st.session_state.prediction_done = False
-        st.success("Dataset loaded")
 
 # -------------------------------------------------
 # MANUAL ENTRY
 # -------------------------------------------------
-elif input_method == "Manual Entry":
-    with st.form("retail_manual"):
-        c1, c2 = st.columns(2)
-        with c1:
-            category = st.selectbox("Category", ["Electronics","Clothing","Grocery","Home","Beauty"])
-            region = st.selectbox("Region", ["North","South","East","West"])
-            season = st.selectbox("Season", ["Regular","Festival","Off-Season"])
-            price = st.number_input("Price", 100, 10000, 2000)
-        with c2:
-            discount = st.selectbox("Discount (%)", [0,5,10,20,30])
-            marketing = st.number_input("Marketing Spend", 500, 100000, 10000)
-            units = st.number_input("Units Sold", 1, 1000, 100)
-
-        if st.form_submit_button("Add Product"):
-            revenue = price * units * (1 - discount/100)
-            st.session_state.raw_df = pd.DataFrame([{
-                "Category": category,
-                "Region": region,
-                "Season": season,
-                "Price": price,
-                "DiscountPercent": discount,
-                "MarketingSpend": marketing,
-                "UnitsSold": units,
-                "Revenue": revenue
-            }])
-            st.session_state.prediction_done = False
+def manual_form():
+    c1, c2 = st.columns(2)
+    with c1:
+        category = st.selectbox("Category", ["Electronics","Clothing","Grocery","Home","Beauty"])
+        region = st.selectbox("Region", ["North","South","East","West"])
+        season = st.selectbox("Season", ["Regular","Festival","Off-Season"])
+        price = st.number_input("Price", 100, 10000, 2000)
+    with c2:
+        discount = st.selectbox("Discount (%)", [0,5,10,20,30])
+        marketing = st.number_input("Marketing Spend", 500, 100000, 10000)
+        units = st.number_input("Units Sold", 1, 1000, 100)
 
-# -------------------------------------------------
-# CSV UPLOAD
-# -------------------------------------------------
-elif input_method == "Upload CSV":
-    file = st.file_uploader("Upload Retail CSV", type="csv")
-    if file:
-        st.session_state.raw_df = pd.read_csv(file)
-        st.session_state.prediction_done = False
+    revenue = price * units * (1 - discount/100)
+    return {
+        "Category": category,
+        "Region": region,
+        "Season": season,
+        "Price": price,
+        "DiscountPercent": discount,
+        "MarketingSpend": marketing,
+        "UnitsSold": units,
+        "Revenue": revenue
+    }
 
-# -------------------------------------------------
-# DATA PREVIEW
-# -------------------------------------------------
-if st.session_state.raw_df is None:
-    st.stop()
-
-st.subheader("Data Preview")
-st.dataframe(st.session_state.raw_df, use_container_width=True)
 
 # -------------------------------------------------
-# RUN PREDICTION (FIXED)
+# PREDICTION COLUMNS
 # -------------------------------------------------
-st.divider()
-st.subheader("Sales Prediction")
-
-if st.button("Run Prediction"):
-    df = st.session_state.raw_df.copy()
-    Xp = preprocessor.transform(df)
-
-    preds = model.predict(Xp)
-    scores = model.decision_function(Xp)
-    probs = sigmoid(scores)
-
-    df["High Sales Prediction"] = ["Yes" if p==1 else "No" for p in preds]
-    df["High Sales Probability (%)"] = (probs*100).round(2)
+def add_predictions(df, result):
+    df["High Sales Prediction"] = np.where(result.predictions == 1, "Yes", "No")
+    df["High Sales Probability (%)"] = probability_percent(result)
+    return df
 
-    st.session_state.result_df = df
-    st.session_state.prediction_done = True
-    st.success("Prediction completed")
 
 # -------------------------------------------------
-# RESULTS + VISUALS
+# VISUALS
 # -------------------------------------------------
-if st.session_state.prediction_done:
-    df = st.session_state.result_df
-
-    st.subheader("Prediction Results")
-    st.dataframe(df, use_container_width=True)
-
+def render_results(df, input_method):
     st.subheader("Visual Insights")
     c1, c2 = st.columns(2)
 
@@ -190,9 +94,32 @@ if st.session_state.prediction_done:
         sns.boxplot(data=df, x="Category", y="Revenue", ax=ax)
         st.pyplot(fig)
 
-    st.download_button(
-        "⬇️ Download Retail Report",
-        df.to_csv(index=False).encode(),
-        "retail_report.csv",
-        "text/csv"
-    )
+    return df
+
+
+# -------------------------------------------------
+# PAGE
+# -------------------------------------------------
+SPEC = DomainSpec(
+    domain="retail",
+    title="Retail & E-Commerce Intelligence",
+    description="Predict high-performing products using machine learning.",
+    feature_columns=NUMERICAL_FEATURES + CATEGORICAL_FEATURES,
+    target_column="HighSales",
+    manual_form=manual_form,
+    add_predictions=add_predictions,
+    render_results=render_results,
+    css=CSS,
+    sample_loaded_message="Dataset loaded",
+    manual_form_key="retail_manual",
+    manual_submit_label="Add Product",
+    upload_label="Upload Retail CSV",
+    upload_message=None,
+    empty_message=None,
+    prediction_title="Sales Prediction",
+    run_message="Prediction completed",
+    download_label="⬇️ Download Retail Report",
+    download_file="retail_report.csv"
+)
+
+render_domain_page(SPEC)
@@ -0,0 +1,90 @@
+"""
+Batch throughput of a model cascade (utils/cascade.py) against its
+heavy model alone, on a synthetic fraud-like feed: mostly clearly
+benign rows, a few percent positives.
+
+The cheap Logistic Regression and each heavy model are fitted on the
+same split, the band is tuned on the training rows as the training
+modules do, and the test rows are tiled to BENCH_ROWS for timing.
+
+Usage: python scripts/benchmark_cascade.py
+       BENCH_ROWS=500000 BENCH_TRAIN_ROWS=50000 python scripts/benchmark_cascade.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+# -------------------------------------------------
+# Fix path so utils/ is found
+# -------------------------------------------------
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+import xgboost
+
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score
+from sklearn.model_selection import train_test_split
+
+from utils.cascade import build_cascade, routed_share
+
+ROWS = int(os.environ.get("BENCH_ROWS", "200000"))
+TRAIN_ROWS = int(os.environ.get("BENCH_TRAIN_ROWS", "20000"))
+
+
+def _seconds(fn, X):
+    start = time.perf_counter()
+    fn(X)
+    return time.perf_counter() - start
+
+
+def main():
+    X, y = make_classification(
+        n_samples=int(TRAIN_ROWS / 0.8),
+        n_features=20,
+        n_informative=8,
+        n_clusters_per_class=2,
+        weights=[0.96],
+        flip_y=0.01,
+        class_sep=1.0,
+        random_state=0
+    )
+    y = np.where(y == 1, "Yes", "No")
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
+    y_bin = (y_train == "Yes").astype(int)
+    batch = np.resize(X_test, (ROWS, X_test.shape[1]))
+
+    cheap = LogisticRegression(max_iter=1000).fit(X_train, y_train)
+    heavies = {
+        "Random Forest (200)": RandomForestClassifier(n_estimators=200, random_state=42, n_jobs=-1).fit(X_train, y_train),
+        "XGBoost (200)": xgboost.XGBClassifier(n_estimators=200, max_depth=6, random_state=42).fit(X_train, y_bin)
+    }
+
+    print(f"{len(X_train)} training rows, batch of {ROWS} rows\n")
+    print(f"{'heavy model':<22}{'band':>14}{'routed':>9}{'heavy F1':>10}{'cascade F1':>12}{'heavy s':>10}{'cascade s':>11}{'gain':>7}")
+
+    for name, heavy in heavies.items():
+        cascade = build_cascade(cheap, heavy, X_train, y_train)
+
+        heavy_pred = np.asarray(heavy.predict(X_test))
+        if heavy_pred.dtype != y_test.dtype:
+            heavy_pred = np.where(heavy_pred == 1, "Yes", "No")
+
+        heavy_seconds = _seconds(heavy.predict_proba, batch)
+        cascade_seconds = _seconds(cascade.predict_proba, batch)
+
+        band = f"{cascade.low:.2f}-{cascade.high:.2f}"
+        print(
+            f"{name:<22}{band:>14}{routed_share(cascade, X_test):>9.1%}"
+            f"{f1_score(y_test, heavy_pred, pos_label='Yes'):>10.3f}"
+            f"{f1_score(y_test, cascade.predict(X_test), pos_label='Yes'):>12.3f}"
+            f"{heavy_seconds:>10.2f}{cascade_seconds:>11.2f}{heavy_seconds / cascade_seconds:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark the experimental flattened tree evaluator (scripts/flat_trees.py)
+against each model's own predict() on batches of 10k - 1M rows.
+
+Rows are the domain's transformed dataset tiled to the batch size.
+Every run also checks that both give the same predictions.
+
+Usage: python scripts/benchmark_flat_trees.py
+       BENCH_ROWS=10000,100000 python scripts/benchmark_flat_trees.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# -------------------------------------------------
+# Fix path so utils/ is found
+# -------------------------------------------------
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.tree import DecisionTreeClassifier
+
+from scripts.compute_importances import DATASETS
+from scripts.flat_trees import flatten
+from utils.artifacts import current_dir, load_domain_artifacts
+from utils.distillation import distill
+from utils.lazy_imports import lazy_import
+
+xgboost = lazy_import("xgboost")
+
+ROWS = [int(n) for n in os.environ.get("BENCH_ROWS", "10000,100000,1000000").split(",")]
+
+
+def _load(domain):
+    path, target = DATASETS[domain]
+    model, preprocessor = load_domain_artifacts(domain, current_dir(domain))
+
+    df = pd.read_csv(path)
+    X = preprocessor.transform(df.drop(columns=[target]))
+    X = X.toarray() if sp.issparse(X) else np.asarray(X, dtype=float)
+    return model, preprocessor, X, df[target]
+
+
+def _models():
+    """
+    (label, model, transformed rows): tree models fitted on the supply
+    chain and banking data with the live preprocessors, plus the supply
+    chain forest's distilled student. The live model is not used, since
+    model selection may have picked a linear one.
+    """
+    _, preprocessor, X_supply, y_supply = _load("supply_chain")
+    forest = RandomForestRegressor(n_estimators=200, random_state=42, n_jobs=-1).fit(X_supply, y_supply)
+    yield "supply_chain RandomForest", forest, X_supply
+    yield "supply_chain GradientBoosting (student)", distill(forest, preprocessor, X_supply), X_supply
+
+    _, _, X_bank, y = _load("banking")
+    y = y.astype(str)
+    yield "banking DecisionTree", DecisionTreeClassifier(random_state=42).fit(X_bank, y), X_bank
+    yield "banking RandomForest", RandomForestClassifier(n_estimators=200, random_state=42).fit(X_bank, y), X_bank
+    yield "banking XGBoost", xgboost.XGBClassifier(
+        n_estimators=200,
+        max_depth=6,
+        learning_rate=0.1,
+        eval_metric="logloss",
+        random_state=42
+    ).fit(X_bank, (y == "Yes").astype(int)), X_bank
+
+
+def _timed(predict, X):
+    start = time.perf_counter()
+    output = predict(X)
+    return output, time.perf_counter() - start
+
+
+def main():
+    print(f"{'model':<42}{'rows':>10}{'predict s':>12}{'flat s':>10}{'speedup':>9}  outputs")
+
+    for label, model, X in _models():
+        flat = flatten(model)
+        predict = model.predict_proba if hasattr(model, "predict_proba") else model.predict
+        flat_predict = flat.predict_proba if hasattr(model, "predict_proba") else flat.predict
+
+        for n_rows in ROWS:
+            batch = np.ascontiguousarray(np.resize(X, (n_rows, X.shape[1])))
+
+            expected, seconds = _timed(predict, batch)
+            actual, flat_seconds = _timed(flat_predict, batch)
+            diff = float(np.abs(np.asarray(expected, dtype=float) - actual).max())
+
+            print(
+                f"{label:<42}{n_rows:>10}{seconds:>12.3f}{flat_seconds:>10.3f}"
+                f"{seconds / flat_seconds:>8.2f}x  {'identical' if diff == 0 else f'max diff {diff:.1e}'}"
+            )
+
+
+if __name__ == "__main__":
+    main()
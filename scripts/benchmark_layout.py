@@ -0,0 +1,111 @@
+"""
+Allocations per scoring batch before and after utils/matrix_layout.py:
+each domain's live preprocessor & model transform and predict one
+batch as saved (before) and with the model's layout set (after).
+
+Memory is traced with tracemalloc (NumPy & SciPy buffers; XGBoost's
+own C++ buffers are not visible to it). Every run also checks that
+both give the same predictions.
+
+Usage: python scripts/benchmark_layout.py [domain ...]
+       BENCH_ROWS=100000 python scripts/benchmark_layout.py
+"""
+import os
+import sys
+import copy
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# -------------------------------------------------
+# Fix path so utils/ is found
+# -------------------------------------------------
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+from sklearn.base import is_classifier
+
+from scripts.compute_importances import DATASETS
+from utils.artifacts import current_dir, load_domain_artifacts
+from utils.matrix_layout import set_layout, transform_batch
+from utils.scoring import DEFAULT_CHUNK_ROWS, positive_probability
+
+ROWS = int(os.environ.get("BENCH_ROWS", str(DEFAULT_CHUNK_ROWS)))
+
+
+def _nbytes(X):
+    if sp.issparse(X):
+        return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+    return X.nbytes
+
+
+def _traced(fn):
+    """
+    Result, seconds and peak traced MB of fn().
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak / 1e6
+
+
+def _score(model, preprocessor, batch):
+    """
+    One scoring batch as utils.scoring runs it; peak MB of the predict
+    step alone and of transform + predict, plus the matrix size.
+    """
+    Xp, transform_seconds, transform_peak = _traced(lambda: transform_batch(preprocessor, batch))
+
+    def predict():
+        predictions = model.predict(Xp)
+        if is_classifier(model):
+            positive_probability(model, Xp)
+        return predictions
+
+    predictions, predict_seconds, predict_peak = _traced(predict)
+    return {
+        "predictions": np.asarray(predictions),
+        "matrix_mb": _nbytes(Xp) / 1e6,
+        "predict_mb": predict_peak,
+        "peak_mb": max(transform_peak, _nbytes(Xp) / 1e6 + predict_peak),
+        "seconds": transform_seconds + predict_seconds
+    }
+
+
+def main(domains):
+    print(f"batch of {ROWS} rows; MB traced by tracemalloc\n")
+    print(
+        f"{'domain':<13}{'model':<24}{'layout':<22}{'matrix MB':>14}"
+        f"{'predict MB':>16}{'peak MB':>16}{'seconds':>16}  outputs"
+    )
+
+    for domain in domains:
+        path, target = DATASETS[domain]
+        model, preprocessor = load_domain_artifacts(domain, current_dir(domain))
+
+        frame = pd.read_csv(path).drop(columns=[target])
+        batch = frame.iloc[np.resize(np.arange(len(frame)), ROWS)].reset_index(drop=True)
+
+        laid_out = copy.deepcopy(preprocessor)
+        layout = set_layout(laid_out, model, preprocessor.transform(frame))
+
+        before = _score(model, preprocessor, batch)
+        after = _score(model, laid_out, batch)
+
+        same = np.array_equal(before["predictions"], after["predictions"])
+        name = f"{layout['dtype']} {'csr' if layout['sparse'] else 'dense'} ({layout['density']:.2f})"
+        pairs = "".join(
+            f"{before[k]:>{w - 8}.{digits}f} -> {after[k]:<4.{digits}f}"
+            for k, w, digits in (("matrix_mb", 14, 1), ("predict_mb", 16, 1), ("peak_mb", 16, 1), ("seconds", 16, 2))
+        )
+        print(f"{domain:<13}{type(model).__name__:<24}{name:<22}{pairs}  {'identical' if same else 'DIFFERENT'}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or list(DATASETS))
@@ -0,0 +1,140 @@
+"""
+Claim similarity index (utils/similarity.py) over a synthetic book of
+insurance claims: the sample claims resampled with jittered numbers to
+BENCH_CLAIMS rows, plus a planted ring of near-identical claims.
+
+Reports build time, query latency (batched and one claim at a time),
+insert & rebuild costs, and the cluster density of the ring's claims
+against ordinary ones. Neighbours are first checked against exact
+brute force on a small book.
+
+Usage: python scripts/benchmark_similarity.py
+       BENCH_CLAIMS=2000000 python scripts/benchmark_similarity.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# -------------------------------------------------
+# Fix path so utils/ is found
+# -------------------------------------------------
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+from scripts.compute_importances import DATASETS
+from utils.insurance_preprocessing import preprocess_insurance_data
+from utils.similarity import SimilarityIndex
+
+CLAIMS = int(os.environ.get("BENCH_CLAIMS", "1000000"))
+QUERIES = 10000
+RING_SIZE = 40
+
+# Just below the rebuild threshold of a 1M-claim index: the slowest
+# buffered queries get
+INSERTS = 49000
+
+
+def _claims(df, n, random_state=0):
+    """
+    n claims resampled from df with jittered numeric fields.
+    """
+    rng = np.random.RandomState(random_state)
+    claims = df.iloc[rng.randint(len(df), size=n)].reset_index(drop=True)
+    claims["Age"] = np.clip(claims["Age"] + rng.randint(-5, 6, n), 18, 90)
+    claims["ClaimAmount"] = (claims["ClaimAmount"] * rng.uniform(0.7, 1.3, n)).round()
+    claims["PolicyTenure"] = np.maximum(claims["PolicyTenure"] + rng.randint(-3, 4, n), 0)
+    return claims
+
+
+def _ring(df, n, random_state=1):
+    """
+    n claims copying one claim, amounts within 1% of each other.
+    """
+    rng = np.random.RandomState(random_state)
+    ring = df.iloc[np.zeros(n, dtype=int)].reset_index(drop=True)
+    ring["ClaimAmount"] = (ring["ClaimAmount"] * rng.uniform(0.995, 1.005, n)).round()
+    return ring
+
+
+def _vectors(preprocessor, frame, chunk=200000):
+    parts = []
+    for start in range(0, len(frame), chunk):
+        Xp = preprocessor.transform(frame.iloc[start:start + chunk])
+        parts.append(Xp.toarray() if sp.issparse(Xp) else Xp)
+    return np.vstack(parts).astype(np.float64)
+
+
+def _check(stored, queries, k):
+    index = SimilarityIndex(k=k).fit(stored[:15000])
+    index.add(stored[15000:])
+    ids, distances, _ = index.query(queries)
+
+    exact = np.sqrt(((queries[:, None, :] - stored[None, :, :]) ** 2).sum(axis=2))
+    expected = np.sort(exact, axis=1)[:, :k]
+    assert np.allclose(distances, expected, atol=1e-6), "index disagrees with brute force"
+    assert np.allclose(np.take_along_axis(exact, ids, axis=1), distances, atol=1e-6)
+
+    # Stored claims are not their own neighbours
+    own = np.array([0, 1, 2, 15000, 15001])
+    ids, _, _ = index.query(stored[own])
+    assert not (ids == own[:, None]).any(), "a stored claim was returned as its own neighbour"
+    print(f"check: {len(queries)} queries over {len(stored):,} claims (tree + buffer) match brute force")
+
+
+def main():
+    path, target = DATASETS["insurance"]
+    df = pd.read_csv(path)
+    _, _, _, _, preprocessor = preprocess_insurance_data(df)
+    df = df.drop(columns=[target])
+
+    book = _vectors(preprocessor, pd.concat([_claims(df, CLAIMS - RING_SIZE), _ring(df, RING_SIZE)], ignore_index=True))
+    incoming = _vectors(preprocessor, _claims(df, QUERIES, random_state=2))
+    k = SimilarityIndex().k
+
+    _check(book[:20000], incoming[:200], k)
+
+    start = time.perf_counter()
+    index = SimilarityIndex().fit(book)
+    build_seconds = time.perf_counter() - start
+    print(f"\n{len(book):,} stored claims x {book.shape[1]} features, k={k}")
+    print(f"build        : {build_seconds:.2f}s")
+
+    start = time.perf_counter()
+    _, _, density = index.query(incoming)
+    batch_ms = (time.perf_counter() - start) * 1000 / QUERIES
+    print(f"query batch  : {batch_ms:.3f} ms per claim ({QUERIES:,} claims)")
+
+    latencies = []
+    for row in incoming[:1000]:
+        start = time.perf_counter()
+        index.query(row[None])
+        latencies.append((time.perf_counter() - start) * 1000)
+    print(f"query single : p50 {np.percentile(latencies, 50):.3f} ms, p99 {np.percentile(latencies, 99):.3f} ms")
+
+    inserts = _vectors(preprocessor, _claims(df, INSERTS, random_state=3))
+    start = time.perf_counter()
+    for i in range(0, len(inserts), 1000):
+        index.add(inserts[i:i + 1000])
+    insert_ms = (time.perf_counter() - start) * 1000 / (len(inserts) / 1000)
+
+    start = time.perf_counter()
+    index.query(incoming)
+    buffered_ms = (time.perf_counter() - start) * 1000 / QUERIES
+
+    start = time.perf_counter()
+    index.rebuild()
+    rebuild_seconds = time.perf_counter() - start
+    print(f"insert       : {insert_ms:.2f} ms per 1,000 claims; with {len(inserts):,} buffered "
+          f"{buffered_ms:.3f} ms per claim; rebuild {rebuild_seconds:.2f}s")
+
+    _, _, ring_density = index.query(book[-RING_SIZE:])
+    print(f"density      : ordinary claims median {np.median(density):.2f}, "
+          f"ring claims median {np.median(ring_density):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+# -------------------------------------------------
+# Fix path so utils/ is found
+# -------------------------------------------------
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+SCRIPTS = [
+    "app.py",
+    "pages/retail.py",
+    "pages/supply_chain.py",
+    "pages/banking.py",
+    "pages/customer.py",
+    "pages/hr.py",
+    "pages/insurance.py"
+]
+
+HEAVY_MODULES = ["pandas", "sklearn", "xgboost", "matplotlib", "seaborn"]
+
+# Imported through utils.lazy_imports, i.e. kept out of the first render
+DEFERRED_MODULES = ["matplotlib.pyplot", "seaborn", "xgboost"]
+
+REPEATS = int(os.environ.get("BENCH_REPEATS", "3"))
+
+# -------------------------------------------------
+# One cold render in a fresh interpreter.
+# Streamlit itself is already loaded in a running server, so it is
+# imported before the clock starts; everything the script pulls in
+# after that counts towards time to first render.
+# -------------------------------------------------
+CHILD = """
+import sys, time, json, warnings
+warnings.filterwarnings("ignore")
+from streamlit.testing.v1 import AppTest
+
+heavy = {heavy!r}
+before = {{m for m in heavy if m in sys.modules}}
+
+start = time.perf_counter()
+at = AppTest.from_file({path!r}, default_timeout=300).run()
+elapsed = time.perf_counter() - start
+
+loaded = [m for m in heavy if m in sys.modules and m not in before]
+
+# Cold cost of what the render deferred: import it now and read it back
+from utils.lazy_imports import import_costs, timed_import
+for name in {deferred!r}:
+    timed_import(name)
+
+print(json.dumps({{
+    "seconds": elapsed,
+    "error": bool(at.exception),
+    "loaded": loaded,
+    "deferred": import_costs()
+}}))
+"""
+
+
+def run_once(script):
+    code = CHILD.format(heavy=HEAVY_MODULES, deferred=DEFERRED_MODULES, path=os.path.join(ROOT, script))
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "DECISIONFORGE_METRICS_PORT": "0"}
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def deferred_costs(run):
+    """
+    Cold import time of each deferred module the render did not need.
+    """
+    return ", ".join(f"{m} {t:.2f}" for m, t in run["deferred"].items()) or "-"
+
+
+# -------------------------------------------------
+# RUN
+# -------------------------------------------------
+print("\n⏱  Time to first render (cold interpreter)\n")
+print(f"{'script':<24}{'median (s)':>12}{'min (s)':>10}   modules imported | deferred (cold import s)")
+print("-" * 96)
+
+for script in SCRIPTS:
+    runs = [run_once(script) for _ in range(REPEATS)]
+    times = [r["seconds"] for r in runs]
+    status = " (error)" if any(r["error"] for r in runs) else ""
+    print(
+        f"{script:<24}{statistics.median(times):>12.3f}{min(times):>10.3f}   "
+        f"{', '.join(runs[-1]['loaded']) or '-'}{status} | {deferred_costs(runs[-1])}"
+    )
@@ -0,0 +1,120 @@
+"""
+Throughput of the streaming velocity engine (utils/velocity.py) on a
+synthetic transaction stream, replayed in time-ordered batches, plus
+checkpoint size and save / load time.
+
+Before timing, the engine's features on a small stream fed in uneven
+batches are checked against a plain per-event recomputation.
+
+Usage: python scripts/benchmark_velocity.py
+       BENCH_EVENTS=2000000 BENCH_ACCOUNTS=200000 BENCH_BATCH=5000 python scripts/benchmark_velocity.py
+"""
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+
+# -------------------------------------------------
+# Fix path so utils/ is found
+# -------------------------------------------------
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+from utils.velocity import VelocityEngine
+
+EVENTS = int(os.environ.get("BENCH_EVENTS", "1000000"))
+ACCOUNTS = int(os.environ.get("BENCH_ACCOUNTS", "100000"))
+BATCH = int(os.environ.get("BENCH_BATCH", "10000"))
+
+
+def _stream(n_events, n_accounts, seed=0):
+    """
+    Time-ordered events spread over one day, with skewed account
+    activity (a few accounts transact far more often than the rest).
+    """
+    rng = np.random.RandomState(seed)
+    accounts = (rng.pareto(1.2, n_events) * n_accounts / 20).astype(np.int64) % n_accounts
+    times = 1.7e9 + np.cumsum(rng.exponential(86400 / n_events, n_events))
+    amounts = rng.lognormal(8, 1.5, n_events).round(2)
+    return accounts, times, amounts
+
+
+def _naive(accounts, times, amounts, events, minutes):
+    history = {}
+    out = []
+    for a, t, x in zip(accounts, times, amounts):
+        previous = history.setdefault(a, [])[-events:]
+        window = [(pt, px) for pt, px in previous if t - pt <= minutes * 60]
+        out.append([
+            1 + len(window),
+            x + sum(px for _, px in window),
+            max([x] + [px for _, px in window]),
+            (t - previous[-1][0]) / 60 if previous else np.nan
+        ])
+        history[a].append((t, x))
+    return np.array(out)
+
+
+def _check():
+    accounts, times, amounts = _stream(20000, 300, seed=1)
+    engine = VelocityEngine(events=8, minutes=30)
+
+    rng = np.random.RandomState(2)
+    cuts = np.sort(rng.choice(np.arange(1, len(times)), 40, replace=False))
+    got = np.vstack([
+        engine.update(a, t, x)
+        for a, t, x in zip(np.split(accounts, cuts), np.split(times, cuts), np.split(amounts, cuts))
+    ])
+
+    expected = _naive(accounts, times, amounts, engine.events, engine.minutes)
+    # Buffered amounts are stored as float32
+    assert np.allclose(got, expected, rtol=1e-6, equal_nan=True), "engine disagrees with recomputation"
+    print(f"check: {len(times):,} events in {len(cuts) + 1} batches match the per-event recomputation")
+
+
+def main():
+    _check()
+
+    accounts, times, amounts = _stream(EVENTS, ACCOUNTS)
+    engine = VelocityEngine()
+
+    counts = np.empty(EVENTS)
+    start = time.perf_counter()
+    for i in range(0, EVENTS, BATCH):
+        counts[i:i + BATCH] = engine.update(accounts[i:i + BATCH], times[i:i + BATCH], amounts[i:i + BATCH])[:, 0]
+    seconds = time.perf_counter() - start
+
+    print(
+        f"\n{EVENTS:,} events, {engine.n_accounts:,} accounts, batches of {BATCH:,}, "
+        f"window {engine.events} events / {engine.minutes:g} min"
+    )
+    print(f"update     : {seconds:.2f}s  ({EVENTS / seconds:,.0f} events/s)")
+    print(f"windows    : {np.mean(counts):.1f} events on average, {np.mean(counts > 1):.0%} with history")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "velocity.joblib")
+
+        start = time.perf_counter()
+        engine.save(path)
+        save_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        restored = VelocityEngine.load(path)
+        load_seconds = time.perf_counter() - start
+
+        size_mb = os.path.getsize(path) / 1e6
+
+    tail = slice(EVENTS - BATCH, EVENTS)
+    same = np.array_equal(
+        engine.update(accounts[tail], times[tail] + 1, amounts[tail], commit=False),
+        restored.update(accounts[tail], times[tail] + 1, amounts[tail], commit=False),
+        equal_nan=True
+    )
+    print(f"checkpoint : {size_mb:.1f} MB, save {save_seconds:.2f}s, load {load_seconds:.2f}s, "
+          f"restored state {'identical' if same else 'DIFFERENT'}")
+
+
+if __name__ == "__main__":
+    main()
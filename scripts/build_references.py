@@ -0,0 +1,42 @@
+"""
+Save drift reference profiles and input-validation profiles for the
+live models in models/, from the datasets they were trained on
+(new trainings save them directly). Each domain gets a new published
+version carrying them; the live version is never modified.
+
+Usage: python scripts/build_references.py [domain ...]
+"""
+import sys
+import importlib
+
+import pandas as pd
+
+from scripts.compute_importances import DATASETS
+from utils.artifacts import profile_path, publish_version, reference_path, stage_copy
+from utils.drift import build_reference, save_reference
+from utils.validation import build_profile, save_profile
+from utils.velocity import VelocityEngine, has_velocity_columns, velocity_columns
+
+
+def main(domains):
+    for domain in domains:
+        path, _ = DATASETS[domain]
+        schema = importlib.import_module(f"utils.{domain}_preprocessing")
+
+        df = pd.read_csv(path)
+
+        # Same replay as training, so the streaming velocity features
+        # are profiled too (banking transaction data only)
+        if has_velocity_columns(df):
+            df = VelocityEngine().add_features(df)
+        numerical_features = schema.NUMERICAL_FEATURES + velocity_columns(df)
+
+        staging = stage_copy(domain, skip=(reference_path, profile_path))
+        save_reference(domain, build_reference(df, numerical_features, schema.CATEGORICAL_FEATURES), staging)
+        save_profile(domain, build_profile(df, numerical_features, schema.CATEGORICAL_FEATURES), staging)
+        publish_version(domain, staging)
+        print(f"{domain:<13} {len(df):,} rows")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or list(DATASETS))
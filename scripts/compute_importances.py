@@ -0,0 +1,61 @@
+"""
+Compute & store global feature importances for the live models in
+models/, without retraining them (new trainings save them directly).
+Each domain gets a new published version carrying the importances;
+the live version is never modified.
+
+The saved preprocessor transforms each domain's training dataset and
+the labels are encoded the way the saved model expects.
+
+Usage: python scripts/compute_importances.py [domain ...]
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from utils.artifacts import importances_path, load_domain_artifacts, publish_version, stage_copy
+from utils.importance import compute_importances, save_importances
+
+
+# domain -> (dataset, target column)
+DATASETS = {
+    "banking": ("data/banking_valid_dataset_1.csv", "Fraud"),
+    "customer": ("data/customer_churn_dataset_1.csv", "Churn"),
+    "hr": ("data/hr_dataset_100rows_1.csv", "Attrition"),
+    "insurance": ("data/insurance_dataset_1.csv", "Fraud"),
+    "retail": ("data/retail_dataset_1.csv", "HighSales"),
+    "supply_chain": ("data/supply_chain_dataset_1.csv", "Sales")
+}
+
+
+def model_labels(model, y):
+    """
+    Yes/No targets become 0/1 for models fitted on the binary encoding.
+    """
+    classes = getattr(model, "classes_", None)
+    if classes is not None and np.issubdtype(np.asarray(classes).dtype, np.number) and y.dtype == object:
+        return y.map({"No": 0, "Yes": 1})
+    return y
+
+
+def main(domains):
+    for domain in domains:
+        path, target = DATASETS[domain]
+        staging = stage_copy(domain, skip=(importances_path,))
+        model, preprocessor = load_domain_artifacts(domain, staging)
+
+        df = pd.read_csv(path)
+        X = preprocessor.transform(df.drop(columns=[target]))
+        y = model_labels(model, df[target].astype(object))
+
+        importances = compute_importances(model, preprocessor, X, y)
+        save_importances(domain, importances, staging)
+        publish_version(domain, staging)
+
+        meta = importances["meta"]
+        print(f"{domain:<13} {meta['model']:<24} {meta['metric']}={meta['baseline_score']:.3f}  {meta['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or list(DATASETS))
@@ -0,0 +1,310 @@
+import json
+
+import numpy as np
+import scipy.sparse as sp
+
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.ensemble._forest import BaseForest
+from sklearn.tree import BaseDecisionTree
+
+
+# Rows x trees evaluated per step; bounds the (rows x trees) node index array
+CHUNK_CELLS = 2_000_000
+
+
+# -------------------------------------------------
+# FLAT ARRAYS
+# -------------------------------------------------
+def _round_down_float32(threshold):
+    """
+    Largest float32 <= threshold. For float32 inputs x, x <= t holds
+    exactly when x <= round_down(t), so float32 thresholds never change
+    a split.
+    """
+    t32 = threshold.astype(np.float32)
+    above = t32.astype(np.float64) > threshold
+    t32[above] = np.nextafter(t32[above], np.float32(-np.inf))
+    return t32
+
+
+class FlatTrees:
+    """
+    Every tree of an ensemble in one set of contiguous arrays.
+
+    feature, left, right : int32 per node (global node ids)
+    threshold            : float32 per node
+    missing_left         : bool per node, where missing values go
+    value                : (n_nodes x n_outputs) leaf outputs
+    roots                : int32 root node id per tree
+
+    Leaves point to themselves, so traversal needs no leaf test: after
+    `depth` levels every row sits in its leaf in every tree.
+    """
+
+    def __init__(self, feature, threshold, left, right, missing_left, value, roots, depth, strict=False):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        # XGBoost sends x < threshold left, sklearn x <= threshold
+        self.strict = strict
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @classmethod
+    def concatenate(cls, trees, strict=False):
+        """
+        trees: per-tree tuples (feature, threshold, left, right,
+        missing_left, value, depth) with local node ids and -1 children
+        for leaves.
+        """
+        offsets = np.cumsum([0] + [len(t[0]) for t in trees])[:-1]
+        parts = {k: [] for k in ("feature", "threshold", "left", "right", "missing_left", "value")}
+
+        for offset, (feature, threshold, left, right, missing_left, value, _) in zip(offsets, trees):
+            nodes = np.arange(len(feature))
+            leaf = left < 0
+            parts["feature"].append(np.where(leaf, 0, feature))
+            parts["threshold"].append(np.where(leaf, 0.0, threshold))
+            parts["left"].append(np.where(leaf, nodes, left) + offset)
+            parts["right"].append(np.where(leaf, nodes, right) + offset)
+            parts["missing_left"].append(missing_left)
+            parts["value"].append(value)
+
+        return cls(
+            feature=np.concatenate(parts["feature"]).astype(np.int32),
+            threshold=np.concatenate(parts["threshold"]).astype(np.float32),
+            left=np.concatenate(parts["left"]).astype(np.int32),
+            right=np.concatenate(parts["right"]).astype(np.int32),
+            missing_left=np.concatenate(parts["missing_left"]).astype(bool),
+            value=np.concatenate(parts["value"]),
+            roots=offsets.astype(np.int32),
+            depth=max(t[6] for t in trees),
+            strict=strict
+        )
+
+    def leaves(self, X):
+        """
+        (n_rows x n_trees) leaf ids for a dense float32 chunk, all trees
+        advanced one level at a time with one gather per array.
+        """
+        n_rows, n_features = X.shape
+
+        # children[2 * node + went_right]
+        children = np.empty(2 * len(self.left), dtype=np.intp)
+        children[0::2] = self.left
+        children[1::2] = self.right
+        feature = self.feature.astype(np.intp)
+
+        X_flat = X.ravel()
+        row_start = (np.arange(n_rows, dtype=np.intp) * n_features)[:, None]
+        node = np.broadcast_to(self.roots.astype(np.intp), (n_rows, self.n_trees)).copy()
+        has_missing = np.isnan(X_flat).any()
+
+        for _ in range(self.depth):
+            x = X_flat.take(row_start + feature.take(node))
+            threshold = self.threshold.take(node)
+            go_right = (x >= threshold) if self.strict else (x > threshold)
+
+            if has_missing:
+                go_right = np.where(np.isnan(x), ~self.missing_left.take(node), go_right)
+
+            node = children.take(2 * node + go_right)
+
+        return node
+
+
+# -------------------------------------------------
+# CONVERTERS
+# -------------------------------------------------
+def _sklearn_tree(tree, normalize):
+    value = tree.value[:, :, :].reshape(tree.node_count, -1).astype(np.float64)
+    if normalize:
+        # Same division sklearn's predict_proba applies per tree
+        normalizer = value.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        value = value / normalizer
+
+    missing_left = getattr(tree, "missing_go_to_left", np.zeros(tree.node_count, dtype=np.uint8))
+    return (
+        tree.feature,
+        _round_down_float32(tree.threshold),
+        tree.children_left,
+        tree.children_right,
+        missing_left.astype(bool),
+        value,
+        tree.max_depth
+    )
+
+
+def _xgboost_trees(booster):
+    model = json.loads(booster.save_raw("json"))["learner"]
+
+    trees = []
+    for tree in model["gradient_booster"]["model"]["trees"]:
+        left = np.asarray(tree["left_children"])
+        right = np.asarray(tree["right_children"])
+        split = np.asarray(tree["split_conditions"], dtype=np.float32)
+
+        parent = np.full(len(left), -1)
+        internal = np.flatnonzero(left >= 0)
+        parent[left[internal]] = internal
+        parent[right[internal]] = internal
+        depth = np.zeros(len(left), dtype=int)
+        for node in range(1, len(left)):
+            depth[node] = depth[parent[node]] + 1
+
+        trees.append((
+            np.asarray(tree["split_indices"]),
+            split,
+            left,
+            right,
+            np.asarray(tree["default_left"]).astype(bool),
+            # Leaf values are stored in split_conditions
+            split[:, None],
+            int(depth.max())
+        ))
+
+    base_score = float(model["learner_model_param"]["base_score"].strip("[]"))
+    objective = model["objective"]["name"]
+    return trees, base_score, objective
+
+
+class FlatModel:
+    """
+    Array-based drop-in for predict / predict_proba of a fitted tree
+    model, with the source model's accumulation order so outputs match.
+
+    combine : "mean" (trees & forests), "boosting" (init + scale * sum,
+              float64) or "xgboost" (base margin + sum, float32)
+    link    : None, "sigmoid" (XGBoost binary:logistic) or "clip"
+              (distilled classifiers)
+    """
+
+    def __init__(self, trees, combine, link=None, classes=None, init=0.0, scale=1.0, n_features=None):
+        self.trees = trees
+        self.combine = combine
+        self.link = link
+        self.classes_ = classes
+        self.init = init
+        self.scale = scale
+        self.n_features_in_ = n_features
+
+    # ---------------- Raw outputs
+    def _dense_chunks(self, X):
+        n_rows = X.shape[0]
+        step = max(1, CHUNK_CELLS // max(self.trees.n_trees, 1))
+
+        for start in range(0, n_rows, step):
+            chunk = X[start:start + step]
+            if sp.issparse(chunk):
+                if self.combine == "xgboost":
+                    # XGBoost treats entries absent from a sparse matrix as missing
+                    coo = chunk.tocoo()
+                    dense = np.full(chunk.shape, np.nan, dtype=np.float32)
+                    dense[coo.row, coo.col] = coo.data
+                    chunk = dense
+                else:
+                    chunk = chunk.toarray()
+            yield np.ascontiguousarray(chunk, dtype=np.float32)
+
+    def _accumulate(self, X):
+        outputs = []
+        value = self.trees.value
+
+        for chunk in self._dense_chunks(X):
+            leaves = self.trees.leaves(chunk)
+
+            if self.combine == "xgboost":
+                total = np.full(len(chunk), self.init, dtype=np.float32)
+                for t in range(self.trees.n_trees):
+                    total += value[leaves[:, t], 0]
+            elif self.combine == "boosting":
+                total = np.full(len(chunk), self.init, dtype=np.float64)
+                for t in range(self.trees.n_trees):
+                    total += self.scale * value[leaves[:, t], 0]
+            else:
+                total = np.zeros((len(chunk), value.shape[1]))
+                for t in range(self.trees.n_trees):
+                    total += value[leaves[:, t]]
+                if self.trees.n_trees > 1:
+                    total /= self.trees.n_trees
+                if self.classes_ is None:
+                    total = total[:, 0]
+            outputs.append(total)
+
+        return np.concatenate(outputs)
+
+    # ---------------- sklearn-style API
+    def predict_proba(self, X):
+        total = self._accumulate(X)
+        if self.link == "sigmoid":
+            positive = 1.0 / (1.0 + np.exp(-total))
+        elif self.link == "clip":
+            positive = np.clip(total, 0.0, 1.0)
+        else:
+            return total
+        return np.column_stack([1 - positive, positive])
+
+    def predict(self, X):
+        if self.link == "sigmoid":
+            return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+        if self.link == "clip":
+            return self.classes_[(self.predict_proba(X)[:, 1] >= 0.5).astype(int)]
+
+        total = self._accumulate(X)
+        if self.classes_ is not None:
+            return self.classes_.take(np.argmax(total, axis=1), axis=0)
+        return total
+
+
+def flatten(model):
+    """
+    FlatModel for a fitted DecisionTree, RandomForest / ExtraTrees,
+    GradientBoostingRegressor (incl. distilled classifiers) or
+    XGBoost (binary:logistic, reg:squarederror) model.
+    """
+    n_features = getattr(model, "n_features_in_", None)
+
+    if hasattr(model, "get_booster"):
+        trees, base_score, objective = _xgboost_trees(model.get_booster())
+        if objective == "binary:logistic":
+            link, init = "sigmoid", np.float32(np.log(base_score / (1 - base_score)))
+        elif objective == "reg:squarederror":
+            link, init = None, np.float32(base_score)
+        else:
+            raise ValueError(f"Unsupported XGBoost objective '{objective}'")
+        return FlatModel(
+            FlatTrees.concatenate(trees, strict=True), "xgboost",
+            link=link, init=init, n_features=n_features
+        )
+
+    regressor = getattr(model, "regressor_", None)
+    if regressor is not None:
+        flat = flatten(regressor)
+        flat.link, flat.classes_ = "clip", model.classes_
+        return flat
+
+    if isinstance(model, GradientBoostingRegressor):
+        if model.init_ != "zero" and type(model.init_).__name__ != "DummyRegressor":
+            raise ValueError("Only constant initial estimates are supported")
+        init = model._raw_predict_init(np.zeros((1, model.n_features_in_)))[0, 0]
+        trees = [_sklearn_tree(est.tree_, normalize=False) for est in model.estimators_[:, 0]]
+        return FlatModel(
+            FlatTrees.concatenate(trees), "boosting",
+            init=init, scale=model.learning_rate, n_features=n_features
+        )
+
+    if isinstance(model, (BaseForest, BaseDecisionTree)):
+        estimators = model.estimators_ if isinstance(model, BaseForest) else [model]
+        classes = getattr(model, "classes_", None)
+        trees = [_sklearn_tree(est.tree_, normalize=classes is not None) for est in estimators]
+        return FlatModel(FlatTrees.concatenate(trees), "mean", classes=classes, n_features=n_features)
+
+    raise ValueError(f"Cannot flatten {type(model).__name__}")
@@ -1,6 +1,7 @@
 import pandas as pd
 
 from utils.banking_model_training import train_banking_models
+from utils.model_selection import describe_selection
 
 # -------------------------------------------------
 # LOAD DATASET
@@ -24,4 +25,5 @@ for model_name, metrics in results.items():
         print(f"  {metric}: {value:.4f}")
     print("-" * 30)
 
+print("\n" + describe_selection(results, best_model, "f1_score"))
 print(f"\n🏆 Best Model Selected: {best_model}")
@@ -0,0 +1,52 @@
+"""
+Train a shadow candidate for a domain and store it in models/candidates/.
+
+The candidate is fitted on the production preprocessor's output, so in
+the app it is scored on the same transformed chunks as the production
+model (see utils/shadow.py) and only the model file is stored. The
+candidate lives outside the versioned directories and is swapped in
+with os.replace(), so the app never loads a partially written file.
+
+Usage: python scripts/train_candidate.py <domain> [n_estimators]
+"""
+import os
+import sys
+
+import joblib
+import pandas as pd
+
+from sklearn.base import is_classifier
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.model_selection import train_test_split
+
+from scripts.compute_importances import DATASETS, model_labels
+from utils.artifacts import candidate_path, current_dir, load_domain_artifacts
+
+
+def main(domain, n_estimators=100):
+    path, target = DATASETS[domain]
+    model, preprocessor = load_domain_artifacts(domain, current_dir(domain))
+
+    df = pd.read_csv(path)
+    X = preprocessor.transform(df.drop(columns=[target]))
+    y = model_labels(model, df[target].astype(object))
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    if is_classifier(model):
+        candidate = RandomForestClassifier(n_estimators=n_estimators, random_state=42, n_jobs=-1)
+    else:
+        candidate = RandomForestRegressor(n_estimators=n_estimators, random_state=42, n_jobs=-1)
+    candidate.fit(X_train, y_train)
+
+    out = candidate_path(domain)
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    tmp = f"{out}.{os.getpid()}.tmp"
+    joblib.dump(candidate, tmp)
+    os.replace(tmp, out)
+
+    print(f"{domain}: production {model.score(X_test, y_test):.3f}  candidate {candidate.score(X_test, y_test):.3f}  -> {out}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1], *(int(a) for a in sys.argv[2:3]))
@@ -1,5 +1,6 @@
 import pandas as pd
 from utils.customer_model_training import train_customer_models
+from utils.model_selection import describe_selection
 
 # Load sample churn dataset
 df = pd.read_csv("data/customer_churn_dataset_1.csv")
@@ -14,4 +15,5 @@ for model, metrics in results.items():
         print(f"  {k}: {v:.4f}")
     print("-" * 30)
 
+print("\n" + describe_selection(results, best_model, "f1_score"))
 print(f"\n Best Model Selected: {best_model}")
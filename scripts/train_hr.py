@@ -1,5 +1,6 @@
 import pandas as pd
 from utils.hr_model_training import train_hr_models
+from utils.model_selection import describe_selection
 
 df = pd.read_csv("data/hr_dataset_100rows_1.csv")
 
@@ -9,4 +10,5 @@ print("Model Performance:")
 for model, scores in results.items():
     print(model, scores)
 
+print("\n" + describe_selection(results, best_model, "f1_score"))
 print("Best Model:", best_model)
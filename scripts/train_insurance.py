@@ -8,6 +8,7 @@ import pandas as pd
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from utils.insurance_model_training import train_insurance_models
+from utils.model_selection import describe_selection
 
 # -------------------------------------------------
 # LOAD DATA
@@ -26,4 +27,5 @@ print("\nInsurance Model Performance:\n")
 for model, scores in results.items():
     print(f"{model}: {scores}")
 
+print("\n" + describe_selection(results, best_model, "f1_score"))
 print("\nBest Model:", best_model)
@@ -1,5 +1,6 @@
 import pandas as pd
 from utils.retail_model_training import train_retail_models
+from utils.model_selection import describe_selection
 
 # -------------------------------------------------
 # LOAD DATASET
@@ -22,4 +23,5 @@ for model, scores in results.items():
         print(f"  {metric}: {value:.4f}")
     print("-" * 30)
 
+print("\n" + describe_selection(results, best_model, "f1_score"))
 print(f"\n🏆 Best Model Selected: {best_model}")
@@ -1,10 +1,12 @@
 import pandas as pd
 from utils.supply_chain_model_training import train_supply_chain_models
+from utils.model_selection import describe_selection
 
 # Load dataset
 df = pd.read_csv("data/supply_chain_dataset_1.csv")
 
-results, best_model = train_supply_chain_models(df)
+# An ensemble winner is distilled into a compact student (served if within tolerance)
+results, best_model = train_supply_chain_models(df, distill=True)
 
 print("\n📦 Supply Chain Model Performance:\n")
 
@@ -14,4 +16,5 @@ for model, metrics in results.items():
         print(f"  {k}: {v:.4f}")
     print("-" * 30)
 
+print("\n" + describe_selection(results, best_model, "R2"))
 print(f"\n🏆 Best Model Selected: {best_model}")
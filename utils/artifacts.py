@@ -0,0 +1,316 @@
+import gc
+import os
+import sys
+import json
+import time
+import types
+import uuid
+import shutil
+
+import joblib
+import numpy as np
+
+from utils.metrics import MODEL_ARTIFACT_BYTES, MODEL_LOAD_SECONDS, MODEL_RESIDENT_BYTES
+
+
+MODELS_DIR = "models"
+
+# Published versions kept per domain (including the current one)
+KEEP_VERSIONS = int(os.environ.get("DECISIONFORGE_KEEP_VERSIONS", "3"))
+
+CURRENT_POINTER = "CURRENT"
+STAGING_PREFIX = ".staging-"
+
+
+def artifact_paths(domain, models_dir=MODELS_DIR):
+    return (
+        os.path.join(models_dir, f"{domain}_model.pkl"),
+        os.path.join(models_dir, f"{domain}_preprocessor.pkl")
+    )
+
+
+def artifact_version(domain, models_dir=MODELS_DIR):
+    """
+    Cheap fingerprint of the artifact files on disk (mtime & size),
+    changing whenever either file is rewritten.
+    """
+    parts = []
+    for path in artifact_paths(domain, models_dir):
+        st = os.stat(path)
+        parts.append(f"{st.st_mtime_ns:x}.{st.st_size:x}")
+    return "-".join(parts)
+
+
+# -------------------------------------------------
+# VERSIONED PUBLISHING
+# -------------------------------------------------
+def _pointer_path(domain, models_dir=MODELS_DIR):
+    return os.path.join(models_dir, domain, CURRENT_POINTER)
+
+
+def current_version(domain, models_dir=MODELS_DIR):
+    """
+    (version, directory) of the artifacts to serve for a domain.
+
+    Published versions live in models/<domain>/<version>/ and the
+    models/<domain>/CURRENT pointer names the live one. Domains that
+    were never published fall back to the flat models/<domain>_*.pkl
+    files, versioned by their fingerprint.
+    """
+    try:
+        with open(_pointer_path(domain, models_dir), encoding="utf-8") as fh:
+            version = fh.read().strip()
+    except FileNotFoundError:
+        return artifact_version(domain, models_dir), models_dir
+    return version, os.path.join(models_dir, domain, version)
+
+
+def current_dir(domain, models_dir=MODELS_DIR):
+    return current_version(domain, models_dir)[1]
+
+
+def stage_version(domain, models_dir=MODELS_DIR):
+    """
+    New, empty staging directory for the next version of a domain.
+    Write every artifact into it with the usual path helpers
+    (models_dir=<staging dir>), then call publish_version().
+    """
+    version = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    staging = os.path.join(models_dir, domain, STAGING_PREFIX + version)
+    os.makedirs(staging)
+    return staging
+
+
+def publish_version(domain, staging, models_dir=MODELS_DIR):
+    """
+    Make a staged version live: rename the staging directory to its
+    version name, then swap the CURRENT pointer with os.replace().
+    Readers see either the old or the new version, never a mix.
+    """
+    domain_dir = os.path.join(models_dir, domain)
+    version = os.path.basename(staging)[len(STAGING_PREFIX):]
+    os.replace(staging, os.path.join(domain_dir, version))
+
+    pointer = _pointer_path(domain, models_dir)
+    tmp = f"{pointer}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        fh.write(version)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, pointer)
+
+    _prune_versions(domain_dir, version)
+    return version
+
+
+def _prune_versions(domain_dir, current):
+    """
+    Drop the oldest published versions beyond KEEP_VERSIONS. Versions
+    are named by publish time, so name order is age order.
+    """
+    versions = sorted(
+        name for name in os.listdir(domain_dir)
+        if os.path.isdir(os.path.join(domain_dir, name)) and not name.startswith(".")
+    )
+    for name in versions[:-KEEP_VERSIONS or None]:
+        if name != current:
+            shutil.rmtree(os.path.join(domain_dir, name), ignore_errors=True)
+
+
+# -------------------------------------------------
+# LOADING
+# -------------------------------------------------
+# Shared with the interpreter, not owned by a loaded model
+_NOT_MODEL_STATE = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def resident_bytes(*objects):
+    """
+    Approximate memory held by loaded objects: sys.getsizeof over their
+    object graph, counting each object once. Array data that belongs to
+    an extension type (sklearn trees) and native state (XGBoost boosters)
+    is reached through __getstate__, since the gc cannot see it.
+    """
+    seen = set()
+    total = 0
+    stack = list(objects)
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _NOT_MODEL_STATE):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, np.ndarray):
+            if isinstance(obj.base, np.ndarray):
+                stack.append(obj.base)
+            elif obj.base is not None:
+                total += obj.nbytes
+            continue
+
+        stack.extend(gc.get_referents(obj))
+        if type(obj).__getstate__ is not object.__getstate__:
+            stack.extend(gc.get_referents(obj.__getstate__()))
+
+    return total
+
+
+def load_domain_artifacts(domain, models_dir=MODELS_DIR):
+    """
+    Load the saved model & preprocessor for a domain.
+
+    models_dir is a published version directory (see current_version())
+    or the flat models/ folder. Load time, on-disk size and in-memory
+    size are recorded for the metrics endpoint. Callers should go through
+    utils.model_registry, which keeps one loaded copy per process.
+    """
+    model_path, preprocessor_path = artifact_paths(domain, models_dir)
+
+    start = time.perf_counter()
+    model = joblib.load(model_path)
+    preprocessor = joblib.load(preprocessor_path)
+    MODEL_LOAD_SECONDS.labels(domain=domain).observe(time.perf_counter() - start)
+
+    MODEL_ARTIFACT_BYTES.labels(domain=domain).set(
+        os.path.getsize(model_path) + os.path.getsize(preprocessor_path)
+    )
+    MODEL_RESIDENT_BYTES.labels(domain=domain).set(resident_bytes(model, preprocessor))
+
+    return model, preprocessor
+
+
+def importances_path(domain, models_dir=MODELS_DIR):
+    return os.path.join(models_dir, f"{domain}_importances.json")
+
+
+def load_importances(domain, models_dir=MODELS_DIR):
+    """
+    Global importances saved next to the model at training time, or
+    None if the model was trained before they were saved.
+    """
+    path = importances_path(domain, models_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def reference_path(domain, models_dir=MODELS_DIR):
+    return os.path.join(models_dir, f"{domain}_reference.json")
+
+
+def load_reference(domain, models_dir=MODELS_DIR):
+    """
+    Training-data reference profile used by the drift monitor, or None.
+    """
+    path = reference_path(domain, models_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def profile_path(domain, models_dir=MODELS_DIR):
+    return os.path.join(models_dir, f"{domain}_profile.json")
+
+
+def load_profile(domain, models_dir=MODELS_DIR):
+    """
+    Training-data schema & profile used to validate inputs, or None.
+    """
+    path = profile_path(domain, models_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def velocity_path(domain, models_dir=MODELS_DIR):
+    return os.path.join(models_dir, f"{domain}_velocity.joblib")
+
+
+def load_velocity(domain, models_dir=MODELS_DIR):
+    """
+    Streaming velocity state checkpointed at the end of the training
+    data (utils.velocity.VelocityEngine), or None if the model was
+    trained without velocity features.
+    """
+    path = velocity_path(domain, models_dir)
+    if not os.path.exists(path):
+        return None
+    return joblib.load(path)
+
+
+def similarity_path(domain, models_dir=MODELS_DIR):
+    return os.path.join(models_dir, f"{domain}_similarity.joblib")
+
+
+def load_similarity(domain, models_dir=MODELS_DIR):
+    """
+    Nearest-neighbour index of the training claims
+    (utils.similarity.SimilarityIndex), or None if none was saved.
+    """
+    path = similarity_path(domain, models_dir)
+    if not os.path.exists(path):
+        return None
+    return joblib.load(path)
+
+
+# Files a version may carry next to its model & preprocessor; not every
+# domain writes every one
+SIDECAR_PATHS = (
+    importances_path,
+    reference_path,
+    profile_path,
+    velocity_path,
+    similarity_path
+)
+
+
+def copy_sidecars(domain, source, staging, skip=()):
+    """
+    Copy every sidecar the source version has into a staging directory,
+    except those whose path helper is in skip (rewritten by the caller).
+    """
+    for sidecar in SIDECAR_PATHS:
+        path = sidecar(domain, source)
+        if sidecar not in skip and os.path.exists(path):
+            shutil.copy2(path, sidecar(domain, staging))
+
+
+def stage_copy(domain, skip=(), models_dir=MODELS_DIR):
+    """
+    Staging directory holding a copy of the live version (model,
+    preprocessor & sidecars but those in skip), for scripts that only
+    rewrite sidecars: write them into it, then call publish_version().
+    """
+    source = current_dir(domain, models_dir)
+    staging = stage_version(domain, models_dir)
+    for path, copy in zip(artifact_paths(domain, source), artifact_paths(domain, staging)):
+        shutil.copy2(path, copy)
+    copy_sidecars(domain, source, staging, skip)
+    return staging
+
+
+def candidate_path(domain, models_dir=MODELS_DIR):
+    return os.path.join(models_dir, "candidates", f"{domain}_model.pkl")
+
+
+def candidate_version(domain, models_dir=MODELS_DIR):
+    """
+    Fingerprint of the shadow candidate model, or None if there is none.
+    """
+    path = candidate_path(domain, models_dir)
+    if not os.path.exists(path):
+        return None
+    st = os.stat(path)
+    return f"{st.st_mtime_ns:x}.{st.st_size:x}"
+
+
+def load_candidate(domain, models_dir=MODELS_DIR):
+    """
+    Candidate model for shadow scoring. It is fitted on the output of
+    the production preprocessor, so only the model file is stored.
+    """
+    return joblib.load(candidate_path(domain, models_dir))
@@ -1,24 +1,47 @@
 import pandas as pd
 
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import StandardScaler
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
 
+from utils.encoding import categorical_transformers
+from utils.velocity import velocity_columns
+
+
+# -------------------------------------------------
+# FEATURE SCHEMA
+# -------------------------------------------------
+CATEGORICAL_FEATURES = [
+    "Gender",
+    "AccountType",
+    "TransactionType",
+    "IsInternational"
+]
+
+NUMERICAL_FEATURES = [
+    "Age",
+    "TransactionAmount",
+    "AccountBalance",
+    "CreditScore",
+    "PreviousFrauds"
+]
+
 
 def preprocess_banking_data(
     df: pd.DataFrame,
     target_column: str = "Fraud",
     test_size: float = 0.2,
-    random_state: int = 42
+    random_state: int = 42,
+    encoding: str | dict = "onehot"
 ):
     """
     Banking Fraud Data Preprocessing Pipeline
 
     Steps:
     1. Handle missing values
-    2. Encode categorical variables
+    2. Encode categorical variables (see utils.encoding.categorical_transformers)
     3. Scale numerical features
     4. Split train/test data
     """
@@ -38,20 +61,10 @@ def preprocess_banking_data(
     # -----------------------------
     # Feature groups
     # -----------------------------
-    categorical_features = [
-        "Gender",
-        "AccountType",
-        "TransactionType",
-        "IsInternational"
-    ]
-
-    numerical_features = [
-        "Age",
-        "TransactionAmount",
-        "AccountBalance",
-        "CreditScore",
-        "PreviousFrauds"
-    ]
+    categorical_features = CATEGORICAL_FEATURES
+    # Plus the streaming velocity features when the frame carries them
+    # (see utils.velocity); account & time columns themselves are dropped
+    numerical_features = NUMERICAL_FEATURES + velocity_columns(X)
 
     # -----------------------------
     # Numerical pipeline
@@ -61,21 +74,13 @@ def preprocess_banking_data(
         ("scaler", StandardScaler())
     ])
 
-    # -----------------------------
-    # Categorical pipeline
-    # -----------------------------
-    categorical_pipeline = Pipeline(steps=[
-        ("imputer", SimpleImputer(strategy="most_frequent")),
-        ("encoder", OneHotEncoder(handle_unknown="ignore"))
-    ])
-
     # -----------------------------
     # Combine pipelines
     # -----------------------------
     preprocessor = ColumnTransformer(
         transformers=[
             ("num", numeric_pipeline, numerical_features),
-            ("cat", categorical_pipeline, categorical_features)
+            *categorical_transformers(categorical_features, encoding)
         ]
     )
 
@@ -93,7 +98,8 @@ def preprocess_banking_data(
     # -----------------------------
     # Fit & transform
     # -----------------------------
-    X_train_processed = preprocessor.fit_transform(X_train)
+    # y is only used by target encoding (out-of-fold on the training rows)
+    X_train_processed = preprocessor.fit_transform(X_train, y_train)
     X_test_processed = preprocessor.transform(X_test)
 
     return (
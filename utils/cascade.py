@@ -0,0 +1,196 @@
+import os
+
+import numpy as np
+import scipy.sparse as sp
+
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.model_selection import StratifiedKFold, cross_val_predict, train_test_split
+
+
+# Largest drop in F1 against the heavy model alone the cascade may show
+CASCADE_TOLERANCE = float(os.environ.get("DECISIONFORGE_CASCADE_TOLERANCE", "0.01"))
+
+# Band edges tried: quantiles of the cheap model's probabilities
+BAND_GRID = 40
+
+CASCADE_FOLDS = 5
+
+# Training rows used for tuning (a stratified sample above this)
+MAX_CASCADE_ROWS = 20000
+
+# Share of those rows held out of the band search to check the band
+CHECK_SHARE = 0.25
+
+
+class CascadeClassifier(ClassifierMixin, BaseEstimator):
+    """
+    Binary classifier scored in two stages: the cheap model scores every
+    row, and only rows whose positive-class probability lies inside
+    [low, high] are scored again by the heavy model.
+
+    Both models are fitted already; classes_ are the cheap model's (the
+    heavy one may use 0/1 labels, only its positive-class probability
+    is read).
+    """
+
+    def __init__(self, cheap=None, heavy=None, low=0.0, high=1.0):
+        self.cheap = cheap
+        self.heavy = heavy
+        self.low = low
+        self.high = high
+
+    def fit(self, X, y=None):
+        self.classes_ = np.asarray(self.cheap.classes_)
+        self.n_features_in_ = X.shape[1]
+        return self
+
+    def routed(self, cheap_probability):
+        return (cheap_probability >= self.low) & (cheap_probability <= self.high)
+
+    def predict_proba(self, X):
+        positive = self.cheap.predict_proba(X)[:, 1]
+
+        rows = np.flatnonzero(self.routed(positive))
+        if len(rows):
+            X_routed = X[rows] if sp.issparse(X) else np.asarray(X)[rows]
+            positive[rows] = self.heavy.predict_proba(X_routed)[:, 1]
+
+        return np.column_stack([1 - positive, positive])
+
+    def predict(self, X):
+        return self.classes_[(self.predict_proba(X)[:, 1] > 0.5).astype(int)]
+
+
+# -------------------------------------------------
+# BAND TUNING
+# -------------------------------------------------
+def _f1(y_true, y_pred):
+    """
+    F1 per row of y_pred (candidates x samples) of positive booleans.
+    """
+    tp = (y_pred & y_true).sum(axis=-1)
+    denominator = y_pred.sum(axis=-1) + y_true.sum()
+    return np.where(denominator > 0, 2 * tp / np.maximum(denominator, 1), 0.0)
+
+
+def _heavy_labels(heavy, y, positive_label):
+    """
+    Labels in the encoding the heavy model was fitted on (XGBoost: 0/1).
+    """
+    if np.issubdtype(np.asarray(heavy.classes_).dtype, np.number) and not np.issubdtype(np.asarray(y).dtype, np.number):
+        return (np.asarray(y) == positive_label).astype(int)
+    return y
+
+
+def tune_band(cheap, heavy, X_train, y_train, tolerance=None, random_state=42):
+    """
+    Widest short-circuit (narrowest [low, high] band around 0.5) whose
+    F1 stays within `tolerance` (DECISIONFORGE_CASCADE_TOLERANCE) of the
+    heavy model's, judged on out-of-fold probabilities of both models
+    over the training rows (at most MAX_CASCADE_ROWS of them).
+
+    The band is searched on all but CHECK_SHARE of those rows and its
+    F1 measured on the rest, so neither the search nor the check needs
+    the test split.
+
+    Returns (low, high, routed share, check F1, heavy check F1).
+    """
+    tolerance = CASCADE_TOLERANCE if tolerance is None else tolerance
+    if X_train.shape[0] > MAX_CASCADE_ROWS:
+        X_train, _, y_train, _ = train_test_split(
+            X_train, y_train, train_size=MAX_CASCADE_ROWS, stratify=y_train, random_state=random_state
+        )
+    positive_label = np.asarray(cheap.classes_)[-1]
+    folds = StratifiedKFold(CASCADE_FOLDS, shuffle=True, random_state=random_state)
+
+    cheap_p = cross_val_predict(clone(cheap), X_train, y_train, cv=folds, method="predict_proba")[:, 1]
+    heavy_p = cross_val_predict(
+        clone(heavy), X_train, _heavy_labels(heavy, y_train, positive_label),
+        cv=folds, method="predict_proba"
+    )[:, 1]
+
+    y_true = np.asarray(y_train) == positive_label
+    search, check = train_test_split(
+        np.arange(len(y_true)), test_size=CHECK_SHARE, stratify=y_true, random_state=random_state
+    )
+
+    quantiles = np.quantile(cheap_p[search], np.linspace(0, 1, BAND_GRID + 1))
+    lows = np.unique(np.r_[0.0, quantiles[quantiles <= 0.5], 0.5])
+    highs = np.unique(np.r_[0.5, quantiles[quantiles >= 0.5], 1.0])
+    low, high = np.meshgrid(lows, highs, indexing="ij")
+    low, high = low.ravel(), high.ravel()
+
+    # candidates x search rows
+    routed = (cheap_p[search] >= low[:, None]) & (cheap_p[search] <= high[:, None])
+    cascade_f1 = _f1(y_true[search], np.where(routed, heavy_p[search], cheap_p[search]) > 0.5)
+    share = routed.mean(axis=1)
+
+    # Always feasible: low=0, high=1 routes every row to the heavy model
+    feasible = np.flatnonzero(cascade_f1 >= float(_f1(y_true[search], heavy_p[search] > 0.5)) - tolerance)
+    best = feasible[np.lexsort((-cascade_f1[feasible], share[feasible]))[0]]
+
+    routed = (cheap_p[check] >= low[best]) & (cheap_p[check] <= high[best])
+    check_f1 = float(_f1(y_true[check], np.where(routed, heavy_p[check], cheap_p[check]) > 0.5))
+    heavy_f1 = float(_f1(y_true[check], heavy_p[check] > 0.5))
+
+    return float(low[best]), float(high[best]), float(share[best]), check_f1, heavy_f1
+
+
+def build_cascade(cheap, heavy, X_train, y_train, tolerance=None):
+    """
+    Fitted CascadeClassifier over two fitted models, with its band tuned
+    on the training rows; the tuning result is kept in cascade_.
+    """
+    low, high, share, check_f1, heavy_f1 = tune_band(cheap, heavy, X_train, y_train, tolerance)
+    cascade = CascadeClassifier(cheap, heavy, low, high).fit(X_train)
+    cascade.cascade_ = {
+        "low": low,
+        "high": high,
+        "oof_routed_share": share,
+        "oof_check_f1": check_f1,
+        "oof_check_heavy_f1": heavy_f1
+    }
+    return cascade
+
+
+def routed_share(cascade, X):
+    """
+    Share of rows of X the cascade sends to its heavy model.
+    """
+    return float(cascade.routed(cascade.cheap.predict_proba(X)[:, 1]).mean())
+
+
+# -------------------------------------------------
+# TRAINING HELPERS
+# -------------------------------------------------
+def heavy_candidate(results, cheap="Logistic Regression", exclude=()):
+    """
+    Best-F1 candidate to back the cheap model (other than the cheap
+    model itself and those in exclude).
+    """
+    names = [name for name in results if name != cheap and name not in exclude]
+    return max(names, key=lambda name: results[name]["f1_score"])
+
+
+def offer_cascade(cascade, tolerance=None):
+    """
+    Whether a built cascade is worth offering for selection: its band
+    routes some rows (routing none is the cheap model alone, already a
+    candidate) and its F1 on the held-out tuning rows stays within
+    `tolerance` of the heavy model's. The test split is left to model
+    selection.
+    """
+    tolerance = CASCADE_TOLERANCE if tolerance is None else tolerance
+    tuned = cascade.cascade_
+    return tuned["oof_routed_share"] > 0 and tuned["oof_check_f1"] >= tuned["oof_check_heavy_f1"] - tolerance
+
+
+def cascade_summary(cascade, X_eval, scores, heavy_scores):
+    """
+    Numeric cascade stats for a training results row: share of rows
+    routed to the heavy model and batch throughput against it.
+    """
+    return {
+        "routed_share": routed_share(cascade, X_eval),
+        "throughput_gain": heavy_scores["batch_us_per_row"] / max(scores["batch_us_per_row"], 1e-9)
+    }
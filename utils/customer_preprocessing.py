@@ -1,17 +1,41 @@
 import pandas as pd
 
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import StandardScaler
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
 
+from utils.encoding import categorical_transformers
+
+
+# -------------------------------------------------
+# FEATURE SCHEMA
+# -------------------------------------------------
+CATEGORICAL_FEATURES = [
+    "Gender",
+    "SubscriptionType",
+    "ContractType",
+    "PaymentMethod",
+    "InternetService"
+]
+
+NUMERICAL_FEATURES = [
+    "Age",
+    "Tenure",
+    "MonthlyCharges",
+    "TotalCharges",
+    "SupportTickets",
+    "UsageHours"
+]
+
 
 def preprocess_customer_data(
     df: pd.DataFrame,
     target_column: str = "Churn",
     test_size: float = 0.2,
-    random_state: int = 42
+    random_state: int = 42,
+    encoding: str | dict = "onehot"
 ):
     """
     Customer Churn Data Preprocessing Pipeline
@@ -20,7 +44,7 @@ def preprocess_customer_data(
     1. Validate target column
     2. Encode target (Yes → 1, No → 0)  ✅ REQUIRED FOR XGBOOST
     3. Handle missing values
-    4. Encode categorical variables
+    4. Encode categorical variables (see utils.encoding.categorical_transformers)
     5. Scale numerical features
     6. Split train/test data
 
@@ -48,22 +72,8 @@ def preprocess_customer_data(
     # -------------------------------------------------
     # FEATURE GROUPS
     # -------------------------------------------------
-    categorical_features = [
-        "Gender",
-        "SubscriptionType",
-        "ContractType",
-        "PaymentMethod",
-        "InternetService"
-    ]
-
-    numerical_features = [
-        "Age",
-        "Tenure",
-        "MonthlyCharges",
-        "TotalCharges",
-        "SupportTickets",
-        "UsageHours"
-    ]
+    categorical_features = CATEGORICAL_FEATURES
+    numerical_features = NUMERICAL_FEATURES
 
     # -------------------------------------------------
     # NUMERICAL PIPELINE
@@ -76,18 +86,13 @@ def preprocess_customer_data(
     # -------------------------------------------------
     # CATEGORICAL PIPELINE
     # -------------------------------------------------
-    categorical_pipeline = Pipeline(steps=[
-        ("imputer", SimpleImputer(strategy="most_frequent")),
-        ("encoder", OneHotEncoder(handle_unknown="ignore"))
-    ])
-
     # -------------------------------------------------
     # COLUMN TRANSFORMER
     # -------------------------------------------------
     preprocessor = ColumnTransformer(
         transformers=[
             ("num", numeric_pipeline, numerical_features),
-            ("cat", categorical_pipeline, categorical_features)
+            *categorical_transformers(categorical_features, encoding)
         ]
     )
 
@@ -105,7 +110,8 @@ def preprocess_customer_data(
     # -------------------------------------------------
     # FIT & TRANSFORM
     # -------------------------------------------------
-    X_train_processed = preprocessor.fit_transform(X_train)
+    # y is only used by target encoding (out-of-fold on the training rows)
+    X_train_processed = preprocessor.fit_transform(X_train, y_train)
     X_test_processed = preprocessor.transform(X_test)
 
     return (
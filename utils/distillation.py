@@ -0,0 +1,183 @@
+import io
+import os
+import time
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+
+from sklearn.base import BaseEstimator, ClassifierMixin, clone, is_classifier
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.ensemble._forest import BaseForest
+from sklearn.metrics import f1_score, r2_score
+
+from utils.explain import output_columns
+from utils.model_selection import inference_costs
+from utils.scoring import positive_probability
+
+
+# Largest drop in the teacher's metric at which the student is published
+DISTILL_TOLERANCE = float(os.environ.get("DECISIONFORGE_DISTILL_TOLERANCE", "0.02"))
+
+# Synthetic rows per training row (capped by MAX_SYNTHETIC_ROWS)
+SYNTHETIC_FACTOR = 2
+MAX_SYNTHETIC_ROWS = 50000
+
+# Numeric noise (in scaled units) and share of rows whose categories are swapped
+NOISE_SCALE = 0.1
+SWAP_RATE = 0.3
+
+
+class DistilledClassifier(ClassifierMixin, BaseEstimator):
+    """
+    Binary classifier served by a regressor fitted on the teacher's
+    positive-class probabilities (soft targets).
+    """
+
+    def __init__(self, regressor=None, classes=None):
+        self.regressor = regressor
+        self.classes = classes
+
+    def fit(self, X, probabilities):
+        self.regressor_ = clone(self.regressor).fit(X, probabilities)
+        self.classes_ = np.asarray(self.classes)
+        self.n_features_in_ = X.shape[1]
+        return self
+
+    @property
+    def feature_importances_(self):
+        return self.regressor_.feature_importances_
+
+    def predict_proba(self, X):
+        positive = np.clip(self.regressor_.predict(X), 0.0, 1.0)
+        return np.column_stack([1 - positive, positive])
+
+    def predict(self, X):
+        return self.classes_[(self.predict_proba(X)[:, 1] >= 0.5).astype(int)]
+
+
+def should_distill(model):
+    """
+    Only ensembles are worth distilling; single trees and linear
+    models are already compact.
+    """
+    return isinstance(model, BaseForest) or hasattr(model, "get_booster")
+
+
+# -------------------------------------------------
+# TRANSFER SET
+# -------------------------------------------------
+def synthetic_rows(X, preprocessor, n_rows, random_state=42):
+    """
+    Perturbed copies of transformed training rows: scaled numeric
+    outputs get Gaussian noise, and for a share of rows each
+    categorical column's one-hot block is taken from another random
+    row, so every synthetic row stays a valid encoding.
+    """
+    rng = np.random.RandomState(random_state)
+    X = X.toarray() if sp.issparse(X) else np.asarray(X, dtype=float)
+
+    rows = rng.randint(len(X), size=n_rows)
+    synthetic = X[rows].copy()
+
+    names = preprocessor.get_feature_names_out()
+    sources = np.array(output_columns(preprocessor))
+    numeric = np.array([name.startswith("num__") for name in names])
+
+    noise = rng.normal(0.0, NOISE_SCALE, size=(n_rows, numeric.sum()))
+    synthetic[:, numeric] += noise * X[:, numeric].std(axis=0)
+
+    for source in dict.fromkeys(sources[~numeric]):
+        block = np.flatnonzero(sources == source)
+        swap = np.flatnonzero(rng.rand(n_rows) < SWAP_RATE)
+        synthetic[np.ix_(swap, block)] = X[np.ix_(rng.randint(len(X), size=len(swap)), block)]
+
+    return synthetic
+
+
+# -------------------------------------------------
+# DISTILL
+# -------------------------------------------------
+def make_student(random_state=42):
+    return GradientBoostingRegressor(
+        n_estimators=150,
+        max_depth=4,
+        learning_rate=0.1,
+        subsample=0.8,
+        random_state=random_state
+    )
+
+
+def distill(teacher, preprocessor, X_train, random_state=42):
+    """
+    Fit a shallow gradient-boosted student on the teacher's outputs
+    over the training rows plus synthetic perturbations of them.
+    """
+    n_synthetic = min(SYNTHETIC_FACTOR * X_train.shape[0], MAX_SYNTHETIC_ROWS)
+    X_train = X_train.toarray() if sp.issparse(X_train) else np.asarray(X_train, dtype=float)
+    X_transfer = np.vstack([X_train, synthetic_rows(X_train, preprocessor, n_synthetic, random_state)])
+
+    if is_classifier(teacher):
+        targets = positive_probability(teacher, X_transfer)
+        return DistilledClassifier(make_student(random_state), teacher.classes_).fit(X_transfer, targets)
+
+    return make_student(random_state).fit(X_transfer, teacher.predict(X_transfer))
+
+
+def _score(model, X, y):
+    if is_classifier(model):
+        return f1_score(y, model.predict(X), pos_label=model.classes_[-1], zero_division=0)
+    return r2_score(y, model.predict(X))
+
+
+def _load_ms(model):
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    buffer.seek(0)
+
+    start = time.perf_counter()
+    joblib.load(buffer)
+    return (time.perf_counter() - start) * 1000
+
+
+def distillation_report(teacher, student, X_eval, y_eval):
+    """
+    Teacher vs student on the evaluation split: metric (F1 or R2) and
+    its gap, agreement between the two, and load time, size and
+    latency of both.
+    """
+    report = {"metric": "f1_score" if is_classifier(teacher) else "R2"}
+
+    for role, model in (("teacher", teacher), ("student", student)):
+        start = time.perf_counter()
+        model.predict(X_eval)
+        costs = inference_costs(model, X_eval, time.perf_counter() - start)
+
+        report[role] = {
+            "model": type(model).__name__,
+            "score": _score(model, X_eval, y_eval),
+            "load_ms": _load_ms(model),
+            **costs
+        }
+
+    teacher_pred, student_pred = teacher.predict(X_eval), student.predict(X_eval)
+    if is_classifier(teacher):
+        report["agreement"] = float(np.mean(teacher_pred == student_pred))
+    else:
+        report["agreement"] = float(r2_score(teacher_pred, student_pred))
+
+    report["gap"] = report["teacher"]["score"] - report["student"]["score"]
+    return report
+
+
+def distill_stage(teacher, preprocessor, X_train, X_test, y_test):
+    """
+    Training-module step: distill the selected teacher on the module's
+    own training split and judge the student on its test split.
+    Returns (student, report); report["accepted"] tells whether the
+    student's metric stays within DISTILL_TOLERANCE of the teacher's.
+    """
+    student = distill(teacher, preprocessor, X_train)
+    report = distillation_report(teacher, student, X_test, y_test)
+    report["accepted"] = report["gap"] <= DISTILL_TOLERANCE
+    return student, report
@@ -0,0 +1,768 @@
+import os
+import uuid
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from sklearn.base import is_classifier
+
+from utils.jobs import get_job, job_result, list_jobs, submit_parse_job, submit_score_job, wait_for_job
+from utils.metrics import start_metrics_server, time_stage
+from utils.model_registry import (
+    get_candidate,
+    get_drift_summary,
+    get_importances,
+    get_model_version,
+    get_profile,
+    get_snapshot,
+    prewarm_report,
+    start_reload_watcher
+)
+from utils.profiling import profile_run
+from utils.scoring import score_cached, score_frame
+from utils.shadow import shadow_report
+from utils.sensitivity import DEFAULT_POINTS, feature_ranges, feature_values, sensitivity_sweep
+from utils.validation import MAX_ERROR_RATE, validate_frame
+
+
+DATA_FOLDER = "data"
+
+INPUT_METHODS = ["Use Sample Dataset", "Manual Entry", "Upload CSV"]
+
+# Levels of the second feature in a two-feature sweep (one line each)
+SWEEP_SERIES = 6
+
+SESSION_KEYS = [
+    "raw_df", "result_df", "prediction_done", "input_method",
+    "upload_id", "upload_job", "score_job", "validation"
+]
+
+# Small jobs finish inside this window and render without a polling round-trip
+JOB_FAST_PATH_SECONDS = float(os.environ.get("DECISIONFORGE_JOB_FAST_PATH", "1.0"))
+
+# Refresh interval of the job progress bar
+JOB_POLL_SECONDS = 0.5
+
+# -------------------------------------------------
+# DARK ML THEME (SHARED BY THE DOMAIN PAGES)
+# -------------------------------------------------
+THEME_CSS = """
+<style>
+
+/* GLOBAL */
+.stApp {
+    background: linear-gradient(180deg, #020617, #020617);
+    color: #e5e7eb;
+}
+
+/* HIDE SIDEBAR */
+[data-testid="stSidebar"] { display: none; }
+
+/* MAIN CONTAINER */
+.block-container {
+    padding: 1.6rem 2.2rem;
+}
+
+/* RADIO / FORM / UPLOAD */
+section[data-testid="stRadio"],
+section[data-testid="stFileUploader"],
+div[data-testid="stForm"] {
+    background: rgba(2,6,23,0.97);
+    border: 1px solid rgba(56,189,248,0.5);
+    border-radius: 18px;
+    padding: 1.3rem;
+    margin-bottom: 1.6rem;
+}
+
+/* RADIO TEXT */
+section[data-testid="stRadio"] label {
+    color: #e5e7eb !important;
+    font-weight: 700;
+}
+section[data-testid="stRadio"] span {
+    color: #cbd5f5 !important;
+}
+
+/* BUTTONS */
+.stButton > button,
+.stDownloadButton > button {
+    background: linear-gradient(135deg, #0284c7, #0ea5e9);
+    color: white !important;
+    font-weight: 800;
+    border-radius: 14px;
+    padding: 0.65rem 1.6rem;
+    border: none;
+    box-shadow: 0 10px 28px rgba(14,165,233,0.45);
+}
+
+.stButton > button:hover,
+.stDownloadButton > button:hover {
+    background: linear-gradient(135deg, #0369a1, #0284c7);
+    transform: translateY(-2px);
+}
+
+/* FILE UPLOADER BUTTON */
+button[data-testid="stBaseButton-secondary"] {
+    background: linear-gradient(135deg, #14b8a6, #22d3ee);
+    color: #020617 !important;
+    font-weight: 800;
+    border-radius: 12px;
+}
+
+/* DATAFRAME */
+[data-testid="stDataFrame"] {
+    border-radius: 16px;
+    border: 1px solid rgba(56,189,248,0.45);
+    overflow: hidden;
+}
+
+/* HEADERS */
+h1, h2, h3 { color: #e5e7eb; }
+
+/* DIVIDER */
+hr { border: 1px dashed rgba(56,189,248,0.45); }
+
+/* SELECT CURSOR */
+div[data-baseweb="select"],
+div[data-baseweb="menu"] * {
+    cursor: pointer !important;
+}
+
+</style>
+"""
+
+
+# -------------------------------------------------
+# DOMAIN SPEC
+# -------------------------------------------------
+@dataclass
+class DomainSpec:
+    """
+    Everything that differs between the domain pages.
+
+    domain          : artifact name (models/<domain>_model.pkl)
+    feature_columns : model input columns, validated before scoring
+    target_column   : label column, ignored when present in uploads
+    manual_form     : renders the manual-entry widgets, returns one row (dict)
+    add_predictions : post-processing rules, (df, ScoreResult) -> df
+    render_results  : charts & insights, (df, input_method) -> df to download
+    explain_column  : column listing each row's top model drivers (None = off)
+    sensitivity_features : inputs offered in the manual-entry what-if sweep
+    derive_features : extra model inputs computed from the rows, df -> frame
+                      of columns indexed like df, or None when there are none
+    """
+    domain: str
+    title: str
+    description: str
+    feature_columns: list
+    target_column: str
+    manual_form: Callable
+    add_predictions: Callable
+    render_results: Callable
+    download_label: str
+    download_file: str
+
+    page_title: Optional[str] = None
+    css: str = THEME_CSS
+
+    # ---------------- Labels & messages
+    sample_select_label: str = "Select dataset:"
+    sample_button_label: str = "Load Dataset"
+    sample_empty_message: str = "No datasets found."
+    sample_loaded_message: Optional[str] = "Loaded dataset: {name}"
+    manual_form_key: str = "manual_form"
+    manual_submit_label: str = "Add Record"
+    manual_added_message: Optional[str] = None
+    upload_label: str = "Upload CSV"
+    upload_message: Optional[str] = "CSV uploaded successfully"
+    empty_message: Optional[str] = "Please load data to continue."
+    prediction_title: Optional[str] = None
+    run_button_label: str = "Run Prediction"
+    run_message: str = "Prediction completed successfully"
+    results_title: str = "Prediction Results"
+
+    # ---------------- Per-row explanations
+    explain_column: Optional[str] = "Top Factors"
+    explain_top_k: int = 3
+    explain_empty: str = "No major drivers"
+
+    # ---------------- What-if sweep (manual entry)
+    sensitivity_features: Optional[list] = None
+    sensitivity_label: str = "Prediction"
+
+    # ---------------- Derived inputs (e.g. streaming aggregates)
+    derive_features: Optional[Callable] = None
+
+
+# -------------------------------------------------
+# SHARED HELPERS
+# -------------------------------------------------
+def read_csv(source):
+    """
+    Parse a CSV with the multithreaded, columnar pyarrow reader,
+    falling back to the default parser if pyarrow cannot handle it.
+    """
+    try:
+        return pd.read_csv(source, engine="pyarrow")
+    except Exception:
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return pd.read_csv(source)
+
+
+def probability_percent(result):
+    """
+    Positive-class probability as a rounded percentage; 0.0 when the
+    model cannot produce probabilities.
+    """
+    if result.probabilities is None:
+        return np.zeros(len(result.predictions))
+    return (result.probabilities * 100).round(2)
+
+
+def _reset_results():
+    st.session_state.raw_df = None
+    st.session_state.result_df = None
+    st.session_state.prediction_done = False
+    st.session_state.upload_id = None
+    st.session_state.upload_job = None
+    st.session_state.score_job = None
+
+
+def _await_job(job_id, text):
+    """
+    Finished job, or None after rendering a live progress bar.
+
+    The bar is a fragment that polls the job and reruns the whole
+    page once it completes, so the rest of the page stays usable.
+    """
+    job = wait_for_job(job_id, JOB_FAST_PATH_SECONDS)
+    if job is None or job.done:
+        return job
+
+    @st.fragment(run_every=JOB_POLL_SECONDS)
+    def _progress():
+        current = get_job(job_id)
+        if current is None or current.done:
+            st.rerun()
+        st.progress(
+            current.progress,
+            text=text.format(label=current.label, done=current.rows_done, total=current.rows_total)
+        )
+
+    _progress()
+    return None
+
+
+# -------------------------------------------------
+# PAGE SECTIONS
+# -------------------------------------------------
+def _sample_dataset(spec):
+    files = [f for f in os.listdir(DATA_FOLDER) if f.endswith(".csv")] if os.path.exists(DATA_FOLDER) else []
+
+    if not files:
+        st.warning(spec.sample_empty_message)
+        return
+
+    selected = st.selectbox(spec.sample_select_label, files)
+
+    if st.button(spec.sample_button_label, key=f"{spec.domain}_load_{selected}"):
+        with time_stage(spec.domain, "parse"):
+            st.session_state.raw_df = read_csv(os.path.join(DATA_FOLDER, selected))
+        st.session_state.prediction_done = False
+        st.session_state.score_job = None
+        if spec.sample_loaded_message:
+            st.success(spec.sample_loaded_message.format(name=selected))
+
+
+def _manual_entry(spec):
+    with st.form(spec.manual_form_key):
+        row = spec.manual_form()
+
+        if st.form_submit_button(spec.manual_submit_label):
+            st.session_state.raw_df = pd.DataFrame([row])
+            st.session_state.prediction_done = False
+            st.session_state.score_job = None
+            if spec.manual_added_message:
+                st.success(spec.manual_added_message)
+
+
+def _upload_csv(spec):
+    file = st.file_uploader(spec.upload_label, type=["csv"])
+    if not file:
+        return
+
+    # Parse once per uploaded file, not on every rerun
+    if file.file_id != st.session_state.upload_id:
+        job = submit_parse_job(
+            spec.domain, file.getvalue(), file.name, read_csv, session=st.session_state.session_id
+        )
+        st.session_state.upload_id = file.file_id
+        st.session_state.upload_job = job.id
+        st.session_state.raw_df = None
+        st.session_state.prediction_done = False
+        st.session_state.score_job = None
+
+    job = _await_job(st.session_state.upload_job, "Parsing {label}...")
+    if job is None:
+        st.stop()
+
+    if job.status == "failed":
+        st.error(f"Could not read {job.label}: {job.error}")
+        st.stop()
+
+    if st.session_state.raw_df is None:
+        st.session_state.raw_df = job_result(job)
+        if st.session_state.raw_df is None:
+            st.error(f"The parsed contents of {job.label} are no longer available; upload it again.")
+            st.session_state.upload_id = None
+            st.stop()
+        if spec.upload_message:
+            st.success(spec.upload_message)
+
+
+def _explain_k(spec):
+    return spec.explain_top_k if spec.explain_column else 0
+
+
+def _add_predictions(spec, df, result):
+    scored = spec.add_predictions(df.copy(), result)
+    if spec.explain_column and result.reasons is not None:
+        scored[spec.explain_column] = np.where(result.reasons == "", spec.explain_empty, result.reasons)
+    scored.attrs["score_stats"] = result.stats
+    return scored
+
+
+def _record_drift(spec, X):
+    summary = get_drift_summary(spec.domain)
+    if summary is not None:
+        summary.update(X)
+        summary.export(spec.domain)
+
+
+def _model_input(spec, df):
+    """
+    The validated feature columns plus any derived ones.
+    """
+    X = df[spec.feature_columns]
+    derived = spec.derive_features(df) if spec.derive_features else None
+    if derived is None:
+        return X
+    return pd.concat([X, derived], axis=1)
+
+
+def _run_prediction(spec, model, preprocessor, df, progress=None):
+    _record_drift(spec, df[spec.feature_columns])
+    result = score_frame(
+        spec.domain, model, preprocessor, _model_input(spec, df),
+        progress=progress,
+        explain=_explain_k(spec),
+        shadow=get_candidate(spec.domain)
+    )
+    return _add_predictions(spec, df, result)
+
+
+def _run_manual_prediction(spec, model, preprocessor, version, df):
+    _record_drift(spec, df[spec.feature_columns])
+    result = score_cached(
+        spec.domain, model, preprocessor, _model_input(spec, df), version,
+        explain=_explain_k(spec),
+        shadow=get_candidate(spec.domain)
+    )
+    return _add_predictions(spec, df, result)
+
+
+def _validate(spec, df):
+    """
+    Validation of the loaded frame against the training profile,
+    computed once per loaded frame and model version.
+
+    The cache holds the frame itself and matches it by identity: an
+    id() alone can be reused by a new frame once the old one is freed.
+    """
+    version = get_model_version(spec.domain)
+    cached = st.session_state.validation
+    if cached is None or cached[0] is not df or cached[1] != version:
+        with time_stage(spec.domain, "validate"):
+            result = validate_frame(df, spec.feature_columns, get_profile(spec.domain))
+        cached = (df, version, result)
+        st.session_state.validation = cached
+    return cached[2]
+
+
+def _quarantine(spec, df):
+    """
+    Stop on files that cannot be scored and set aside bad rows with
+    their reasons; returns the rows to score.
+    """
+    validation = _validate(spec, df)
+
+    if validation.rejected:
+        st.error(f"Missing required columns: {validation.missing_columns}")
+        st.stop()
+
+    if validation.error_rate > MAX_ERROR_RATE:
+        st.error(
+            f"{validation.error_rate:.0%} of rows cannot be scored, so the file was rejected. "
+            f"First problem: {validation.reasons[validation.errors].iloc[0]}"
+        )
+        st.stop()
+
+    if not (validation.errors.any() or validation.warnings.any()):
+        return df
+
+    hold_warnings = st.checkbox(
+        "Also hold back rows outside the training data",
+        key=f"{spec.domain}_quarantine_warnings"
+    )
+    keep = validation.keep_mask(hold_warnings)
+
+    if (~keep).any():
+        quarantined = df[~keep].assign(**{"Quarantine Reason": validation.reasons[~keep]})
+        st.warning(f"{len(quarantined):,} of {len(df):,} rows quarantined and not scored.")
+
+        with st.expander("Quarantined rows"):
+            st.dataframe(quarantined, use_container_width=True)
+            if validation.column_issues:
+                st.caption(" · ".join(f"{col}: {issue}" for col, issue in validation.column_issues.items()))
+            st.download_button(
+                "⬇️ Download Quarantined Rows",
+                quarantined.to_csv(index=False).encode("utf-8"),
+                file_name=f"{spec.domain}_quarantined_rows.csv",
+                mime="text/csv"
+            )
+
+    if validation.warnings.any() and not hold_warnings:
+        st.caption(f"{int(validation.warnings.sum()):,} rows lie outside the training data and will still be scored.")
+
+    if not keep.any():
+        st.error("No rows left to score.")
+        st.stop()
+
+    return df[keep]
+
+
+def _sensitivity(spec, model, preprocessor, df):
+    """
+    What-if sweep around the manual-entry record: one or two features
+    varied over a grid, scored in a single model call.
+    """
+    ranges = feature_ranges(preprocessor)
+    options = [f for f in spec.sensitivity_features if f in ranges]
+    if not options:
+        return
+
+    st.divider()
+    st.subheader("What-if Sensitivity")
+
+    features = st.multiselect(
+        "Vary up to two features:",
+        options,
+        default=options[:1],
+        max_selections=2,
+        key=f"{spec.domain}_sweep_features"
+    )
+    if not features:
+        return
+
+    points = st.slider("Points per feature", 10, 200, DEFAULT_POINTS, key=f"{spec.domain}_sweep_points")
+
+    base = df.iloc[0].to_dict()
+    grid = {}
+    for i, feature in enumerate(features):
+        numeric = ranges[feature][0] == "numeric"
+        grid[feature] = feature_values(
+            preprocessor,
+            feature,
+            base.get(feature) if numeric else None,
+            points if i == 0 else SWEEP_SERIES
+        )
+
+    sweep = sensitivity_sweep(spec.domain, model, preprocessor, base, grid)
+
+    label = spec.sensitivity_label
+    sweep[label] = sweep.pop("response")
+    if is_classifier(model):
+        sweep[label] = (sweep[label] * 100).round(2)
+
+    x = features[0]
+    if len(features) == 2:
+        series = sweep[features[1]]
+        if ranges[features[1]][0] == "numeric":
+            series = series.round(2)
+        chart = sweep.assign(**{features[1]: series}).pivot(index=x, columns=features[1], values=label)
+    else:
+        chart = sweep.set_index(x)[[label]]
+
+    if ranges[x][0] == "numeric":
+        st.line_chart(chart, x_label=x, y_label=label)
+    else:
+        st.bar_chart(chart, x_label=x, y_label=label)
+
+    st.caption(f"{len(sweep):,} what-if points scored in one model call")
+
+
+def _global_importances(spec):
+    """
+    Feature importances stored with the model at training time.
+    """
+    importances = get_importances(spec.domain)
+    if not importances:
+        return
+
+    meta = importances.get("meta", {})
+    charts = [
+        ("Permutation importance", {k: v["mean"] for k, v in importances.get("permutation", {}).items()}),
+        ("Coefficient magnitude", importances.get("coefficients")),
+        ("Impurity importance", importances.get("impurity"))
+    ]
+    charts = [(title, values) for title, values in charts if values]
+
+    with st.expander("What drives this model"):
+        columns = st.columns(len(charts))
+        for col, (title, values) in zip(columns, charts):
+            with col:
+                st.markdown(f"**{title}**")
+                series = pd.Series(values, name=title).sort_values(ascending=False)
+                st.bar_chart(series, horizontal=True)
+
+        st.caption(
+            f"{meta.get('model', 'Model')} · permutation importance = drop in "
+            f"{meta.get('metric', 'score')} over {meta.get('rows', 0):,} rows, "
+            f"{meta.get('repeats', 0)} shuffles per feature"
+        )
+
+
+def _drift_report(spec):
+    """
+    Drift of everything scored since the model was loaded, against
+    the training reference profile.
+    """
+    summary = get_drift_summary(spec.domain)
+    if summary is None or not summary.rows:
+        return
+
+    report = summary.report()
+    shifted = (report["Status"] != "Stable").sum()
+
+    with st.expander(f"Input drift vs training data ({shifted} shifted features)"):
+        st.dataframe(report.round(3), use_container_width=True, hide_index=True)
+        st.caption(
+            f"{summary.rows:,} scored rows since the model was loaded · "
+            "PSI < 0.1 stable, 0.1–0.25 moderate, > 0.25 major shift"
+        )
+
+
+def _prewarm_status(spec):
+    """
+    Whether the startup warm-up covered this domain's model.
+    """
+    report = prewarm_report()
+    if spec.domain not in report:
+        return
+
+    seconds = report[spec.domain]
+    if seconds is None:
+        st.caption("Startup warm-up failed for this model; it was loaded on first use.")
+    else:
+        st.caption(f"Model warmed at startup in {seconds:.2f} s")
+
+
+def _shadow_report(spec):
+    """
+    How the shadow candidate compares with production so far.
+    """
+    report = shadow_report(spec.domain)
+    if report is None:
+        return
+
+    st.caption(
+        f"Shadow candidate: {report['rows']:,} rows compared · "
+        f"{report['disagreement_rate']:.1%} disagree with production · "
+        f"predict time {report['latency_delta_seconds'] * 1000:+.0f} ms in total"
+    )
+
+
+def _recent_jobs(spec):
+    """
+    Reopen the results of this session's earlier scoring jobs for
+    this domain.
+    """
+    jobs = list_jobs(spec.domain, kind="score", session=st.session_state.session_id)
+    jobs = [j for j in jobs if j.status == "done"]
+    if not jobs:
+        return
+
+    with st.expander("Recent scoring jobs"):
+        for job in jobs:
+            c1, c2 = st.columns([4, 1])
+            finished = pd.Timestamp(job.finished, unit="s").strftime("%Y-%m-%d %H:%M:%S")
+            c1.write(f"{job.label or job.id} · {job.rows_total} rows · {finished}")
+
+            if c2.button("Open", key=f"{spec.domain}_job_{job.id}"):
+                result = job_result(job)
+                if result is None:
+                    st.error("Results for this job are no longer available.")
+                    continue
+                columns = job.meta.get("input_columns") or list(result.columns)
+                st.session_state.raw_df = result[columns]
+                st.session_state.result_df = result
+                st.session_state.prediction_done = True
+                st.session_state.score_job = None
+
+
+# -------------------------------------------------
+# PAGE
+# -------------------------------------------------
+def render_domain_page(spec):
+    """
+    Render a full domain page: input method, data preview,
+    prediction, results, visuals and CSV download.
+    """
+    st.set_page_config(
+        page_title=spec.page_title or spec.title,
+        layout="wide"
+    )
+    st.markdown(spec.css, unsafe_allow_html=True)
+
+    start_metrics_server()
+    start_reload_watcher()
+
+    # ?profile=1 or DECISIONFORGE_PROFILE
+    with profile_run(f"{spec.domain}_page", st.query_params.get("profile")):
+        _render(spec)
+
+
+def _render(spec):
+    domain = spec.domain
+
+    # ---------------- Session state
+    for k in SESSION_KEYS:
+        if k not in st.session_state:
+            st.session_state[k] = None if k != "prediction_done" else False
+    # Owner of this session's jobs; other sessions never see them
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+
+    # ---------------- Model & preprocessor
+    # One snapshot per run: a hot reload mid-run does not mix versions
+    with time_stage(domain, "load"):
+        snapshot = get_snapshot(domain)
+    model, preprocessor = snapshot.model, snapshot.preprocessor
+
+    # ---------------- Header
+    st.title(spec.title)
+    st.write(spec.description)
+    _prewarm_status(spec)
+    st.divider()
+
+    # ---------------- Input method
+    input_method = st.radio("Select Data Input Method:", INPUT_METHODS)
+
+    if st.session_state.input_method != input_method:
+        _reset_results()
+        st.session_state.input_method = input_method
+
+    st.divider()
+
+    if input_method == "Use Sample Dataset":
+        _sample_dataset(spec)
+    elif input_method == "Manual Entry":
+        _manual_entry(spec)
+    elif input_method == "Upload CSV":
+        _upload_csv(spec)
+
+    _recent_jobs(spec)
+
+    # ---------------- Data preview
+    if st.session_state.raw_df is None:
+        if spec.empty_message:
+            st.info(spec.empty_message)
+        st.stop()
+
+    df = st.session_state.raw_df
+
+    st.subheader("Data Preview")
+    st.dataframe(df, use_container_width=True)
+
+    # ---------------- Run prediction
+    st.divider()
+    if spec.prediction_title:
+        st.subheader(spec.prediction_title)
+
+    df = _quarantine(spec, df)
+
+    run = st.button(spec.run_button_label)
+
+    if run and input_method == "Manual Entry":
+        # A single record: memoised and scored inline, no job round-trip
+        st.session_state.result_df = _run_manual_prediction(spec, model, preprocessor, snapshot.version, df)
+        st.session_state.prediction_done = True
+        st.session_state.score_job = None
+        st.success(spec.run_message)
+
+    elif run:
+        requested_profile = st.query_params.get("profile")
+
+        def score(frame, progress):
+            # Scores with the artifacts of this run, even if they are reloaded meanwhile.
+            # The job runs on a worker thread, outside the page's profile
+            with profile_run(f"{domain}_score", requested_profile):
+                return _run_prediction(spec, model, preprocessor, frame, progress)
+
+        job = submit_score_job(
+            domain, score, df, label=f"{domain} prediction", session=st.session_state.session_id
+        )
+        st.session_state.score_job = job.id
+        st.session_state.prediction_done = False
+
+    if st.session_state.score_job:
+        job = _await_job(st.session_state.score_job, "Scoring rows: {done:,} / {total:,}")
+        if job is not None:
+            st.session_state.score_job = None
+            if job.status == "failed":
+                st.error(f"Prediction failed: {job.error}")
+            else:
+                st.session_state.result_df = job_result(job)
+                st.session_state.prediction_done = True
+                st.success(spec.run_message)
+
+    # ---------------- Results, visuals & download
+    if st.session_state.prediction_done:
+        with time_stage(domain, "render"):
+            result = st.session_state.result_df
+
+            st.subheader(spec.results_title)
+            st.dataframe(result, use_container_width=True)
+
+            stats = result.attrs.get("score_stats") or {}
+            if "unique_rows" in stats and stats["unique_rows"] < stats["rows"]:
+                st.caption(
+                    f"Scored {stats['unique_rows']:,} distinct rows for {stats['rows']:,} records "
+                    f"({stats['dedup_ratio']:.0%} duplicates skipped)"
+                )
+            if stats.get("cache_hits"):
+                st.caption(
+                    f"Served from the prediction cache "
+                    f"(hit rate {stats['cache_hit_rate']:.0%})"
+                )
+
+            report = spec.render_results(result, input_method)
+
+            _global_importances(spec)
+            _drift_report(spec)
+            _shadow_report(spec)
+
+            if input_method == "Manual Entry" and spec.sensitivity_features:
+                _sensitivity(spec, model, preprocessor, _model_input(spec, st.session_state.raw_df))
+
+            st.download_button(
+                spec.download_label,
+                report.to_csv(index=False).encode("utf-8"),
+                file_name=spec.download_file,
+                mime="text/csv"
+            )
@@ -0,0 +1,239 @@
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.artifacts import MODELS_DIR, reference_path
+from utils.metrics import gauge
+
+
+REFERENCE_BINS = 10
+
+# Category bucket for values never seen at training time
+OTHER = "__other__"
+
+# Floor for empty bins so PSI stays finite
+PSI_EPSILON = 1e-4
+
+FEATURE_PSI = gauge(
+    "decisionforge_feature_psi",
+    "Population stability index of scored inputs vs the training reference.",
+    ["domain", "feature"]
+)
+
+FEATURE_KS = gauge(
+    "decisionforge_feature_ks",
+    "Kolmogorov-Smirnov distance (binned) of scored inputs vs the training reference.",
+    ["domain", "feature"]
+)
+
+
+# -------------------------------------------------
+# REFERENCE PROFILE (TRAINING TIME)
+# -------------------------------------------------
+def build_reference(df, numerical_features, categorical_features, bins=REFERENCE_BINS):
+    """
+    Compact reference distribution of the training inputs.
+
+    Numeric columns keep the inner quantile edges of the training data
+    and the training counts per bin; categoricals keep their counts.
+    """
+    reference = {"numeric": {}, "categorical": {}}
+
+    for col in numerical_features:
+        values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+        values = values[~np.isnan(values)]
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1])) if len(values) else np.empty(0)
+        reference["numeric"][col] = {
+            "edges": edges.tolist(),
+            "counts": _bin_counts(values, edges).tolist()
+        }
+
+    for col in categorical_features:
+        counts = df[col].dropna().astype(str).value_counts()
+        reference["categorical"][col] = {str(k): int(v) for k, v in counts.items()}
+
+    return reference
+
+
+def save_reference(domain, reference, models_dir=MODELS_DIR):
+    with open(reference_path(domain, models_dir), "w", encoding="utf-8") as fh:
+        json.dump(reference, fh, indent=2)
+
+
+def _bin_counts(values, edges):
+    """
+    Counts per reference bin: (-inf, e0], (e0, e1], ..., (e_last, inf).
+    """
+    return np.bincount(np.searchsorted(edges, values, side="left"), minlength=len(edges) + 1)
+
+
+# -------------------------------------------------
+# DISTANCES
+# -------------------------------------------------
+def psi(expected, actual):
+    """
+    Population stability index between two count vectors.
+    """
+    e = np.maximum(np.asarray(expected, dtype=float) / max(np.sum(expected), 1), PSI_EPSILON)
+    a = np.maximum(np.asarray(actual, dtype=float) / max(np.sum(actual), 1), PSI_EPSILON)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def ks(expected, actual):
+    """
+    Largest CDF gap between two count vectors over the same ordered
+    bins, i.e. the KS statistic evaluated at the bin edges.
+    """
+    e = np.cumsum(expected) / max(np.sum(expected), 1)
+    a = np.cumsum(actual) / max(np.sum(actual), 1)
+    return float(np.max(np.abs(a - e)))
+
+
+def psi_status(value):
+    if value < 0.1:
+        return "Stable"
+    if value < 0.25:
+        return "Moderate shift"
+    return "Major shift"
+
+
+# -------------------------------------------------
+# STREAMING SUMMARY
+# -------------------------------------------------
+class DriftSummary:
+    """
+    Mergeable summary of scored inputs in the reference binning.
+
+    Memory is fixed per feature (one count per reference bin or known
+    category, plus an "other" bucket and a null count), whatever the
+    number of rows seen. Summaries from several workers combine with
+    merge() or via to_dict() / from_dict().
+    """
+
+    def __init__(self, reference):
+        self.reference = reference
+        self.rows = 0
+        self.nulls = {}
+        self.numeric = {}
+        self.categorical = {}
+
+        for col, ref in reference["numeric"].items():
+            self.numeric[col] = np.zeros(len(ref["edges"]) + 1, dtype=np.int64)
+            self.nulls[col] = 0
+        for col, ref in reference["categorical"].items():
+            self.categorical[col] = dict.fromkeys(list(ref) + [OTHER], 0)
+            self.nulls[col] = 0
+
+        self._lock = threading.Lock()
+
+    def update(self, df):
+        """
+        Add one scored batch (raw input columns).
+        """
+        numeric = {}
+        for col in self.numeric:
+            if col not in df.columns:
+                continue
+            values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+            missing = np.isnan(values)
+            edges = np.asarray(self.reference["numeric"][col]["edges"])
+            numeric[col] = (_bin_counts(values[~missing], edges), int(missing.sum()))
+
+        categorical = {}
+        for col, table in self.categorical.items():
+            if col not in df.columns:
+                continue
+            values = df[col]
+            counts = values.dropna().astype(str).value_counts()
+            known = counts.index.isin(list(table))
+            categorical[col] = (counts[known], int(counts[~known].sum()), int(values.isna().sum()))
+
+        with self._lock:
+            self.rows += len(df)
+            for col, (counts, missing) in numeric.items():
+                self.numeric[col] += counts
+                self.nulls[col] += missing
+            for col, (counts, other, missing) in categorical.items():
+                table = self.categorical[col]
+                for key, value in counts.items():
+                    table[key] += int(value)
+                table[OTHER] += other
+                self.nulls[col] += missing
+
+    def merge(self, other):
+        """
+        Fold another summary over the same reference into this one.
+        """
+        with self._lock:
+            self.rows += other.rows
+            for col, counts in other.numeric.items():
+                self.numeric[col] += counts
+            for col, table in other.categorical.items():
+                for key, value in table.items():
+                    self.categorical[col][key] += value
+            for col, value in other.nulls.items():
+                self.nulls[col] += value
+        return self
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "rows": self.rows,
+                "nulls": dict(self.nulls),
+                "numeric": {col: counts.tolist() for col, counts in self.numeric.items()},
+                "categorical": {col: dict(table) for col, table in self.categorical.items()}
+            }
+
+    @classmethod
+    def from_dict(cls, reference, data):
+        summary = cls(reference)
+        summary.rows = data["rows"]
+        summary.nulls.update(data["nulls"])
+        for col, counts in data["numeric"].items():
+            summary.numeric[col] = np.asarray(counts, dtype=np.int64)
+        for col, table in data["categorical"].items():
+            summary.categorical[col].update(table)
+        return summary
+
+    def report(self):
+        """
+        PSI (and binned KS for numerics) per feature against the reference,
+        most drifted first.
+        """
+        rows = []
+
+        for col, counts in self.numeric.items():
+            expected = self.reference["numeric"][col]["counts"]
+            rows.append({
+                "Feature": col,
+                "PSI": psi(expected, counts),
+                "KS": ks(expected, counts),
+                "Rows": int(counts.sum()),
+                "Nulls": self.nulls[col]
+            })
+
+        for col, table in self.categorical.items():
+            ref = self.reference["categorical"][col]
+            expected = [ref.get(k, 0) for k in table]
+            rows.append({
+                "Feature": col,
+                "PSI": psi(expected, list(table.values())),
+                "KS": None,
+                "Rows": int(sum(table.values())),
+                "Nulls": self.nulls[col]
+            })
+
+        report = pd.DataFrame(rows, columns=["Feature", "PSI", "KS", "Rows", "Nulls"])
+        report["Status"] = report["PSI"].map(psi_status)
+        return report.sort_values("PSI", ascending=False, ignore_index=True)
+
+    def export(self, domain):
+        """
+        Publish the current PSI / KS values on the metrics endpoint.
+        """
+        for row in self.report().itertuples(index=False):
+            FEATURE_PSI.labels(domain=domain, feature=row.Feature).set(row.PSI)
+            if row.KS is not None and not pd.isna(row.KS):
+                FEATURE_KS.labels(domain=domain, feature=row.Feature).set(row.KS)
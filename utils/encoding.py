@@ -0,0 +1,234 @@
+import os
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from sklearn.base import BaseEstimator, TransformerMixin, clone
+from sklearn.ensemble import HistGradientBoostingClassifier, HistGradientBoostingRegressor
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, TargetEncoder
+
+
+# Name of the native categorical candidate in every training comparison
+NATIVE_MODEL = "HistGradientBoosting (native categorical)"
+
+# HistGradientBoosting bins categories into at most 255 codes; rarer
+# categories beyond that are grouped into one
+MAX_NATIVE_CATEGORIES = 255
+
+# Categorical encoding of new trainings: one strategy for every feature
+# ("hashing") or per feature ("JobRole=target,Supplier=hashing"; the
+# features left out are one-hot encoded)
+DEFAULT_ENCODING = os.environ.get("DECISIONFORGE_ENCODING", "onehot")
+
+# infrequent: categories seen in fewer than this share of training rows
+# are grouped, and at most MAX_CATEGORIES columns are kept per feature
+MIN_FREQUENCY = float(os.environ.get("DECISIONFORGE_MIN_FREQUENCY", "0.01"))
+MAX_CATEGORIES = int(os.environ.get("DECISIONFORGE_MAX_CATEGORIES", "50"))
+
+# hashing: output columns per feature
+HASH_WIDTH = int(os.environ.get("DECISIONFORGE_HASH_WIDTH", "32"))
+
+ENCODINGS = ("onehot", "ordinal", "infrequent", "hashing", "target")
+
+
+# -------------------------------------------------
+# HASHING
+# -------------------------------------------------
+class HashingEncoder(TransformerMixin, BaseEstimator):
+    """
+    Every categorical column hashed into its own n_features 0/1 columns:
+    fixed width whatever the number of distinct values, no vocabulary
+    kept, and unseen values land in a bucket like any other.
+    """
+
+    def __init__(self, n_features=HASH_WIDTH):
+        self.n_features = n_features
+
+    def fit(self, X, y=None):
+        self.n_features_in_ = np.asarray(X).shape[1]
+        return self
+
+    def transform(self, X):
+        X = np.asarray(X, dtype=object)
+        n_rows, n_columns = X.shape
+        hasher = FeatureHasher(self.n_features, input_type="string", alternate_sign=False)
+
+        columns = []
+        for j in range(n_columns):
+            # Hash each distinct value once
+            values, inverse = np.unique(X[:, j].astype(str), return_inverse=True)
+            buckets = hasher.transform([[v] for v in values]).indices
+            columns.append(buckets[inverse] + j * self.n_features)
+
+        # Exactly one 1 per row and feature
+        indices = np.column_stack(columns).ravel()
+        indptr = np.arange(0, n_rows * n_columns + 1, n_columns)
+        return sp.csr_matrix(
+            (np.ones(len(indices)), indices, indptr),
+            shape=(n_rows, n_columns * self.n_features)
+        )
+
+    def get_feature_names_out(self, input_features=None):
+        if input_features is None:
+            input_features = [f"x{j}" for j in range(self.n_features_in_)]
+        return np.array([f"{f}_h{i}" for f in input_features for i in range(self.n_features)], dtype=object)
+
+
+# -------------------------------------------------
+# CATEGORICAL ENCODERS
+# -------------------------------------------------
+def categorical_encoder(encoding="onehot", target_type="auto"):
+    """
+    Encoder step of a categorical pipeline.
+
+    onehot     : sparse one-hot columns (default, every model type)
+    ordinal    : one integer code per column, for models with native
+                 categorical support; unseen categories become NaN,
+                 which those models treat as missing
+    infrequent : one-hot with rare categories (MIN_FREQUENCY) grouped
+                 into one column, at most MAX_CATEGORIES per feature;
+                 unseen categories count as infrequent
+    hashing    : HASH_WIDTH hashed columns per feature (HashingEncoder)
+    target     : one column per feature (per class for multiclass) with
+                 the smoothed target mean of its category; fit_transform
+                 encodes the training rows out-of-fold, so a row's own
+                 target never leaks into its encoding; target_type
+                 "continuous" for regression (integer targets would
+                 otherwise be read as classes)
+    """
+    if encoding == "onehot":
+        return OneHotEncoder(handle_unknown="ignore")
+    if encoding == "ordinal":
+        return OrdinalEncoder(
+            handle_unknown="use_encoded_value",
+            unknown_value=np.nan,
+            max_categories=MAX_NATIVE_CATEGORIES
+        )
+    if encoding == "infrequent":
+        return OneHotEncoder(
+            handle_unknown="infrequent_if_exist",
+            min_frequency=MIN_FREQUENCY,
+            max_categories=MAX_CATEGORIES
+        )
+    if encoding == "hashing":
+        return HashingEncoder()
+    if encoding == "target":
+        return TargetEncoder(target_type=target_type, random_state=42)
+    raise ValueError(f"Unknown categorical encoding '{encoding}'")
+
+
+def parse_encoding(encoding):
+    """
+    "hashing" -> "hashing"; "JobRole=target,Supplier=hashing" ->
+    {"JobRole": "target", "Supplier": "hashing"}.
+    """
+    if not isinstance(encoding, str) or "=" not in encoding:
+        return encoding
+    return dict(part.split("=", 1) for part in encoding.split(",") if part)
+
+
+def categorical_transformers(features, encoding="onehot", target_type="auto"):
+    """
+    ColumnTransformer entries (imputer + encoder pipelines) for the
+    categorical features.
+
+    encoding is one strategy for every feature, or {feature: strategy}
+    with the features left out one-hot encoded. Features sharing a
+    strategy share one pipeline: "cat" for onehot / ordinal (the
+    original layout) and "cat_<strategy>" for the others.
+
+    ordinal is only accepted for every feature at once: it feeds the
+    native categorical candidate, which reads all of "cat" as codes.
+    """
+    encoding = parse_encoding(encoding)
+    if isinstance(encoding, str):
+        encoding = {feature: encoding for feature in features}
+    elif "ordinal" in encoding.values():
+        raise ValueError("The ordinal encoding applies to every feature; it cannot be set per feature")
+
+    unknown = set(encoding.values()) - set(ENCODINGS)
+    if unknown:
+        raise ValueError(f"Unknown categorical encoding {sorted(unknown)}")
+
+    groups = {}
+    for feature in features:
+        groups.setdefault(encoding.get(feature, "onehot"), []).append(feature)
+
+    return [
+        (
+            "cat" if strategy in ("onehot", "ordinal") else f"cat_{strategy}",
+            Pipeline(steps=[
+                ("imputer", SimpleImputer(strategy="most_frequent")),
+                ("encoder", categorical_encoder(strategy, target_type))
+            ]),
+            columns
+        )
+        for strategy, columns in groups.items()
+    ]
+
+
+def native_categorical_mask(preprocessor):
+    """
+    Which output columns of a fitted ColumnTransformer hold
+    categorical codes (the "cat" transformer's outputs).
+    """
+    return np.array([name.startswith("cat__") for name in preprocessor.get_feature_names_out()])
+
+
+# -------------------------------------------------
+# NATIVE CATEGORICAL CANDIDATE
+# -------------------------------------------------
+def native_gradient_boosting(preprocessor, classifier=True, random_state=42):
+    """
+    HistGradientBoosting splitting directly on the ordinal codes of a
+    fitted encoding="ordinal" preprocessor: one input per categorical
+    column instead of one per category.
+    """
+    cls = HistGradientBoostingClassifier if classifier else HistGradientBoostingRegressor
+    return cls(
+        categorical_features=native_categorical_mask(preprocessor),
+        random_state=random_state
+    )
+
+
+def matrix_stats(X):
+    """
+    Width and memory of a transformed matrix, for the training report.
+    """
+    if sp.issparse(X):
+        nbytes = X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+    else:
+        nbytes = np.asarray(X).nbytes
+    return {"matrix_width": X.shape[1], "matrix_kb": nbytes / 1024}
+
+
+def add_native_speedups(results, native, X_train, y_train, X_test):
+    """
+    Fit & predict time of the same HistGradientBoosting on the one-hot
+    matrix divided by those of the native categorical candidate, stored
+    on the candidate's results: the time saved by not expanding the
+    categories, with the algorithm held fixed.
+    """
+    scores = results.get(NATIVE_MODEL)
+    if scores is None:
+        return results
+
+    onehot = clone(native).set_params(categorical_features=None)
+    X_train = X_train.toarray() if sp.issparse(X_train) else X_train
+    X_test = X_test.toarray() if sp.issparse(X_test) else X_test
+
+    start = time.perf_counter()
+    onehot.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    onehot.predict(X_test)
+    predict_seconds = time.perf_counter() - start
+
+    scores["fit_speedup"] = fit_seconds / max(scores["fit_seconds"], 1e-9)
+    scores["predict_speedup"] = predict_seconds / max(scores["predict_seconds"], 1e-9)
+    return results
@@ -0,0 +1,355 @@
+import threading
+
+import numpy as np
+import scipy.sparse as sp
+
+from sklearn.ensemble._forest import BaseForest
+from sklearn.ensemble._gb import BaseGradientBoosting
+from sklearn.ensemble._hist_gradient_boosting.gradient_boosting import BaseHistGradientBoosting
+from sklearn.ensemble._hist_gradient_boosting.predictor import TreePredictor
+from sklearn.utils._openmp_helpers import _openmp_effective_n_threads
+from sklearn.tree import BaseDecisionTree
+from sklearn.utils.extmath import safe_sparse_dot
+
+
+DEFAULT_TOP_K = 3
+
+
+# -------------------------------------------------
+# TRANSFORMED -> ORIGINAL COLUMNS
+# -------------------------------------------------
+def output_columns(preprocessor):
+    """
+    Input column behind every output column of a fitted
+    ColumnTransformer (one-hot outputs map back to their source column).
+    """
+    sources = []
+
+    for name, transformer, columns in preprocessor.transformers_:
+        if transformer == "drop" or len(columns) == 0:
+            continue
+
+        columns = list(columns)
+        if transformer == "passthrough":
+            sources.extend(columns)
+            continue
+
+        by_length = sorted(columns, key=len, reverse=True)
+        for out in transformer.get_feature_names_out(columns):
+            if out in columns:
+                sources.append(out)
+            else:
+                sources.append(next(c for c in by_length if out.startswith(f"{c}_")))
+
+    return sources
+
+
+def grouping_matrix(preprocessor):
+    """
+    Sparse (n_outputs x n_inputs) 0/1 matrix summing output-column
+    contributions into their input column, and the input column names.
+    """
+    sources = output_columns(preprocessor)
+    names = list(dict.fromkeys(sources))
+    index = {name: i for i, name in enumerate(names)}
+
+    cols = np.array([index[s] for s in sources])
+    G = sp.csr_matrix(
+        (np.ones(len(sources)), (np.arange(len(sources)), cols)),
+        shape=(len(sources), len(names))
+    )
+    return G, names
+
+
+# -------------------------------------------------
+# EXPLAINERS
+# -------------------------------------------------
+class _Explainer:
+    """
+    contributions(Xp) -> (n_rows x n_inputs) array, one column per
+    input column named in self.names.
+    """
+
+    def __init__(self, names):
+        self.names = np.array(names, dtype=object)
+
+
+class LinearExplainer(_Explainer):
+    """
+    Exact contributions of a linear model: coef_j * x_j, summed per
+    input column with one sparse product Xp @ W. Units: decision
+    function (log-odds for LogisticRegression).
+    """
+
+    def __init__(self, model, G, names):
+        super().__init__(names)
+        coef = np.asarray(model.coef_).reshape(-1, G.shape[0])[-1]
+        self.W = sp.csr_matrix(sp.diags(coef) @ G)
+
+    def contributions(self, Xp):
+        return np.asarray(safe_sparse_dot(Xp, self.W, dense_output=True))
+
+
+def path_sums(value, left, right, feature, G):
+    """
+    Per node, the sum of value(node) - value(parent) along the path from
+    the root, each delta on its parent's split feature, grouped into
+    input columns (node_count x n_inputs). Leaves have left = -1.
+    """
+    node_count = len(value)
+    internal = np.flatnonzero(left >= 0)
+
+    children = np.concatenate([left[internal], right[internal]])
+    parents = np.concatenate([internal, internal])
+
+    parent = np.full(node_count, -1)
+    parent[children] = parents
+
+    # Node deltas on the parent's split feature, grouped into input columns
+    deltas = sp.csr_matrix(
+        (value[children] - value[parents], (children, feature[parents])),
+        shape=(node_count, G.shape[0])
+    )
+    sums = (deltas @ G).toarray()
+
+    # Accumulate root-to-node sums one depth level at a time
+    level = np.array([0])
+    while level.size:
+        level = np.concatenate([left[level], right[level]])
+        level = level[level >= 0]
+        sums[level] += sums[parent[level]]
+
+    return sums
+
+
+class TreePathExplainer(_Explainer):
+    """
+    Saabas path contributions for sklearn trees & forests.
+
+    Every node carries value(node) - value(parent) on the feature its
+    parent split on. A row's contributions are the sum of those deltas
+    along its decision path, which depends only on the leaf it lands
+    in: per-leaf sums are precomputed once, so explaining is apply()
+    plus a gather per tree. Forests average their trees and gradient
+    boosting adds them up scaled by the learning rate. Units:
+    positive-class probability for tree & forest classifiers, log-odds
+    for boosted classifiers, target units for regressors.
+    """
+
+    def __init__(self, model, G, names):
+        super().__init__(names)
+        if isinstance(model, BaseGradientBoosting):
+            trees, self.scale = model.estimators_[:, 0], model.learning_rate
+        elif isinstance(model, BaseForest):
+            trees, self.scale = model.estimators_, 1 / len(model.estimators_)
+        else:
+            trees, self.scale = [model], 1.0
+        self.trees = [(est.tree_, self._path_sums(est.tree_, G)) for est in trees]
+
+    @staticmethod
+    def _path_sums(tree, G):
+        value = tree.value[:, 0, :]
+        if value.shape[1] > 1:
+            # Classifier: fraction of the positive class
+            value = value[:, -1] / value.sum(axis=1)
+        else:
+            value = value[:, 0]
+        return path_sums(value, tree.children_left, tree.children_right, tree.feature, G)
+    def contributions(self, Xp):
+        # The tree kernels want float32 (CSR for sparse input)
+        if sp.issparse(Xp):
+            X = sp.csr_matrix(Xp, dtype=np.float32)
+        else:
+            X = np.ascontiguousarray(Xp, dtype=np.float32)
+
+        total = np.zeros((X.shape[0], len(self.names)))
+        for tree, sums in self.trees:
+            total += sums[tree.apply(X)]
+        return total * self.scale
+
+
+class HistGradientBoostingExplainer(_Explainer):
+    """
+    Saabas path contributions for HistGradientBoosting (binary
+    classifiers & regressors), as in TreePathExplainer. Leaves are
+    found by predicting with a copy of each tree whose leaf values are
+    the leaf ids, so HistGradientBoosting's own handling of categorical
+    splits and missing values decides the path. Units: log-odds for
+    classifiers, target units for regressors.
+
+    With categorical features the model re-encodes its input and moves
+    those columns first; split features are mapped back to the input
+    columns.
+    """
+
+    def __init__(self, model, G, names):
+        super().__init__(names)
+        self.model = model
+        self.scale = model.learning_rate
+        self.bitsets, self.f_idx_map = model._bin_mapper.make_known_categories_bitsets()
+        self.trees = []
+
+        # Input column behind every column the trees split on
+        columns = np.arange(model.n_features_in_)
+        if model._preprocessor is not None:
+            columns = np.empty(model.n_features_in_, dtype=np.int64)
+            for name, _, selected in model._preprocessor.transformers_:
+                selected = np.arange(model.n_features_in_)[selected]
+                columns[model._preprocessor.output_indices_[name]] = selected
+
+        for predictors in model._predictors:
+            predictor = predictors[0]
+            nodes = predictor.nodes
+            is_leaf = nodes["is_leaf"].astype(bool)
+
+            # Leaf values carry the learning rate, inner node values not
+            value = np.where(is_leaf, nodes["value"] / self.scale, nodes["value"])
+            left = np.where(is_leaf, -1, nodes["left"].astype(np.int64))
+            right = np.where(is_leaf, -1, nodes["right"].astype(np.int64))
+            sums = path_sums(value, left, right, columns[nodes["feature_idx"]], G)
+
+            leaf_ids = nodes.copy()
+            leaf_ids["value"] = np.arange(len(nodes))
+            finder = TreePredictor(leaf_ids, predictor.binned_left_cat_bitsets, predictor.raw_left_cat_bitsets)
+            self.trees.append((finder, sums))
+
+    def contributions(self, Xp):
+        X = self.model._preprocess_X(Xp.toarray() if sp.issparse(Xp) else Xp, reset=False)
+        n_threads = _openmp_effective_n_threads()
+
+        total = np.zeros((X.shape[0], len(self.names)))
+        for finder, sums in self.trees:
+            leaves = finder.predict(X, self.bitsets, self.f_idx_map, n_threads).astype(np.int64)
+            total += sums[leaves]
+        return total * self.scale
+
+
+class XGBoostExplainer(_Explainer):
+    """
+    Tree SHAP contributions from XGBoost (pred_contribs), bias dropped.
+    Units: margin (log-odds for binary classifiers).
+    """
+
+    def __init__(self, model, G, names):
+        super().__init__(names)
+        self.booster = model.get_booster()
+        self.G = G
+
+    def contributions(self, Xp):
+        import xgboost
+
+        contribs = self.booster.predict(xgboost.DMatrix(Xp), pred_contribs=True)
+        return np.asarray(safe_sparse_dot(contribs[:, :-1], self.G, dense_output=True))
+
+
+class CascadeExplainer(_Explainer):
+    """
+    Each row explained by the stage that scored it (utils.cascade):
+    the cheap model's contributions, replaced by the heavy model's for
+    rows routed to it. Units follow the stage, so only the ranking
+    within a row is comparable.
+    """
+
+    def __init__(self, model, cheap, heavy, names):
+        super().__init__(names)
+        self.model, self.cheap, self.heavy = model, cheap, heavy
+
+    def contributions(self, Xp):
+        total = self.cheap.contributions(Xp)
+
+        rows = np.flatnonzero(self.model.routed(self.model.cheap.predict_proba(Xp)[:, 1]))
+        if len(rows):
+            X_routed = Xp[rows] if sp.issparse(Xp) else np.asarray(Xp)[rows]
+            total[rows] = self.heavy.contributions(X_routed)
+        return total
+
+
+def make_explainer(model, preprocessor):
+    """
+    Explainer for the model type, or None when it is not supported.
+    """
+    G, names = grouping_matrix(preprocessor)
+
+    # Distilled classifiers are explained through the regressor they wrap
+    model = getattr(model, "regressor_", model)
+
+    if hasattr(model, "routed"):
+        cheap, heavy = make_explainer(model.cheap, preprocessor), make_explainer(model.heavy, preprocessor)
+        if cheap is None or heavy is None:
+            return None
+        return CascadeExplainer(model, cheap, heavy, names)
+
+    if hasattr(model, "get_booster"):
+        return XGBoostExplainer(model, G, names)
+    if isinstance(model, BaseHistGradientBoosting):
+        if model.n_trees_per_iteration_ != 1:
+            return None
+        return HistGradientBoostingExplainer(model, G, names)
+    if isinstance(model, (BaseDecisionTree, BaseForest, BaseGradientBoosting)):
+        return TreePathExplainer(model, G, names)
+    if hasattr(model, "coef_"):
+        return LinearExplainer(model, G, names)
+    return None
+
+
+# domain -> (model, preprocessor, explainer) of the pair last explained.
+# One slot per domain: a reloaded model replaces the entry instead of
+# piling up, so old versions are not kept alive.
+_explainers = {}
+_explainers_lock = threading.Lock()
+
+
+def get_explainer(model, preprocessor, domain=None):
+    """
+    Explainer of the domain's loaded (model, preprocessor) pair, built
+    once and rebuilt when either object changes.
+    """
+    entry = _explainers.get(domain)
+    if entry is None or entry[0] is not model or entry[1] is not preprocessor:
+        with _explainers_lock:
+            entry = _explainers.get(domain)
+            if entry is None or entry[0] is not model or entry[1] is not preprocessor:
+                entry = (model, preprocessor, make_explainer(model, preprocessor))
+                _explainers[domain] = entry
+    return entry[2]
+
+
+# -------------------------------------------------
+# TOP-K REASONS
+# -------------------------------------------------
+def top_reasons(contributions, names, k=DEFAULT_TOP_K, empty=""):
+    """
+    Names of the (up to) k features pushing each row hardest towards
+    the positive class / a higher prediction, e.g. "ClaimAmount, Age".
+
+    argpartition picks the k largest per row in O(n_features) and only
+    those k are sorted. Rows are then encoded as one integer per
+    distinct reason list, so only the distinct lists are formatted.
+    """
+    n_rows, n_features = contributions.shape
+    k = min(k, n_features)
+    if n_rows == 0 or k == 0:
+        return np.full(n_rows, empty, dtype=object)
+
+    top = np.argpartition(-contributions, k - 1, axis=1)[:, :k]
+    values = np.take_along_axis(contributions, top, axis=1)
+
+    order = np.argsort(-values, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    values = np.take_along_axis(values, order, axis=1)
+
+    # 0 = no reason in this slot, i + 1 = feature i
+    slots = np.where(values > 0, top + 1, 0)
+    codes = slots @ (n_features + 1) ** np.arange(k, dtype=np.int64)
+
+    distinct, inverse = np.unique(codes, return_inverse=True)
+    labels = []
+    for code in distinct:
+        picked = []
+        for _ in range(k):
+            code, slot = divmod(code, n_features + 1)
+            if slot:
+                picked.append(names[slot - 1])
+        labels.append(", ".join(picked) if picked else empty)
+
+    return np.array(labels, dtype=object)[inverse.reshape(-1)]
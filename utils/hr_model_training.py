@@ -1,3 +1,5 @@
+import time
+
 import joblib
 import pandas as pd
 
@@ -12,10 +14,26 @@ from sklearn.metrics import (
     f1_score
 )
 
-from utils.hr_preprocessing import preprocess_hr_data
+from utils.hr_preprocessing import CATEGORICAL_FEATURES, NUMERICAL_FEATURES, preprocess_hr_data
+from utils.model_selection import inference_costs, select_model
+from utils.pruning import prune_forest, pruning_summary
+from utils.matrix_layout import check_layout, set_layout
+from utils.encoding import (
+    DEFAULT_ENCODING,
+    NATIVE_MODEL,
+    add_native_speedups,
+    matrix_stats,
+    native_gradient_boosting
+)
+from utils.artifacts import artifact_paths, publish_version, stage_version
+from utils.drift import build_reference, save_reference
+from utils.validation import build_profile, save_profile
+from utils.importance import compute_importances, save_importances
+from utils.profiling import profiled
 
 
-def train_hr_models(df):
+@profiled("train_hr")
+def train_hr_models(df, encoding=DEFAULT_ENCODING):
     """
     Train and compare HR attrition models.
     Saves the best model to disk.
@@ -24,7 +42,11 @@ def train_hr_models(df):
     # -------------------------------------------------
     # PREPROCESS DATA
     # -------------------------------------------------
-    X_train, X_test, y_train, y_test, preprocessor = preprocess_hr_data(df)
+    X_train, X_test, y_train, y_test, preprocessor = preprocess_hr_data(df, encoding=encoding)
+
+    # Same split with categoricals as ordinal codes, for the native
+    # categorical candidate (no one-hot expansion)
+    X_train_native, X_test_native, _, _, native_preprocessor = preprocess_hr_data(df, encoding="ordinal")
 
     # -------------------------------------------------
     # MODELS
@@ -36,7 +58,8 @@ def train_hr_models(df):
             n_estimators=200,
             random_state=42,
             n_jobs=-1
-        )
+        ),
+        NATIVE_MODEL: native_gradient_boosting(native_preprocessor)
     }
 
     results = {}
@@ -45,27 +68,95 @@ def train_hr_models(df):
     # TRAIN & EVALUATE
     # -------------------------------------------------
     for name, model in models.items():
-        model.fit(X_train, y_train)
+        if name == NATIVE_MODEL:
+            X_fit, X_eval = X_train_native, X_test_native
+        else:
+            X_fit, X_eval = X_train, X_test
 
-        y_pred = model.predict(X_test)
+        start = time.perf_counter()
+        model.fit(X_fit, y_train)
+        fit_seconds = time.perf_counter() - start
+
+        # Keep only the trees (and depth) the forest needs, chosen on its
+        # out-of-bag rows (see utils.pruning)
+        if name == "Random Forest":
+            model = models[name] = prune_forest(model, X_fit, y_train)
+
+        start = time.perf_counter()
+        y_pred = model.predict(X_eval)
+        predict_seconds = time.perf_counter() - start
 
         results[name] = {
             "accuracy": accuracy_score(y_test, y_pred),
             "precision": precision_score(y_test, y_pred, pos_label="Yes"),
             "recall": recall_score(y_test, y_pred, pos_label="Yes"),
-            "f1_score": f1_score(y_test, y_pred, pos_label="Yes")
+            "f1_score": f1_score(y_test, y_pred, pos_label="Yes"),
+            "fit_seconds": fit_seconds,
+            "predict_seconds": predict_seconds
         }
 
+        results[name].update(inference_costs(model, X_eval, predict_seconds))
+        results[name].update(matrix_stats(X_fit))
+        results[name].update(pruning_summary(model))
+
+    add_native_speedups(results, models[NATIVE_MODEL], X_train, y_train, X_test)
+
     # -------------------------------------------------
-    # SELECT BEST MODEL (BY F1 SCORE)
+    # SELECT BEST MODEL (F1 SCORE, LATENCY & SIZE; SEE utils.model_selection)
     # -------------------------------------------------
-    best_model_name = max(results, key=lambda x: results[x]["f1_score"])
+    best_model_name = select_model(results, "f1_score")
     best_model = models[best_model_name]
 
+    # The native candidate is served with its own (ordinal) preprocessor
+    if best_model_name == NATIVE_MODEL:
+        preprocessor, X_test = native_preprocessor, X_test_native
+
+    # Serve transformed batches in the dtype & format (float32 / CSR by
+    # measured density) the model consumes without converting them
+    layout = set_layout(preprocessor, best_model, X_test)
+    check_layout(best_model, X_test, layout)
+
     # -------------------------------------------------
     # SAVE MODEL & PREPROCESSOR
     # -------------------------------------------------
-    joblib.dump(best_model, "models/hr_model.pkl")
-    joblib.dump(preprocessor, "models/hr_preprocessor.pkl")
+    # Written into a staging directory and published at the end, so a
+    # running app never loads a half-written version
+    staging = stage_version("hr")
+    model_path, preprocessor_path = artifact_paths("hr", staging)
+
+    joblib.dump(best_model, model_path)
+    joblib.dump(preprocessor, preprocessor_path)
+
+    # -------------------------------------------------
+    # GLOBAL FEATURE IMPORTANCES (RENDERED BY THE PAGE)
+    # -------------------------------------------------
+    save_importances(
+        "hr",
+        compute_importances(best_model, preprocessor, X_test, y_test),
+        staging
+    )
+
+    # -------------------------------------------------
+    # REFERENCE PROFILE FOR DRIFT MONITORING
+    # -------------------------------------------------
+    save_reference(
+        "hr",
+        build_reference(df, NUMERICAL_FEATURES, CATEGORICAL_FEATURES),
+        staging
+    )
+
+    # -------------------------------------------------
+    # DATA PROFILE FOR INPUT VALIDATION
+    # -------------------------------------------------
+    save_profile(
+        "hr",
+        build_profile(df, NUMERICAL_FEATURES, CATEGORICAL_FEATURES),
+        staging
+    )
+
+    # -------------------------------------------------
+    # PUBLISH (ATOMIC SWAP, HOT-RELOADED BY RUNNING APPS)
+    # -------------------------------------------------
+    publish_version("hr", staging)
 
     return results, best_model_name
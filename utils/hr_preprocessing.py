@@ -1,24 +1,45 @@
 import pandas as pd
 
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import StandardScaler
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
 
+from utils.encoding import categorical_transformers
+
+
+# -------------------------------------------------
+# FEATURE SCHEMA
+# -------------------------------------------------
+CATEGORICAL_FEATURES = [
+    "Gender",
+    "Department",
+    "JobRole",
+    "OverTime"
+]
+
+NUMERICAL_FEATURES = [
+    "Age",
+    "MonthlyIncome",
+    "JobSatisfaction",
+    "YearsAtCompany"
+]
+
 
 def preprocess_hr_data(
     df: pd.DataFrame,
     target_column: str = "Attrition",
     test_size: float = 0.2,
-    random_state: int = 42
+    random_state: int = 42,
+    encoding: str | dict = "onehot"
 ):
     """
     HR Data Preprocessing Pipeline
 
     Steps:
     1. Handle missing values
-    2. Encode categorical variables
+    2. Encode categorical variables (see utils.encoding.categorical_transformers)
     3. Scale numerical features
     4. Split train/test data
 
@@ -43,19 +64,8 @@ def preprocess_hr_data(
     # -----------------------------
     # Define feature groups
     # -----------------------------
-    categorical_features = [
-        "Gender",
-        "Department",
-        "JobRole",
-        "OverTime"
-    ]
-
-    numerical_features = [
-        "Age",
-        "MonthlyIncome",
-        "JobSatisfaction",
-        "YearsAtCompany"
-    ]
+    categorical_features = CATEGORICAL_FEATURES
+    numerical_features = NUMERICAL_FEATURES
 
     # -----------------------------
     # Numerical pipeline
@@ -65,21 +75,13 @@ def preprocess_hr_data(
         ("scaler", StandardScaler())
     ])
 
-    # -----------------------------
-    # Categorical pipeline
-    # -----------------------------
-    categorical_pipeline = Pipeline(steps=[
-        ("imputer", SimpleImputer(strategy="most_frequent")),
-        ("encoder", OneHotEncoder(handle_unknown="ignore"))
-    ])
-
     # -----------------------------
     # Combine pipelines
     # -----------------------------
     preprocessor = ColumnTransformer(
         transformers=[
             ("num", numeric_pipeline, numerical_features),
-            ("cat", categorical_pipeline, categorical_features)
+            *categorical_transformers(categorical_features, encoding)
         ]
     )
 
@@ -97,7 +99,8 @@ def preprocess_hr_data(
     # -----------------------------
     # Fit on train, transform both
     # -----------------------------
-    X_train_processed = preprocessor.fit_transform(X_train)
+    # y is only used by target encoding (out-of-fold on the training rows)
+    X_train_processed = preprocessor.fit_transform(X_train, y_train)
     X_test_processed = preprocessor.transform(X_test)
 
     return (
@@ -0,0 +1,126 @@
+import json
+import time
+
+import numpy as np
+
+from joblib import Parallel, delayed
+from sklearn.base import is_classifier
+
+from utils.artifacts import MODELS_DIR, importances_path
+from utils.explain import output_columns
+
+
+# Rows used for permutation importance; keeps training-time cost flat
+PERMUTATION_ROWS = 2000
+PERMUTATION_REPEATS = 5
+
+
+# -------------------------------------------------
+# HELPERS
+# -------------------------------------------------
+def _group(values, sources, names):
+    """
+    Sum per-output-column values into their input columns.
+    """
+    index = {name: i for i, name in enumerate(names)}
+    grouped = np.zeros(len(names))
+    np.add.at(grouped, [index[s] for s in sources], values)
+    return {name: float(v) for name, v in zip(names, grouped)}
+
+
+def _permuted_score(model, X, y, columns, seed, n_repeats):
+    """
+    Scores after shuffling one input column's output block, n_repeats times.
+    """
+    rng = np.random.RandomState(seed)
+    X = X.copy()
+    original = X[:, columns].copy()
+
+    scores = []
+    for _ in range(n_repeats):
+        X[:, columns] = original[rng.permutation(len(X))]
+        scores.append(model.score(X, y))
+    return scores
+
+
+# -------------------------------------------------
+# COMPUTE
+# -------------------------------------------------
+def compute_importances(
+    model,
+    preprocessor,
+    X,
+    y,
+    max_rows=PERMUTATION_ROWS,
+    n_repeats=PERMUTATION_REPEATS,
+    n_jobs=-1,
+    random_state=42
+):
+    """
+    Global importances for a fitted model, keyed by input column.
+
+    X is the transformed evaluation matrix and y its labels, in the
+    encoding the model was fitted on. Output columns are mapped back
+    to input columns through the ColumnTransformer's feature names:
+
+    coefficients : sum of |coef| over each column's outputs (linear models)
+    impurity     : summed feature_importances_ (tree models)
+    permutation  : drop in model.score() when all of a column's outputs
+                   are shuffled together, on a fixed row subsample,
+                   one column per parallel task
+    """
+    sources = output_columns(preprocessor)
+    names = list(dict.fromkeys(sources))
+
+    importances = {}
+
+    coef = getattr(model, "coef_", None)
+    if coef is not None:
+        coef = np.abs(np.asarray(coef)).reshape(-1, len(sources)).sum(axis=0)
+        importances["coefficients"] = _group(coef, sources, names)
+
+    impurity = getattr(model, "feature_importances_", None)
+    if impurity is not None:
+        importances["impurity"] = _group(np.asarray(impurity), sources, names)
+
+    # ---------------- Permutation (fixed subsample)
+    start = time.perf_counter()
+
+    X = X.toarray() if hasattr(X, "toarray") else np.asarray(X)
+    y = np.asarray(y)
+
+    rng = np.random.RandomState(random_state)
+    if len(X) > max_rows:
+        rows = rng.choice(len(X), max_rows, replace=False)
+        X, y = X[rows], y[rows]
+
+    baseline = model.score(X, y)
+    blocks = [[i for i, s in enumerate(sources) if s == name] for name in names]
+
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_permuted_score)(model, X, y, columns, random_state + j, n_repeats)
+        for j, columns in enumerate(blocks)
+    )
+
+    importances["permutation"] = {
+        name: {
+            "mean": float(baseline - np.mean(s)),
+            "std": float(np.std(s))
+        }
+        for name, s in zip(names, scores)
+    }
+
+    importances["meta"] = {
+        "model": type(model).__name__,
+        "metric": "accuracy" if is_classifier(model) else "r2",
+        "baseline_score": float(baseline),
+        "rows": int(len(X)),
+        "repeats": n_repeats,
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+    return importances
+
+
+def save_importances(domain, importances, models_dir=MODELS_DIR):
+    with open(importances_path(domain, models_dir), "w", encoding="utf-8") as fh:
+        json.dump(importances, fh, indent=2)
@@ -1,3 +1,5 @@
+import time
+
 import joblib
 import pandas as pd
 
@@ -7,10 +9,28 @@ from sklearn.ensemble import RandomForestClassifier
 
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 
-from utils.insurance_preprocessing import preprocess_insurance_data
+from utils.insurance_preprocessing import CATEGORICAL_FEATURES, NUMERICAL_FEATURES, preprocess_insurance_data
+from utils.model_selection import inference_costs, select_model
+from utils.pruning import prune_forest, pruning_summary
+from utils.matrix_layout import check_layout, set_layout
+from utils.cascade import build_cascade, cascade_summary, heavy_candidate, offer_cascade
+from utils.encoding import (
+    DEFAULT_ENCODING,
+    NATIVE_MODEL,
+    add_native_speedups,
+    matrix_stats,
+    native_gradient_boosting
+)
+from utils.artifacts import artifact_paths, publish_version, similarity_path, stage_version
+from utils.similarity import SimilarityIndex
+from utils.drift import build_reference, save_reference
+from utils.validation import build_profile, save_profile
+from utils.importance import compute_importances, save_importances
+from utils.profiling import profiled
 
 
-def train_insurance_models(df: pd.DataFrame):
+@profiled("train_insurance")
+def train_insurance_models(df: pd.DataFrame, encoding: str | dict = DEFAULT_ENCODING):
     """
     Train and evaluate Insurance Fraud models.
     Saves the best model and preprocessor.
@@ -19,7 +39,11 @@ def train_insurance_models(df: pd.DataFrame):
     # -------------------------------------------------
     # PREPROCESS DATA
     # -------------------------------------------------
-    X_train, X_test, y_train, y_test, preprocessor = preprocess_insurance_data(df)
+    X_train, X_test, y_train, y_test, preprocessor = preprocess_insurance_data(df, encoding=encoding)
+
+    # Same split with categoricals as ordinal codes, for the native
+    # categorical candidate (no one-hot expansion)
+    X_train_native, X_test_native, _, _, native_preprocessor = preprocess_insurance_data(df, encoding="ordinal")
 
     # -------------------------------------------------
     # MODELS
@@ -31,7 +55,8 @@ def train_insurance_models(df: pd.DataFrame):
             n_estimators=200,
             random_state=42,
             n_jobs=-1
-        )
+        ),
+        NATIVE_MODEL: native_gradient_boosting(native_preprocessor)
     }
 
     results = {}
@@ -40,27 +65,138 @@ def train_insurance_models(df: pd.DataFrame):
     # TRAIN & EVALUATE
     # -------------------------------------------------
     for name, model in models.items():
-        model.fit(X_train, y_train)
+        if name == NATIVE_MODEL:
+            X_fit, X_eval = X_train_native, X_test_native
+        else:
+            X_fit, X_eval = X_train, X_test
+
+        start = time.perf_counter()
+        model.fit(X_fit, y_train)
+        fit_seconds = time.perf_counter() - start
+
+        # Keep only the trees (and depth) the forest needs, chosen on its
+        # out-of-bag rows (see utils.pruning)
+        if name == "Random Forest":
+            model = models[name] = prune_forest(model, X_fit, y_train)
 
-        y_pred = model.predict(X_test)
+        start = time.perf_counter()
+        y_pred = model.predict(X_eval)
+        predict_seconds = time.perf_counter() - start
 
         results[name] = {
             "accuracy": accuracy_score(y_test, y_pred),
             "precision": precision_score(y_test, y_pred, pos_label="Yes", zero_division=0),
             "recall": recall_score(y_test, y_pred, pos_label="Yes", zero_division=0),
-            "f1_score": f1_score(y_test, y_pred, pos_label="Yes", zero_division=0)
+            "f1_score": f1_score(y_test, y_pred, pos_label="Yes", zero_division=0),
+            "fit_seconds": fit_seconds,
+            "predict_seconds": predict_seconds
         }
 
+        results[name].update(inference_costs(model, X_eval, predict_seconds))
+        results[name].update(matrix_stats(X_fit))
+        results[name].update(pruning_summary(model))
+
+    # -------------------------------------------------
+    # CASCADE: LOGISTIC REGRESSION SCORES EVERY ROW, THE BEST HEAVY
+    # MODEL ONLY THE ONES IT IS UNSURE ABOUT (SEE utils.cascade)
+    # -------------------------------------------------
+    # A single tree is no slower than the cascade, and the native
+    # candidate reads a different matrix
+    heavy_name = heavy_candidate(results, exclude=("Decision Tree", NATIVE_MODEL))
+
+    start = time.perf_counter()
+    cascade = build_cascade(models["Logistic Regression"], models[heavy_name], X_train, y_train)
+    tune_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred = cascade.predict(X_test)
+    predict_seconds = time.perf_counter() - start
+
+    name = f"Cascade (LR -> {heavy_name})"
+    scores = {
+        "accuracy": accuracy_score(y_test, y_pred),
+        "precision": precision_score(y_test, y_pred, pos_label="Yes", zero_division=0),
+        "recall": recall_score(y_test, y_pred, pos_label="Yes", zero_division=0),
+        "f1_score": f1_score(y_test, y_pred, pos_label="Yes", zero_division=0),
+        "fit_seconds": results["Logistic Regression"]["fit_seconds"] + results[heavy_name]["fit_seconds"] + tune_seconds,
+        "predict_seconds": predict_seconds
+    }
+
+    # Offered for selection only if the band routes some rows and holds
+    # on the tuning rows it was not searched on
+    if offer_cascade(cascade):
+        models[name] = cascade
+        results[name] = scores
+        results[name].update(inference_costs(cascade, X_test, predict_seconds))
+        results[name].update(matrix_stats(X_train))
+        results[name].update(cascade_summary(cascade, X_test, results[name], results[heavy_name]))
+
+    add_native_speedups(results, models[NATIVE_MODEL], X_train, y_train, X_test)
+
     # -------------------------------------------------
-    # SELECT BEST MODEL (BY F1 SCORE)
+    # SELECT BEST MODEL (F1 SCORE, LATENCY & SIZE; SEE utils.model_selection)
     # -------------------------------------------------
-    best_model_name = max(results, key=lambda x: results[x]["f1_score"])
+    best_model_name = select_model(results, "f1_score")
     best_model = models[best_model_name]
 
+    # -------------------------------------------------
+    # CLAIM SIMILARITY INDEX (FRAUD RINGS; SEE utils.similarity)
+    # -------------------------------------------------
+    # Every historical claim, in the space of the main (not ordinal)
+    # preprocessor whichever model is served
+    similarity = SimilarityIndex(preprocessor).fit(df.drop(columns=["Fraud"]))
+
+    # The native candidate is served with its own (ordinal) preprocessor
+    if best_model_name == NATIVE_MODEL:
+        preprocessor, X_test = native_preprocessor, X_test_native
+
+    # Serve transformed batches in the dtype & format (float32 / CSR by
+    # measured density) the model consumes without converting them
+    layout = set_layout(preprocessor, best_model, X_test)
+    check_layout(best_model, X_test, layout)
+
     # -------------------------------------------------
     # SAVE MODEL & PREPROCESSOR
     # -------------------------------------------------
-    joblib.dump(best_model, "models/insurance_model.pkl")
-    joblib.dump(preprocessor, "models/insurance_preprocessor.pkl")
+    # Written into a staging directory and published at the end, so a
+    # running app never loads a half-written version
+    staging = stage_version("insurance")
+    model_path, preprocessor_path = artifact_paths("insurance", staging)
+
+    joblib.dump(best_model, model_path)
+    joblib.dump(preprocessor, preprocessor_path)
+    joblib.dump(similarity, similarity_path("insurance", staging))
+
+    # -------------------------------------------------
+    # GLOBAL FEATURE IMPORTANCES (RENDERED BY THE PAGE)
+    # -------------------------------------------------
+    save_importances(
+        "insurance",
+        compute_importances(best_model, preprocessor, X_test, y_test),
+        staging
+    )
+
+    # -------------------------------------------------
+    # REFERENCE PROFILE FOR DRIFT MONITORING
+    # -------------------------------------------------
+    save_reference(
+        "insurance",
+        build_reference(df, NUMERICAL_FEATURES, CATEGORICAL_FEATURES),
+        staging
+    )
+
+    # -------------------------------------------------
+    # DATA PROFILE FOR INPUT VALIDATION
+    # -------------------------------------------------
+    save_profile(
+        "insurance",
+        build_profile(df, NUMERICAL_FEATURES, CATEGORICAL_FEATURES),
+        staging
+    )
+
+    # -------------------------------------------------
+    # PUBLISH (ATOMIC SWAP, HOT-RELOADED BY RUNNING APPS)
+    # -------------------------------------------------
+    publish_version("insurance", staging)
 
     return results, best_model_name
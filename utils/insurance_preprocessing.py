@@ -1,17 +1,39 @@
 import pandas as pd
 
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import StandardScaler
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
 
+from utils.encoding import categorical_transformers
+
+
+# -------------------------------------------------
+# FEATURE SCHEMA
+# -------------------------------------------------
+CATEGORICAL_FEATURES = [
+    "Gender",
+    "PolicyType",
+    "VehicleType",
+    "AccidentSeverity",
+    "ClaimType"
+]
+
+NUMERICAL_FEATURES = [
+    "Age",
+    "ClaimAmount",
+    "PolicyTenure",
+    "PreviousClaims"
+]
+
 
 def preprocess_insurance_data(
     df: pd.DataFrame,
     target_column: str = "Fraud",
     test_size: float = 0.2,
-    random_state: int = 42
+    random_state: int = 42,
+    encoding: str | dict = "onehot"
 ):
     if target_column not in df.columns:
         raise ValueError(f"Target column '{target_column}' not found")
@@ -19,35 +41,18 @@ def preprocess_insurance_data(
     X = df.drop(columns=[target_column])
     y = df[target_column]
 
-    numerical_features = [
-        "Age",
-        "ClaimAmount",
-        "PolicyTenure",
-        "PreviousClaims"
-    ]
-
-    categorical_features = [
-        "Gender",
-        "PolicyType",
-        "VehicleType",
-        "AccidentSeverity",
-        "ClaimType"
-    ]
+    numerical_features = NUMERICAL_FEATURES
+    categorical_features = CATEGORICAL_FEATURES
 
     numeric_pipeline = Pipeline(steps=[
         ("imputer", SimpleImputer(strategy="median")),
         ("scaler", StandardScaler())
     ])
 
-    categorical_pipeline = Pipeline(steps=[
-        ("imputer", SimpleImputer(strategy="most_frequent")),
-        ("encoder", OneHotEncoder(handle_unknown="ignore"))
-    ])
-
     preprocessor = ColumnTransformer(
         transformers=[
             ("num", numeric_pipeline, numerical_features),
-            ("cat", categorical_pipeline, categorical_features)
+            *categorical_transformers(categorical_features, encoding)
         ]
     )
 
@@ -59,7 +64,8 @@ def preprocess_insurance_data(
         stratify=y
     )
 
-    X_train_processed = preprocessor.fit_transform(X_train)
+    # y is only used by target encoding (out-of-fold on the training rows)
+    X_train_processed = preprocessor.fit_transform(X_train, y_train)
     X_test_processed = preprocessor.transform(X_test)
 
     return (
@@ -0,0 +1,330 @@
+import io
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+
+import pandas as pd
+
+from utils.metrics import gauge, time_stage
+
+
+logger = logging.getLogger(__name__)
+
+JOB_DIR = os.environ.get("DECISIONFORGE_JOB_DIR", "jobs")
+JOB_WORKERS = int(os.environ.get("DECISIONFORGE_JOB_WORKERS", "2"))
+
+# Persisted jobs kept on disk; older ones are deleted as new ones arrive
+JOB_RETENTION = int(os.environ.get("DECISIONFORGE_JOB_RETENTION", "200"))
+
+# Jobs whose results stay in memory; older results are read back from disk
+MAX_JOBS_IN_MEMORY = 32
+
+# Progress is persisted at most this often (seconds)
+PERSIST_INTERVAL = 0.5
+
+# Identifies this process in the job JSON, so a job read back from disk
+# can be told apart from one left unfinished by a dead process
+PROCESS_TOKEN = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+JOBS_RUNNING = gauge(
+    "decisionforge_jobs_running",
+    "Background parse / scoring jobs currently running.",
+    ["kind"]
+)
+
+
+# -------------------------------------------------
+# JOB RECORD
+# -------------------------------------------------
+@dataclass
+class Job:
+    id: str
+    kind: str
+    domain: str
+    label: str = ""
+    status: str = "queued"
+    rows_done: int = 0
+    rows_total: int = 0
+    created: float = field(default_factory=time.time)
+    started: float = None
+    finished: float = None
+    error: str = None
+    process: str = None
+    meta: dict = field(default_factory=dict)
+
+    # Not persisted in the job JSON
+    result: object = field(default=None, repr=False, compare=False)
+    _persisted_at: float = field(default=0.0, repr=False, compare=False)
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed")
+
+    @property
+    def progress(self):
+        if self.status == "done":
+            return 1.0
+        if not self.rows_total:
+            return 0.0
+        return min(self.rows_done / self.rows_total, 1.0)
+
+    def update(self, rows_done, rows_total=None):
+        """
+        Progress callback for the job function; cheap enough to call per chunk.
+        """
+        self.rows_done = rows_done
+        if rows_total is not None:
+            self.rows_total = rows_total
+        if time.time() - self._persisted_at >= PERSIST_INTERVAL:
+            _persist(self)
+
+    def to_dict(self):
+        data = asdict(self)
+        data.pop("result")
+        data.pop("_persisted_at")
+        return data
+
+
+# -------------------------------------------------
+# STATE
+# -------------------------------------------------
+_jobs = OrderedDict()
+_jobs_lock = threading.Lock()
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _jobs_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=JOB_WORKERS,
+                    thread_name_prefix="decisionforge-job"
+                )
+    return _executor
+
+
+def _job_path(job_id, ext):
+    return os.path.join(JOB_DIR, f"{job_id}.{ext}")
+
+
+def _persist(job):
+    """
+    Write the job state atomically so readers never see half a file.
+    """
+    os.makedirs(JOB_DIR, exist_ok=True)
+    tmp = _job_path(job.id, "json.tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(job.to_dict(), fh)
+    os.replace(tmp, _job_path(job.id, "json"))
+    job._persisted_at = time.time()
+
+
+def _remember(job):
+    with _jobs_lock:
+        _jobs[job.id] = job
+        while len(_jobs) > MAX_JOBS_IN_MEMORY:
+            _jobs.popitem(last=False)
+
+
+# -------------------------------------------------
+# SUBMIT & RUN
+# -------------------------------------------------
+def submit_job(kind, domain, fn, *args, label="", rows_total=0, persist_result=False, session=None, meta=None):
+    """
+    Run fn(job, *args) on the worker pool.
+
+    fn reports progress through job.update(); its return value becomes
+    job.result. With persist_result the result frame is also written to
+    disk so it survives reruns (and the process). session tags the job
+    with the browser session that owns it (see list_jobs).
+    """
+    job = Job(
+        id=uuid.uuid4().hex[:12],
+        kind=kind,
+        domain=domain,
+        label=label,
+        rows_total=rows_total,
+        meta=dict(meta or {}, session=session)
+    )
+    job.meta["persist_result"] = persist_result
+    job.process = PROCESS_TOKEN
+    _remember(job)
+    _persist(job)
+    _prune()
+
+    _get_executor().submit(_run, job, fn, args)
+    return job
+
+
+def _run(job, fn, args):
+    job.status = "running"
+    job.started = time.time()
+    _persist(job)
+    JOBS_RUNNING.labels(kind=job.kind).inc()
+
+    try:
+        job.result = fn(job, *args)
+        if job.meta.get("persist_result") and isinstance(job.result, pd.DataFrame):
+            job.result.to_pickle(_job_path(job.id, "pkl"))
+        job.status = "done"
+    except Exception as exc:
+        logger.exception("Job %s (%s) failed", job.id, job.kind)
+        job.status = "failed"
+        job.error = f"{type(exc).__name__}: {exc}"
+    finally:
+        JOBS_RUNNING.labels(kind=job.kind).dec()
+        job.finished = time.time()
+        _persist(job)
+
+
+# -------------------------------------------------
+# LOOKUP
+# -------------------------------------------------
+def get_job(job_id):
+    """
+    Job by id: from memory when this process ran it, otherwise the
+    persisted state from disk (result loaded on demand). None if unknown.
+    """
+    job = _jobs.get(job_id)
+    if job is not None:
+        return job
+
+    path = _job_path(job_id, "json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    job = Job(**data)
+
+    # Unfinished and not started by this process: its process died.
+    # Unfinished jobs of this process only left the in-memory cache
+    if not job.done and job.process != PROCESS_TOKEN:
+        job.status = "failed"
+        job.error = "Interrupted before completion"
+    return job
+
+
+def job_result(job):
+    """
+    Result of a finished job, reading the persisted frame if needed.
+    """
+    if job.result is None and job.status == "done":
+        path = _job_path(job.id, "pkl")
+        if os.path.exists(path):
+            job.result = pd.read_pickle(path)
+    return job.result
+
+
+def wait_for_job(job_id, timeout):
+    """
+    Block up to `timeout` seconds so small jobs finish without a
+    polling round-trip, then return the job in whatever state it is.
+    """
+    deadline = time.time() + timeout
+    job = get_job(job_id)
+    while job is not None and not job.done and time.time() < deadline:
+        time.sleep(0.01)
+        # Re-read in case the job only came from disk
+        job = get_job(job_id)
+    return job
+
+
+def list_jobs(domain, kind=None, session=None, limit=10):
+    """
+    Most recent persisted jobs for a domain, newest first; only those
+    of `session` when given.
+    """
+    if not os.path.isdir(JOB_DIR):
+        return []
+
+    entries = [e for e in os.scandir(JOB_DIR) if e.name.endswith(".json")]
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+
+    jobs = []
+    for entry in entries:
+        job = get_job(entry.name[:-len(".json")])
+        if job is None or job.domain != domain:
+            continue
+        if kind is not None and job.kind != kind:
+            continue
+        if session is not None and job.meta.get("session") != session:
+            continue
+        jobs.append(job)
+        if len(jobs) >= limit:
+            break
+
+    return jobs
+
+
+def _prune():
+    """
+    Delete the state & results of all but the JOB_RETENTION most recent
+    jobs, sparing jobs still running in this process.
+    """
+    entries = [e for e in os.scandir(JOB_DIR) if e.name.endswith(".json")]
+    if len(entries) <= JOB_RETENTION:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+
+    for entry in entries[JOB_RETENTION:]:
+        job_id = entry.name[:-len(".json")]
+        job = _jobs.get(job_id)
+        if job is not None and not job.done:
+            continue
+        for ext in ("pkl", "json"):
+            try:
+                os.remove(_job_path(job_id, ext))
+            except FileNotFoundError:
+                pass
+
+
+# -------------------------------------------------
+# DOMAIN JOBS
+# -------------------------------------------------
+def _parse_csv(job, data, reader):
+    with time_stage(job.domain, "parse"):
+        df = reader(io.BytesIO(data))
+    job.update(len(df), len(df))
+    return df
+
+
+def submit_parse_job(domain, data, name, reader, session=None):
+    """
+    Parse uploaded CSV bytes off the script thread. The frame is
+    persisted too, so it survives the job leaving memory.
+    """
+    return submit_job(
+        "parse", domain, _parse_csv, data, reader, label=name, persist_result=True, session=session
+    )
+
+
+def _score(job, score_fn, df):
+    return score_fn(df, job.update)
+
+
+def submit_score_job(domain, score_fn, df, label="", session=None):
+    """
+    Score df with score_fn(df, progress) off the script thread.
+    The scored frame is persisted so the results can be reopened later.
+    """
+    return submit_job(
+        "score",
+        domain,
+        _score,
+        score_fn,
+        df,
+        label=label,
+        rows_total=len(df),
+        persist_result=True,
+        session=session,
+        meta={"input_columns": list(df.columns)}
+    )
@@ -0,0 +1,84 @@
+import sys
+import time
+import types
+import importlib
+import threading
+
+from utils.metrics import histogram
+
+
+IMPORT_SECONDS = histogram(
+    "decisionforge_import_seconds",
+    "Time spent importing a lazily loaded module.",
+    ["module"]
+)
+
+# module name -> seconds spent in its first import
+_import_costs = {}
+_import_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    `plt = lazy_import("matplotlib.pyplot")` costs nothing until a page
+    actually draws a chart; after that it behaves like the real module.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_target"]
+        if module is None:
+            module = timed_import(self.__name__)
+            self.__dict__["_lazy_target"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_target"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name):
+    """
+    Return `name` if it is already imported, otherwise a LazyModule
+    that defers the import until first use.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def timed_import(name):
+    """
+    Import `name` now and record the cost of the first (cold) import.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    with _import_lock:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        elapsed = time.perf_counter() - start
+
+        if name not in _import_costs:
+            _import_costs[name] = elapsed
+            IMPORT_SECONDS.labels(module=name).observe(elapsed)
+    return module
+
+
+def import_costs():
+    """
+    Cold import cost (seconds) of every module loaded through this helper.
+    """
+    return dict(_import_costs)
@@ -0,0 +1,127 @@
+import os
+
+import numpy as np
+import scipy.sparse as sp
+
+from sklearn.ensemble import BaseEnsemble
+from sklearn.ensemble._hist_gradient_boosting.gradient_boosting import BaseHistGradientBoosting
+from sklearn.tree import BaseDecisionTree
+
+
+# Transformed matrices at or above this share of non-zeros are served dense
+DENSE_DENSITY = float(os.environ.get("DECISIONFORGE_DENSE_DENSITY", "0.3"))
+
+
+# -------------------------------------------------
+# LAYOUT CHOICE
+# -------------------------------------------------
+def density(X):
+    """
+    Share of non-zero cells of a transformed matrix.
+    """
+    cells = X.shape[0] * X.shape[1]
+    if not cells:
+        return 0.0
+    nonzero = X.nnz if sp.issparse(X) else np.count_nonzero(X)
+    return nonzero / cells
+
+
+def _reads_missing(estimator):
+    """
+    True for models that take entries absent from a CSR matrix as
+    missing values rather than 0 (XGBoost), including a cascade routing
+    to one.
+    """
+    if hasattr(estimator, "get_booster"):
+        return True
+    heavy = getattr(estimator, "heavy", None)
+    return heavy is not None and _reads_missing(heavy)
+
+
+def model_layout(model, X):
+    """
+    Matrix layout a fitted model consumes without converting it first:
+
+    dtype  : float32 for sklearn trees, forests & gradient boosting and
+             XGBoost (they cast to float32 internally), float64 for
+             everything else (linear models, HistGradientBoosting)
+    sparse : CSR when the measured density of X is below DENSE_DENSITY,
+             dense otherwise; always dense for HistGradientBoosting,
+             which rejects sparse input. Models that read absent CSR
+             entries as missing (XGBoost) keep the format of X, the
+             transform output they were fitted on
+    """
+    estimator = getattr(model, "regressor_", model)
+    measured = float(density(X))
+
+    if isinstance(estimator, BaseHistGradientBoosting):
+        return {"dtype": "float64", "sparse": False, "density": measured}
+
+    trees = isinstance(estimator, (BaseDecisionTree, BaseEnsemble)) or hasattr(estimator, "get_booster")
+    sparse = sp.issparse(X) if _reads_missing(estimator) else measured < DENSE_DENSITY
+
+    return {
+        "dtype": "float32" if trees else "float64",
+        "sparse": bool(sparse),
+        "density": measured
+    }
+
+
+def set_layout(preprocessor, model, X):
+    """
+    Make a fitted ColumnTransformer emit the model's layout.
+
+    ColumnTransformer fixes sparse vs dense once at fit (sparse_output_,
+    from sparse_threshold); that choice is replaced by the model's, so
+    transform builds the right format directly. The dtype is applied
+    by transform_batch.
+    """
+    layout = model_layout(model, X)
+    preprocessor.sparse_output_ = layout["sparse"]
+    preprocessor.layout_ = layout
+    return layout
+
+
+# -------------------------------------------------
+# TRANSFORM
+# -------------------------------------------------
+def to_layout(X, layout):
+    """
+    X in the given layout, copying only what has to change.
+    """
+    dtype = np.dtype(layout["dtype"])
+
+    if layout["sparse"]:
+        return sp.csr_matrix(X, dtype=dtype)
+    if sp.issparse(X):
+        return X.toarray().astype(dtype, copy=False)
+    return np.asarray(X).astype(dtype, copy=False)
+
+
+def transform_batch(preprocessor, X):
+    """
+    preprocessor.transform(X) in the layout stored by set_layout
+    (unchanged for preprocessors saved without one).
+    """
+    Xp = preprocessor.transform(X)
+    layout = getattr(preprocessor, "layout_", None)
+    return Xp if layout is None else to_layout(Xp, layout)
+
+
+def check_layout(model, X, layout):
+    """
+    Raise ValueError unless the model predicts the same on X in the
+    new layout as on X as fitted.
+    """
+    before = np.asarray(model.predict(X))
+    after = np.asarray(model.predict(to_layout(X, layout)))
+
+    if np.issubdtype(before.dtype, np.floating):
+        same = np.isclose(before, after, rtol=1e-6, atol=1e-9)
+    else:
+        same = before == after
+    if not same.all():
+        raise ValueError(
+            f"{type(model).__name__} predicts differently in layout {layout}: "
+            f"{int((~same).sum())} of {len(same)} rows changed"
+        )
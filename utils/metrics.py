@@ -0,0 +1,325 @@
+import os
+import time
+import bisect
+import logging
+import threading
+
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 9464
+
+# Latency buckets (seconds) shared by every histogram unless overridden
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+
+# -------------------------------------------------
+# METRIC TYPES
+# -------------------------------------------------
+class _Child:
+    """
+    One labelled time series. Each child owns its own lock so
+    concurrent sessions only contend when they hit the same series,
+    and the critical section is a single addition.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount=1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value):
+        self.value = float(value)
+
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        # bisect happens outside the lock; only the increments are guarded
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.sum += value
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        return _Child()
+
+    def labels(self, **labels):
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _label_text(self, key, extra=None):
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        body = ",".join(
+            f'{n}="{_escape(v)}"' for n, v in pairs
+        )
+        return "{" + body + "}"
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}"
+        ]
+        for key, child in list(self._children.items()):
+            lines.append(f"{self.name}{self._label_text(key)} {_fmt(child.value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}"
+        ]
+        for key, child in list(self._children.items()):
+            counts = list(child.counts)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = ("le", "+Inf" if bound == float("inf") else _fmt(bound))
+                lines.append(
+                    f"{self.name}_bucket{self._label_text(key, le)} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{self._label_text(key)} {_fmt(child.sum)}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {cumulative}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value):
+    value = float(value)
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+# -------------------------------------------------
+# REGISTRY
+# -------------------------------------------------
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _get_or_create(cls, name, documentation, labelnames, **kwargs):
+    metric = _registry.get(name)
+    if metric is None:
+        with _registry_lock:
+            metric = _registry.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                _registry[name] = metric
+    return metric
+
+
+def counter(name, documentation, labelnames=()):
+    return _get_or_create(Counter, name, documentation, labelnames)
+
+
+def gauge(name, documentation, labelnames=()):
+    return _get_or_create(Gauge, name, documentation, labelnames)
+
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return _get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+
+def render_metrics():
+    """
+    Render every registered metric in the Prometheus text format.
+    """
+    lines = []
+    for metric in list(_registry.values()):
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# -------------------------------------------------
+# DECISIONFORGE METRICS
+# -------------------------------------------------
+ROWS_SCORED = counter(
+    "decisionforge_rows_scored_total",
+    "Rows scored by the domain models.",
+    ["domain"]
+)
+
+STAGE_SECONDS = histogram(
+    "decisionforge_stage_seconds",
+    "Latency of each page stage (load/parse/transform/predict/render).",
+    ["domain", "stage"]
+)
+
+CACHE_LOOKUPS = counter(
+    "decisionforge_cache_lookups_total",
+    "Lookups against an in-process cache.",
+    ["cache"]
+)
+
+CACHE_MISSES = counter(
+    "decisionforge_cache_misses_total",
+    "Lookups that missed an in-process cache.",
+    ["cache"]
+)
+
+MODEL_LOAD_SECONDS = histogram(
+    "decisionforge_model_load_seconds",
+    "Time spent unpickling a domain model and preprocessor.",
+    ["domain"]
+)
+
+MODEL_ARTIFACT_BYTES = gauge(
+    "decisionforge_model_artifact_bytes",
+    "On-disk size of the model & preprocessor files loaded for a domain.",
+    ["domain"]
+)
+
+MODEL_RESIDENT_BYTES = gauge(
+    "decisionforge_model_resident_bytes",
+    "Approximate in-memory size of the loaded model & preprocessor for a domain.",
+    ["domain"]
+)
+
+
+@contextmanager
+def time_stage(domain, stage):
+    """
+    Record the wall time of a page stage into decisionforge_stage_seconds.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(domain=domain, stage=stage).observe(
+            time.perf_counter() - start
+        )
+
+
+def record_rows_scored(domain, n_rows):
+    ROWS_SCORED.labels(domain=domain).inc(n_rows)
+
+
+def record_cache_lookup(cache):
+    CACHE_LOOKUPS.labels(cache=cache).inc()
+
+
+def record_cache_miss(cache):
+    CACHE_MISSES.labels(cache=cache).inc()
+
+
+# -------------------------------------------------
+# HTTP ENDPOINT
+# -------------------------------------------------
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_failed = False
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=None, host="127.0.0.1"):
+    """
+    Serve /metrics on a background thread. Safe to call on every
+    Streamlit rerun: only the first call binds the port.
+
+    The port comes from DECISIONFORGE_METRICS_PORT (default 9464);
+    setting it to 0 disables the endpoint.
+    """
+    global _server, _server_failed
+
+    if _server is not None or _server_failed:
+        return _server
+
+    if port is None:
+        port = int(os.environ.get("DECISIONFORGE_METRICS_PORT", DEFAULT_PORT))
+    if port == 0:
+        return None
+
+    with _server_lock:
+        if _server is not None:
+            return _server
+        try:
+            server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as exc:
+            # Another worker usually owns the port; don't retry every rerun
+            _server_failed = True
+            logger.warning("Metrics endpoint not started on port %s: %s", port, exc)
+            return None
+        server.daemon_threads = True
+        threading.Thread(
+            target=server.serve_forever,
+            name="decisionforge-metrics",
+            daemon=True
+        ).start()
+        _server = server
+    return _server
@@ -0,0 +1,409 @@
+import os
+import time
+import logging
+import threading
+
+from collections import namedtuple
+
+from utils.artifacts import (
+    candidate_version,
+    current_version,
+    load_candidate,
+    load_domain_artifacts,
+    load_importances,
+    load_profile,
+    load_reference,
+    load_similarity,
+    load_velocity
+)
+from utils.lazy_imports import lazy_import
+from utils.metrics import counter, gauge, record_cache_lookup, record_cache_miss
+
+# app.py imports this module, so keep its own import cheap
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+drift = lazy_import("utils.drift")
+shadow = lazy_import("utils.shadow")
+matrix_layout = lazy_import("utils.matrix_layout")
+
+logger = logging.getLogger(__name__)
+
+DOMAINS = (
+    "retail",
+    "supply_chain",
+    "banking",
+    "customer",
+    "hr",
+    "insurance"
+)
+
+PREWARM_SECONDS = gauge(
+    "decisionforge_prewarm_seconds",
+    "Background warm-up time per domain (load + dummy prediction).",
+    ["domain"]
+)
+
+MODEL_RELOADS = counter(
+    "decisionforge_model_reloads_total",
+    "Hot reloads of a domain model, by outcome (ok / failed).",
+    ["domain", "outcome"]
+)
+
+# Seconds between checks for a newly published version (0 disables)
+RELOAD_SECONDS = float(os.environ.get("DECISIONFORGE_RELOAD_SECONDS", "5"))
+
+# One loaded version of a domain. Replaced as a whole on reload, so a
+# request holding a snapshot keeps a consistent model & preprocessor.
+Snapshot = namedtuple("Snapshot", ["version", "directory", "model", "preprocessor"])
+
+# domain -> Snapshot
+_snapshots = {}
+# Sidecar artifacts, domain -> (model version, value)
+_importances = {}
+_profiles = {}
+_velocity = {}
+_similarity = {}
+_drift = {}
+# Shadow candidates, domain -> (candidate fingerprint, model or None)
+_candidates = {}
+_domain_locks = {domain: threading.Lock() for domain in DOMAINS}
+_registry_lock = threading.Lock()
+
+_prewarm_thread = None
+_prewarm_report = {}
+_reload_thread = None
+
+
+# -------------------------------------------------
+# LOOKUP
+# -------------------------------------------------
+def _domain_lock(domain):
+    lock = _domain_locks.get(domain)
+    if lock is None:
+        with _registry_lock:
+            lock = _domain_locks.setdefault(domain, threading.Lock())
+    return lock
+
+
+def _load_snapshot(domain):
+    version, directory = current_version(domain)
+    model, preprocessor = load_domain_artifacts(domain, directory)
+    return Snapshot(version, directory, model, preprocessor)
+
+
+def get_snapshot(domain):
+    """
+    The live Snapshot of a domain, loading it once per process. A page
+    that asks while the prewarm thread is still loading the same domain
+    waits for that load instead of repeating it.
+    """
+    record_cache_lookup("artifacts")
+
+    snapshot = _snapshots.get(domain)
+    if snapshot is not None:
+        return snapshot
+
+    with _domain_lock(domain):
+        snapshot = _snapshots.get(domain)
+        if snapshot is None:
+            record_cache_miss("artifacts")
+            snapshot = _load_snapshot(domain)
+            _snapshots[domain] = snapshot
+    return snapshot
+
+
+def get_artifacts(domain):
+    """
+    Return (model, preprocessor) of the live version of a domain.
+    """
+    snapshot = get_snapshot(domain)
+    return snapshot.model, snapshot.preprocessor
+
+
+def get_model_version(domain):
+    """
+    Version of the artifacts get_artifacts() serves for a domain;
+    part of every prediction cache key.
+    """
+    return get_snapshot(domain).version
+
+
+def _for_version(cache, domain, build):
+    """
+    Per-domain value derived from the loaded model, rebuilt with
+    build(domain, version directory) whenever a new version is loaded.
+    """
+    snapshot = get_snapshot(domain)
+    version = snapshot.version
+    cached = cache.get(domain)
+    if cached is None or cached[0] != version:
+        with _domain_lock(domain):
+            cached = cache.get(domain)
+            if cached is None or cached[0] != version:
+                cached = (version, build(domain, snapshot.directory))
+                cache[domain] = cached
+    return cached[1]
+
+
+def get_importances(domain):
+    """
+    Global importances saved at training time for the loaded model
+    (None if none were saved).
+    """
+    return _for_version(_importances, domain, load_importances)
+
+
+def get_profile(domain):
+    """
+    Training-data profile for validating inputs (None if none was saved).
+    """
+    return _for_version(_profiles, domain, load_profile)
+
+
+def get_velocity(domain):
+    """
+    Velocity state saved with the loaded model (None if none was saved).
+    """
+    return _for_version(_velocity, domain, load_velocity)
+
+
+def get_similarity(domain):
+    """
+    Claim similarity index saved with the loaded model (None if none was saved).
+    """
+    return _for_version(_similarity, domain, load_similarity)
+
+
+def _new_drift_summary(domain, models_dir):
+    reference = load_reference(domain, models_dir)
+    return drift.DriftSummary(reference) if reference is not None else None
+
+
+def get_drift_summary(domain):
+    """
+    Running drift summary of everything scored against the loaded
+    model; restarts when a new model version is loaded. None when the
+    model has no saved reference profile.
+    """
+    return _for_version(_drift, domain, _new_drift_summary)
+
+
+def _load_candidate(domain):
+    """
+    Load the shadow candidate and check it accepts the production
+    preprocessor's output; an unusable candidate is logged and skipped.
+    """
+    try:
+        candidate = load_candidate(domain)
+        _, preprocessor = get_artifacts(domain)
+        width = matrix_layout.transform_batch(preprocessor, dummy_frame(preprocessor)).shape[1]
+        expected = getattr(candidate, "n_features_in_", width)
+        if expected != width:
+            raise ValueError(f"expects {expected} features, preprocessor outputs {width}")
+    except Exception as exc:
+        logger.warning("Shadow candidate for %s ignored: %s", domain, exc)
+        return None
+
+    logger.info("Shadow candidate for %s loaded: %s", domain, type(candidate).__name__)
+    return candidate
+
+
+def get_candidate(domain):
+    """
+    Candidate model to shadow score alongside production, or None.
+
+    Reloaded when the candidate file changes; DECISIONFORGE_SHADOW=0
+    disables shadow scoring.
+    """
+    if not shadow.SHADOW_ENABLED:
+        return None
+
+    version = candidate_version(domain)
+    if version is None:
+        return None
+
+    cached = _candidates.get(domain)
+    if cached is None or cached[0] != version:
+        with _domain_lock(domain):
+            cached = _candidates.get(domain)
+            if cached is None or cached[0] != version:
+                cached = (version, _load_candidate(domain))
+                _candidates[domain] = cached
+    return cached[1]
+
+
+# -------------------------------------------------
+# WARM-UP
+# -------------------------------------------------
+def dummy_frame(preprocessor):
+    """
+    One-row frame with every input column the preprocessor was fitted
+    on, filled with the fitted imputer statistics (median / most
+    frequent) so it passes through transform like a real record.
+    """
+    row = {col: np.nan for col in preprocessor.feature_names_in_}
+
+    for _, transformer, columns in preprocessor.transformers_:
+        steps = getattr(transformer, "named_steps", {})
+        imputer = steps.get("imputer")
+        if imputer is None:
+            continue
+        for col, value in zip(columns, imputer.statistics_):
+            row[col] = value
+
+    return pd.DataFrame([row], columns=list(preprocessor.feature_names_in_))
+
+
+def _dummy_predict(model, preprocessor):
+    Xp = matrix_layout.transform_batch(preprocessor, dummy_frame(preprocessor))
+    model.predict(Xp)
+
+    # Same guard as the insurance page: probabilities are optional
+    try:
+        if hasattr(model, "predict_proba"):
+            model.predict_proba(Xp)
+        elif hasattr(model, "decision_function"):
+            model.decision_function(Xp)
+    except Exception:
+        pass
+
+
+def warm_domain(domain, dummy_predict=True):
+    """
+    Load one domain and optionally push a dummy row through it so
+    lazy initialisation in sklearn / xgboost happens now.
+    """
+    start = time.perf_counter()
+    model, preprocessor = get_artifacts(domain)
+
+    if dummy_predict:
+        _dummy_predict(model, preprocessor)
+
+    elapsed = time.perf_counter() - start
+    PREWARM_SECONDS.labels(domain=domain).set(elapsed)
+    return elapsed
+
+
+def prewarm(domains=DOMAINS, dummy_predict=True):
+    """
+    Warm every domain in turn. Failures are logged and reported but
+    never raised: a broken artifact must not take the app down.
+    """
+    report = {}
+    start = time.perf_counter()
+
+    for domain in domains:
+        try:
+            report[domain] = warm_domain(domain, dummy_predict)
+        except Exception as exc:
+            logger.warning("Prewarm failed for %s: %s", domain, exc)
+            report[domain] = None
+        _prewarm_report[domain] = report[domain]
+
+    total = time.perf_counter() - start
+    _prewarm_report["total"] = total
+    logger.info(
+        "Prewarmed %d domains in %.2fs: %s",
+        len(domains),
+        total,
+        ", ".join(f"{d}={t:.2f}s" if t is not None else f"{d}=failed" for d, t in report.items())
+    )
+    return report
+
+
+def start_prewarm(domains=DOMAINS, dummy_predict=None):
+    """
+    Run prewarm() once per process on a daemon thread.
+
+    DECISIONFORGE_PREWARM=0 disables it and
+    DECISIONFORGE_PREWARM_PREDICT=0 skips the dummy predictions.
+    """
+    global _prewarm_thread
+
+    if os.environ.get("DECISIONFORGE_PREWARM", "1") == "0":
+        return None
+    if dummy_predict is None:
+        dummy_predict = os.environ.get("DECISIONFORGE_PREWARM_PREDICT", "1") != "0"
+
+    with _registry_lock:
+        if _prewarm_thread is None:
+            _prewarm_thread = threading.Thread(
+                target=prewarm,
+                args=(domains, dummy_predict),
+                name="decisionforge-prewarm",
+                daemon=True
+            )
+            _prewarm_thread.start()
+    return _prewarm_thread
+
+
+def prewarm_report():
+    """
+    Seconds spent warming each finished domain (None = failed),
+    plus "total" once the whole warm-up is done.
+    """
+    return dict(_prewarm_report)
+
+
+# -------------------------------------------------
+# HOT RELOAD
+# -------------------------------------------------
+def reload_domain(domain):
+    """
+    Load and warm the published version of a domain if it differs from
+    the loaded one, then switch over in a single assignment. Requests
+    already holding the old snapshot finish on it. Returns True when a
+    new version went live; a failed load keeps serving the old one.
+    """
+    loaded = _snapshots.get(domain)
+    if loaded is None:
+        return False
+
+    try:
+        version, _ = current_version(domain)
+        if version == loaded.version:
+            return False
+
+        snapshot = _load_snapshot(domain)
+        _dummy_predict(snapshot.model, snapshot.preprocessor)
+    except Exception as exc:
+        logger.warning("Reload failed for %s, still serving %s: %s", domain, loaded.version, exc)
+        MODEL_RELOADS.labels(domain=domain, outcome="failed").inc()
+        return False
+
+    with _domain_lock(domain):
+        _snapshots[domain] = snapshot
+
+    MODEL_RELOADS.labels(domain=domain, outcome="ok").inc()
+    logger.info("Reloaded %s: %s -> %s", domain, loaded.version, snapshot.version)
+    return True
+
+
+def _watch(interval):
+    while True:
+        time.sleep(interval)
+        for domain in list(_snapshots):
+            reload_domain(domain)
+
+
+def start_reload_watcher(interval=None):
+    """
+    Poll every DECISIONFORGE_RELOAD_SECONDS for newly published
+    versions of the loaded domains, on one daemon thread per process.
+    """
+    global _reload_thread
+
+    interval = RELOAD_SECONDS if interval is None else interval
+    if interval <= 0:
+        return None
+
+    with _registry_lock:
+        if _reload_thread is None:
+            _reload_thread = threading.Thread(
+                target=_watch,
+                args=(interval,),
+                name="decisionforge-reload",
+                daemon=True
+            )
+            _reload_thread.start()
+    return _reload_thread
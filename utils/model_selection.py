@@ -0,0 +1,142 @@
+import os
+import time
+import pickle
+
+import numpy as np
+
+
+# metric  : best metric (the original behaviour)
+# budget  : best metric among candidates within the latency / size budgets
+# pareto  : cheapest Pareto-optimal candidate within METRIC_TOLERANCE of the best metric
+SELECTION_POLICY = os.environ.get("DECISIONFORGE_SELECTION", "pareto")
+
+LATENCY_BUDGET_MS = float(os.environ.get("DECISIONFORGE_LATENCY_BUDGET_MS", "5"))
+
+# 0 = no size limit
+SIZE_BUDGET_KB = float(os.environ.get("DECISIONFORGE_SIZE_BUDGET_KB", "0"))
+
+METRIC_TOLERANCE = float(os.environ.get("DECISIONFORGE_METRIC_TOLERANCE", "0.01"))
+
+# Single-row latencies within this relative margin count as a tie, so
+# timer noise does not change the shipped model between retrains
+LATENCY_TOLERANCE = float(os.environ.get("DECISIONFORGE_LATENCY_TOLERANCE", "0.5"))
+
+# Single-row predict calls timed per candidate (median is kept)
+LATENCY_REPEATS = 25
+
+
+# -------------------------------------------------
+# MEASUREMENT
+# -------------------------------------------------
+def inference_costs(model, X_eval, predict_seconds):
+    """
+    Serving costs of a fitted candidate, measured on its evaluation matrix:
+
+    single_row_ms    : median latency of predict() on one row
+    batch_us_per_row : batch predict time per row (from predict_seconds)
+    size_kb          : pickled model size
+    """
+    row = X_eval[:1]
+    model.predict(row)
+
+    timings = []
+    for _ in range(LATENCY_REPEATS):
+        start = time.perf_counter()
+        model.predict(row)
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "single_row_ms": float(np.median(timings)) * 1000,
+        "batch_us_per_row": predict_seconds / max(X_eval.shape[0], 1) * 1e6,
+        "size_kb": len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)) / 1024
+    }
+
+
+# -------------------------------------------------
+# SELECTION
+# -------------------------------------------------
+def _costs(scores):
+    return scores["single_row_ms"], scores["size_kb"]
+
+
+def _faster(a, b):
+    """
+    Whether a's single-row latency beats b's by more than LATENCY_TOLERANCE.
+    """
+    return a["single_row_ms"] * (1 + LATENCY_TOLERANCE) < b["single_row_ms"]
+
+
+def pareto_front(results, metric):
+    """
+    Candidates no other candidate beats on metric, single-row latency
+    and size at once (latencies within LATENCY_TOLERANCE are ties).
+    """
+    def dominates(a, b):
+        better_or_equal = a[metric] >= b[metric] and not _faster(b, a) and a["size_kb"] <= b["size_kb"]
+        strictly = a[metric] > b[metric] or _faster(a, b) or a["size_kb"] < b["size_kb"]
+        return better_or_equal and strictly
+
+    return [
+        name for name, scores in results.items()
+        if not any(dominates(other, scores) for other in results.values() if other is not scores)
+    ]
+
+
+def select_model(results, metric, policy=None):
+    """
+    Name of the candidate to ship, by the configured policy
+    (DECISIONFORGE_SELECTION). Higher metric is better.
+    """
+    policy = policy or SELECTION_POLICY
+
+    if policy == "metric":
+        return max(results, key=lambda x: results[x][metric])
+
+    if policy == "budget":
+        within = [
+            name for name, scores in results.items()
+            if scores["single_row_ms"] <= LATENCY_BUDGET_MS
+            and (not SIZE_BUDGET_KB or scores["size_kb"] <= SIZE_BUDGET_KB)
+        ]
+        if not within:
+            # Nothing fits: ship the fastest candidate
+            return min(results, key=lambda x: _costs(results[x]))
+        return max(within, key=lambda x: (results[x][metric], -results[x]["single_row_ms"]))
+
+    if policy == "pareto":
+        best = max(scores[metric] for scores in results.values())
+        eligible = [name for name in pareto_front(results, metric) if results[name][metric] >= best - METRIC_TOLERANCE]
+        # The fastest, then among those tied on latency the best metric, then the smallest
+        fastest = min(eligible, key=lambda x: results[x]["single_row_ms"])
+        tied = [name for name in eligible if not _faster(results[fastest], results[name])]
+        return max(tied, key=lambda x: (results[x][metric], -results[x]["size_kb"]))
+
+    raise ValueError(f"Unknown selection policy '{policy}'")
+
+
+def describe_selection(results, selected, metric, policy=None):
+    """
+    Printable summary of the candidates' metric & costs and the choice.
+    """
+    policy = policy or SELECTION_POLICY
+    rules = {
+        "metric": f"best {metric}",
+        "budget": f"best {metric} within {LATENCY_BUDGET_MS:g} ms/row"
+                  + (f" and {SIZE_BUDGET_KB:g} KB" if SIZE_BUDGET_KB else ""),
+        "pareto": f"fastest Pareto-optimal model within {METRIC_TOLERANCE:g} of the best {metric}, "
+                  f"latencies within {LATENCY_TOLERANCE:.0%} tied"
+    }
+    front = set(pareto_front(results, metric))
+
+    lines = [
+        f"Selection policy: {policy} ({rules.get(policy, policy)})",
+        f"  {'':3}{'model':<42}{metric:>10}{'ms/row':>9}{'us/row':>9}{'fit s':>8}{'KB':>9}"
+    ]
+    for name, scores in results.items():
+        mark = ("*" if name == selected else " ") + ("P" if name in front else " ")
+        lines.append(
+            f"  {mark} {name:<42}{scores[metric]:>10.4f}{scores['single_row_ms']:>9.3f}"
+            f"{scores['batch_us_per_row']:>9.2f}{scores['fit_seconds']:>8.3f}{scores['size_kb']:>9.1f}"
+        )
+    lines.append("  * selected   P Pareto-optimal (metric vs single-row latency vs size)")
+    return "\n".join(lines)
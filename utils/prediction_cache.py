@@ -0,0 +1,126 @@
+import os
+import math
+import time
+import threading
+
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.metrics import record_cache_lookup, record_cache_miss
+
+
+DEFAULT_MAXSIZE = int(os.environ.get("DECISIONFORGE_PREDICTION_CACHE_SIZE", "4096"))
+DEFAULT_TTL = float(os.environ.get("DECISIONFORGE_PREDICTION_CACHE_TTL", "3600"))
+
+
+# -------------------------------------------------
+# KEYS
+# -------------------------------------------------
+def _canonical(value):
+    """
+    Normalise one feature value so equal inputs hash equal:
+    numpy scalars become Python values, 35 and 35.0 compare equal
+    and every missing marker becomes None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        if isinstance(value, float) and math.isnan(value):
+            return None
+        return float(value)
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def feature_key(domain, version, record, columns):
+    """
+    Cache key for one record: domain, model version and the
+    canonicalised feature values in model column order.
+    """
+    return (domain, version, tuple(_canonical(record[c]) for c in columns))
+
+
+# -------------------------------------------------
+# CACHE
+# -------------------------------------------------
+class PredictionCache:
+    """
+    Thread-safe LRU memo of per-record predictions with a TTL.
+
+    Lookups and misses are exported under cache="<name>" on the
+    metrics endpoint; stats() gives the same numbers in-process.
+    """
+
+    def __init__(self, name, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """
+        Cached value for key, or None on a miss or an expired entry.
+        """
+        record_cache_lookup(self.name)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and self.ttl and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                record_cache_miss(self.name)
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+PREDICTION_CACHE = PredictionCache("prediction")
@@ -0,0 +1,149 @@
+import os
+import sys
+import time
+import pstats
+import cProfile
+import logging
+import threading
+import functools
+
+from collections import Counter
+from contextlib import contextmanager
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_DIR = "profiles"
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+
+# -------------------------------------------------
+# MODE SELECTION
+# -------------------------------------------------
+def profile_mode(requested=None):
+    """
+    Resolve the profiling mode for one run.
+
+    `requested` is usually the `?profile=` query parameter; when it is
+    empty the DECISIONFORGE_PROFILE environment variable is used.
+    "1" / "true" / "cprofile" select cProfile, "sample" selects the
+    low-overhead stack sampler. Anything else disables profiling.
+    """
+    value = requested or os.environ.get("DECISIONFORGE_PROFILE", "")
+    value = str(value).strip().lower()
+
+    if value in ("1", "true", "yes", "cprofile"):
+        return "cprofile"
+    if value == "sample":
+        return "sample"
+    return None
+
+
+# -------------------------------------------------
+# STACK SAMPLER
+# -------------------------------------------------
+class StackSampler:
+    """
+    Samples the call stack of one thread at a fixed interval and
+    aggregates it into collapsed stacks ("a;b;c count"), the input
+    format of flamegraph.pl / speedscope.
+    """
+
+    def __init__(self, thread_id=None, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="decisionforge-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def write_collapsed(self, path):
+        with open(path, "w", encoding="utf-8") as fh:
+            for stack, count in self.stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+
+
+# -------------------------------------------------
+# PROFILE CONTEXT
+# -------------------------------------------------
+@contextmanager
+def profile_run(name, requested=None, output_dir=None):
+    """
+    Profile the enclosed block when profiling is switched on.
+
+    Writes to DECISIONFORGE_PROFILE_DIR (default "profiles/"):
+    - <name>-<timestamp>.prof       cProfile stats (cprofile mode only)
+    - <name>-<timestamp>.collapsed  sampled collapsed stacks (both modes)
+
+    The profile is written even when the block exits early, which
+    is how Streamlit ends a script run on st.stop().
+    """
+    mode = profile_mode(requested)
+    if mode is None:
+        yield None
+        return
+
+    output_dir = output_dir or os.environ.get("DECISIONFORGE_PROFILE_DIR", DEFAULT_PROFILE_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S") + f"-{int(time.time() * 1000) % 1000:03d}"
+    stem = os.path.join(output_dir, f"{name}-{stamp}")
+
+    sampler = StackSampler()
+    profiler = cProfile.Profile() if mode == "cprofile" else None
+
+    sampler.start()
+    if profiler is not None:
+        profiler.enable()
+    start = time.perf_counter()
+
+    try:
+        yield stem
+    finally:
+        elapsed = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+        sampler.stop()
+
+        sampler.write_collapsed(stem + ".collapsed")
+        if profiler is not None:
+            pstats.Stats(profiler).dump_stats(stem + ".prof")
+
+        logger.info("Profiled %s (%s) in %.3fs -> %s.*", name, mode, elapsed, stem)
+
+
+def profiled(name):
+    """
+    Decorator form of profile_run for training entry points.
+    Only the environment variable can switch it on.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_run(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,253 @@
+import os
+import copy
+import time
+
+import numpy as np
+
+from sklearn.base import is_classifier
+
+from utils.model_selection import inference_costs
+
+
+# Largest drop in the full forest's metric (F1 or R2) the pruned forest may show
+PRUNE_TOLERANCE = float(os.environ.get("DECISIONFORGE_PRUNE_TOLERANCE", "0.01"))
+
+# Depth caps tried after tree selection, shallowest first ("" = keep depth)
+PRUNE_DEPTHS = [int(d) for d in os.environ.get("DECISIONFORGE_PRUNE_DEPTHS", "4,6,8,12").split(",") if d]
+
+# Training rows used for out-of-bag selection (a random sample above this)
+MAX_PRUNE_ROWS = 20000
+
+
+# -------------------------------------------------
+# OUT-OF-BAG METRICS OVER MANY CANDIDATE SUBSETS AT ONCE
+# -------------------------------------------------
+def _f1(y_true, y_pred):
+    """
+    F1 per row of y_pred (candidates x samples), booleans for the
+    positive class; 0 when there are no positive predictions or labels.
+    """
+    tp = (y_pred & y_true).sum(axis=-1)
+    denominator = y_pred.sum(axis=-1) + y_true.sum()
+    return np.where(denominator > 0, 2 * tp / np.maximum(denominator, 1), 0.0)
+
+
+def _r2(y_true, y_pred):
+    total = ((y_true - y_true.mean()) ** 2).sum()
+    residual = ((y_pred - y_true) ** 2).sum(axis=-1)
+    return 1 - residual / total if total > 0 else np.zeros(residual.shape)
+
+
+def _scorer(forest, y):
+    """
+    Metric of candidate subsets from their summed out-of-bag outputs
+    and per-row tree counts (candidates x rows [x classes]). Rows no
+    tree of a subset left out of its bootstrap get the training prior.
+    """
+    if is_classifier(forest):
+        # Positive class = last class, the pos_label the training modules use
+        positive = np.asarray(y) == forest.classes_[-1]
+        prior = positive.mean() > 0.5
+        last = len(forest.classes_) - 1
+
+        def score(summed, counts):
+            return _f1(positive, np.where(counts > 0, summed.argmax(axis=-1) == last, prior))
+        return score
+
+    y_true = np.asarray(y, dtype=float)
+
+    def score(summed, counts):
+        return _r2(y_true, np.where(counts > 0, summed / np.maximum(counts, 1), y_true.mean()))
+    return score
+
+
+def _tree_outputs(forest, X):
+    if is_classifier(forest):
+        return np.stack([tree.predict_proba(X) for tree in forest.estimators_]).astype(np.float32)
+    return np.stack([tree.predict(X) for tree in forest.estimators_]).astype(np.float32)
+
+
+def _oob_rows(forest, n_rows, random_state=42):
+    """
+    Sampled training rows and the (trees x rows) mask of trees that
+    left each row out of their bootstrap sample.
+    """
+    rows = np.arange(n_rows)
+    if n_rows > MAX_PRUNE_ROWS:
+        rows = np.sort(np.random.RandomState(random_state).choice(n_rows, MAX_PRUNE_ROWS, replace=False))
+
+    mask = np.ones((len(forest.estimators_), n_rows), dtype=bool)
+    for t, samples in enumerate(forest.estimators_samples_):
+        mask[t, samples] = False
+    return rows, mask[:, rows]
+
+
+def _oob_outputs(forest, X, mask):
+    outputs = _tree_outputs(forest, X)
+    return outputs * (mask[..., None] if outputs.ndim == 3 else mask)
+
+
+# -------------------------------------------------
+# TREE SELECTION
+# -------------------------------------------------
+def _select_trees(outputs, mask, score, tolerance):
+    """
+    Greedy forward selection: repeatedly add the tree that most improves
+    the out-of-bag metric of the kept trees, until every row has an
+    out-of-bag prediction from them and the metric is within `tolerance`
+    of the full forest's. Returns kept tree indices (in selection order)
+    and the full & kept out-of-bag metrics.
+    """
+    full = float(score(outputs.sum(axis=0)[None], mask.sum(axis=0)[None])[0])
+
+    kept = []
+    remaining = np.arange(len(outputs))
+    summed = np.zeros(outputs.shape[1:], dtype=np.float32)
+    counts = np.zeros(mask.shape[1], dtype=int)
+
+    while len(remaining):
+        candidates = score(summed[None] + outputs[remaining], counts[None] + mask[remaining])
+        best = int(np.argmax(candidates))
+
+        kept.append(int(remaining[best]))
+        summed += outputs[remaining[best]]
+        counts += mask[remaining[best]]
+        remaining = np.delete(remaining, best)
+
+        # Before full coverage the metric partly scores the prior, not the trees
+        if counts.all() and candidates[best] >= full - tolerance:
+            return kept, full, float(candidates[best])
+
+    return kept, full, full
+
+
+# -------------------------------------------------
+# DEPTH CAP
+# -------------------------------------------------
+def _cap_depth(estimator, max_depth):
+    """
+    Copy of a fitted tree with every node at `max_depth` turned into a
+    leaf (predicting that node's stored value) and the nodes below it
+    dropped, so the pickle shrinks too.
+    """
+    estimator = copy.deepcopy(estimator)
+    state = estimator.tree_.__getstate__()
+    nodes, values = state["nodes"], state["values"]
+
+    # Depth-first, parents before children, renumbered in visiting order
+    order, depths, stack = [], {}, [(0, 0)]
+    while stack:
+        node, depth = stack.pop()
+        order.append(node)
+        depths[node] = depth
+        if nodes["left_child"][node] != -1 and depth < max_depth:
+            stack.append((nodes["right_child"][node], depth + 1))
+            stack.append((nodes["left_child"][node], depth + 1))
+
+    new_id = {node: i for i, node in enumerate(order)}
+    new_nodes = nodes[order].copy()
+
+    for i, node in enumerate(order):
+        if nodes["left_child"][node] == -1 or depths[node] == max_depth:
+            new_nodes[i]["left_child"] = new_nodes[i]["right_child"] = -1
+            new_nodes[i]["feature"] = -2
+            new_nodes[i]["threshold"] = -2.0
+        else:
+            new_nodes[i]["left_child"] = new_id[nodes["left_child"][node]]
+            new_nodes[i]["right_child"] = new_id[nodes["right_child"][node]]
+
+    estimator.tree_.__setstate__({
+        "max_depth": min(state["max_depth"], max_depth),
+        "node_count": len(order),
+        "nodes": new_nodes,
+        "values": values[order].copy()
+    })
+    estimator.max_depth = max_depth
+    return estimator
+
+
+def _with_trees(forest, estimators):
+    pruned = copy.copy(forest)
+    pruned.estimators_ = estimators
+    pruned.n_estimators = len(estimators)
+    return pruned
+
+
+def _max_depth(forest):
+    return max(tree.tree_.max_depth for tree in forest.estimators_)
+
+
+# -------------------------------------------------
+# PRUNE
+# -------------------------------------------------
+def _costs(model, X_eval):
+    start = time.perf_counter()
+    model.predict(X_eval)
+    return inference_costs(model, X_eval, time.perf_counter() - start)
+
+
+def prune_forest(forest, X_train, y_train, tolerance=None):
+    """
+    Smallest greedy subset of a fitted RandomForest's trees, then the
+    shallowest depth cap in PRUNE_DEPTHS, whose out-of-bag metric on the
+    training split (F1 of the last class, or R2) stays within
+    `tolerance` (DECISIONFORGE_PRUNE_TOLERANCE) of the full forest's.
+    The test split is left for the usual evaluation of the result.
+
+    The pruned forest carries `pruning_`: trees, depth, out-of-bag
+    metric, size and latency before & after. Forests fitted without
+    bootstrap have no out-of-bag rows and are returned unchanged.
+    """
+    if not forest.bootstrap:
+        return forest
+    tolerance = PRUNE_TOLERANCE if tolerance is None else tolerance
+
+    rows, mask = _oob_rows(forest, X_train.shape[0])
+    X, y = X_train[rows], np.asarray(y_train)[rows]
+    score = _scorer(forest, y)
+
+    kept, full_score, kept_score = _select_trees(_oob_outputs(forest, X, mask), mask, score, tolerance)
+    mask = mask[kept]
+    pruned = _with_trees(forest, [forest.estimators_[i] for i in kept])
+
+    for depth in sorted(PRUNE_DEPTHS):
+        if depth >= _max_depth(pruned):
+            break
+        capped = _with_trees(pruned, [_cap_depth(tree, depth) for tree in pruned.estimators_])
+        capped_score = float(score(_oob_outputs(capped, X, mask).sum(axis=0)[None], mask.sum(axis=0)[None])[0])
+        if capped_score >= full_score - tolerance:
+            pruned, kept_score = capped, capped_score
+            break
+
+    # Costs are measured on the training rows; the test split stays unseen
+    X_costs = X[:1000]
+    before, after = _costs(forest, X_costs), _costs(pruned, X_costs)
+    pruned.pruning_ = {
+        "trees_before": len(forest.estimators_),
+        "trees_after": len(pruned.estimators_),
+        "depth_before": _max_depth(forest),
+        "depth_after": _max_depth(pruned),
+        "oob_score_before": full_score,
+        "oob_score_after": kept_score,
+        "size_kb_before": before["size_kb"],
+        "size_kb_after": after["size_kb"],
+        "single_row_ms_before": before["single_row_ms"],
+        "single_row_ms_after": after["single_row_ms"],
+        "size_reduction": 1 - after["size_kb"] / before["size_kb"],
+        "latency_reduction": 1 - after["batch_us_per_row"] / max(before["batch_us_per_row"], 1e-9)
+    }
+    return pruned
+
+
+def pruning_summary(model):
+    """
+    Numeric pruning stats for a training results row ({} if not pruned).
+    """
+    report = getattr(model, "pruning_", None)
+    if report is None:
+        return {}
+    return {
+        "trees_kept": report["trees_after"],
+        "size_reduction": report["size_reduction"],
+        "latency_reduction": report["latency_reduction"]
+    }
@@ -1,17 +1,38 @@
+import time
+
 import joblib
 import pandas as pd
 
 from sklearn.linear_model import LogisticRegression
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.ensemble import RandomForestClassifier
-from xgboost import XGBClassifier
 
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 
-from utils.retail_preprocessing import preprocess_retail_data
+from utils.retail_preprocessing import CATEGORICAL_FEATURES, NUMERICAL_FEATURES, preprocess_retail_data
+from utils.model_selection import inference_costs, select_model
+from utils.pruning import prune_forest, pruning_summary
+from utils.matrix_layout import check_layout, set_layout
+from utils.encoding import (
+    DEFAULT_ENCODING,
+    NATIVE_MODEL,
+    add_native_speedups,
+    matrix_stats,
+    native_gradient_boosting
+)
+from utils.artifacts import artifact_paths, publish_version, stage_version
+from utils.drift import build_reference, save_reference
+from utils.validation import build_profile, save_profile
+from utils.importance import compute_importances, save_importances
+from utils.profiling import profiled
+from utils.lazy_imports import lazy_import
+
+# xgboost is only imported once a model is actually built
+xgboost = lazy_import("xgboost")
 
 
-def train_retail_models(df: pd.DataFrame):
+@profiled("train_retail")
+def train_retail_models(df: pd.DataFrame, encoding: str | dict = DEFAULT_ENCODING):
     """
     Train and evaluate Retail & E-Commerce models.
     Saves the best model and preprocessor.
@@ -20,12 +41,16 @@ def train_retail_models(df: pd.DataFrame):
     # -------------------------------------------------
     # PREPROCESS DATA
     # -------------------------------------------------
-    X_train, X_test, y_train, y_test, preprocessor = preprocess_retail_data(df)
+    X_train, X_test, y_train, y_test, preprocessor = preprocess_retail_data(df, encoding=encoding)
 
     # Convert target to binary (important for XGBoost)
     y_train_bin = y_train.map({"No": 0, "Yes": 1})
     y_test_bin = y_test.map({"No": 0, "Yes": 1})
 
+    # Same split with categoricals as ordinal codes, for the native
+    # categorical candidate (no one-hot expansion)
+    X_train_native, X_test_native, _, _, native_preprocessor = preprocess_retail_data(df, encoding="ordinal")
+
     # -------------------------------------------------
     # MODELS
     # -------------------------------------------------
@@ -37,7 +62,7 @@ def train_retail_models(df: pd.DataFrame):
             random_state=42,
             n_jobs=-1
         ),
-        "XGBoost": XGBClassifier(
+        "XGBoost": xgboost.XGBClassifier(
             n_estimators=200,
             max_depth=6,
             learning_rate=0.1,
@@ -45,7 +70,8 @@ def train_retail_models(df: pd.DataFrame):
             colsample_bytree=0.8,
             eval_metric="logloss",
             random_state=42
-        )
+        ),
+        NATIVE_MODEL: native_gradient_boosting(native_preprocessor)
     }
 
     results = {}
@@ -54,27 +80,95 @@ def train_retail_models(df: pd.DataFrame):
     # TRAIN & EVALUATE
     # -------------------------------------------------
     for name, model in models.items():
-        model.fit(X_train, y_train_bin)
+        if name == NATIVE_MODEL:
+            X_fit, X_eval = X_train_native, X_test_native
+        else:
+            X_fit, X_eval = X_train, X_test
+
+        start = time.perf_counter()
+        model.fit(X_fit, y_train_bin)
+        fit_seconds = time.perf_counter() - start
+
+        # Keep only the trees (and depth) the forest needs, chosen on its
+        # out-of-bag rows (see utils.pruning)
+        if name == "Random Forest":
+            model = models[name] = prune_forest(model, X_fit, y_train_bin)
 
-        y_pred = model.predict(X_test)
+        start = time.perf_counter()
+        y_pred = model.predict(X_eval)
+        predict_seconds = time.perf_counter() - start
 
         results[name] = {
             "accuracy": accuracy_score(y_test_bin, y_pred),
             "precision": precision_score(y_test_bin, y_pred, zero_division=0),
             "recall": recall_score(y_test_bin, y_pred, zero_division=0),
-            "f1_score": f1_score(y_test_bin, y_pred, zero_division=0)
+            "f1_score": f1_score(y_test_bin, y_pred, zero_division=0),
+            "fit_seconds": fit_seconds,
+            "predict_seconds": predict_seconds
         }
 
+        results[name].update(inference_costs(model, X_eval, predict_seconds))
+        results[name].update(matrix_stats(X_fit))
+        results[name].update(pruning_summary(model))
+
+    add_native_speedups(results, models[NATIVE_MODEL], X_train, y_train_bin, X_test)
+
     # -------------------------------------------------
-    # SELECT BEST MODEL (F1 SCORE)
+    # SELECT BEST MODEL (F1 SCORE, LATENCY & SIZE; SEE utils.model_selection)
     # -------------------------------------------------
-    best_model_name = max(results, key=lambda x: results[x]["f1_score"])
+    best_model_name = select_model(results, "f1_score")
     best_model = models[best_model_name]
 
+    # The native candidate is served with its own (ordinal) preprocessor
+    if best_model_name == NATIVE_MODEL:
+        preprocessor, X_test = native_preprocessor, X_test_native
+
+    # Serve transformed batches in the dtype & format (float32 / CSR by
+    # measured density) the model consumes without converting them
+    layout = set_layout(preprocessor, best_model, X_test)
+    check_layout(best_model, X_test, layout)
+
     # -------------------------------------------------
     # SAVE MODEL & PREPROCESSOR
     # -------------------------------------------------
-    joblib.dump(best_model, "models/retail_model.pkl")
-    joblib.dump(preprocessor, "models/retail_preprocessor.pkl")
+    # Written into a staging directory and published at the end, so a
+    # running app never loads a half-written version
+    staging = stage_version("retail")
+    model_path, preprocessor_path = artifact_paths("retail", staging)
+
+    joblib.dump(best_model, model_path)
+    joblib.dump(preprocessor, preprocessor_path)
+
+    # -------------------------------------------------
+    # GLOBAL FEATURE IMPORTANCES (RENDERED BY THE PAGE)
+    # -------------------------------------------------
+    save_importances(
+        "retail",
+        compute_importances(best_model, preprocessor, X_test, y_test_bin),
+        staging
+    )
+
+    # -------------------------------------------------
+    # REFERENCE PROFILE FOR DRIFT MONITORING
+    # -------------------------------------------------
+    save_reference(
+        "retail",
+        build_reference(df, NUMERICAL_FEATURES, CATEGORICAL_FEATURES),
+        staging
+    )
+
+    # -------------------------------------------------
+    # DATA PROFILE FOR INPUT VALIDATION
+    # -------------------------------------------------
+    save_profile(
+        "retail",
+        build_profile(df, NUMERICAL_FEATURES, CATEGORICAL_FEATURES),
+        staging
+    )
+
+    # -------------------------------------------------
+    # PUBLISH (ATOMIC SWAP, HOT-RELOADED BY RUNNING APPS)
+    # -------------------------------------------------
+    publish_version("retail", staging)
 
     return results, best_model_name
@@ -1,24 +1,45 @@
 import pandas as pd
 
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import StandardScaler
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
 
+from utils.encoding import categorical_transformers
+
+
+# -------------------------------------------------
+# FEATURE SCHEMA
+# -------------------------------------------------
+CATEGORICAL_FEATURES = [
+    "Category",
+    "Region",
+    "Season"
+]
+
+NUMERICAL_FEATURES = [
+    "Price",
+    "DiscountPercent",
+    "MarketingSpend",
+    "UnitsSold",
+    "Revenue"
+]
+
 
 def preprocess_retail_data(
     df: pd.DataFrame,
     target_column: str = "HighSales",
     test_size: float = 0.2,
-    random_state: int = 42
+    random_state: int = 42,
+    encoding: str | dict = "onehot"
 ):
     """
     Retail & E-Commerce Data Preprocessing Pipeline
 
     Steps:
     1. Handle missing values
-    2. Encode categorical variables
+    2. Encode categorical variables (see utils.encoding.categorical_transformers)
     3. Scale numerical features
     4. Train-test split
 
@@ -45,19 +66,8 @@ def preprocess_retail_data(
     # -------------------------------------------------
     # Feature groups (LOCKED SCHEMA)
     # -------------------------------------------------
-    categorical_features = [
-        "Category",
-        "Region",
-        "Season"
-    ]
-
-    numerical_features = [
-        "Price",
-        "DiscountPercent",
-        "MarketingSpend",
-        "UnitsSold",
-        "Revenue"
-    ]
+    categorical_features = CATEGORICAL_FEATURES
+    numerical_features = NUMERICAL_FEATURES
 
     # -------------------------------------------------
     # Numerical pipeline
@@ -67,21 +77,13 @@ def preprocess_retail_data(
         ("scaler", StandardScaler())
     ])
 
-    # -------------------------------------------------
-    # Categorical pipeline
-    # -------------------------------------------------
-    categorical_pipeline = Pipeline(steps=[
-        ("imputer", SimpleImputer(strategy="most_frequent")),
-        ("encoder", OneHotEncoder(handle_unknown="ignore"))
-    ])
-
     # -------------------------------------------------
     # Combine pipelines
     # -------------------------------------------------
     preprocessor = ColumnTransformer(
         transformers=[
             ("num", numeric_pipeline, numerical_features),
-            ("cat", categorical_pipeline, categorical_features)
+            *categorical_transformers(categorical_features, encoding)
         ]
     )
 
@@ -99,7 +101,8 @@ def preprocess_retail_data(
     # -------------------------------------------------
     # Fit on training data only
     # -------------------------------------------------
-    X_train_processed = preprocessor.fit_transform(X_train)
+    # y is only used by target encoding (out-of-fold on the training rows)
+    X_train_processed = preprocessor.fit_transform(X_train, y_train)
     X_test_processed = preprocessor.transform(X_test)
 
     return (
@@ -0,0 +1,223 @@
+import os
+import time
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from sklearn.base import is_classifier
+
+from utils.explain import get_explainer, top_reasons
+from utils.matrix_layout import transform_batch
+from utils.metrics import gauge, time_stage, record_rows_scored
+from utils.prediction_cache import PREDICTION_CACHE, feature_key
+from utils.shadow import start_shadow, finish_shadow
+
+
+# Rows transformed & scored per step; bounds peak memory on large files
+DEFAULT_CHUNK_ROWS = int(os.environ.get("DECISIONFORGE_CHUNK_ROWS", "50000"))
+
+# Score each distinct feature vector once (DECISIONFORGE_DEDUP=0 disables)
+DEFAULT_DEDUP = os.environ.get("DECISIONFORGE_DEDUP", "1").lower() not in ("0", "false", "no")
+
+DEDUP_RATIO = gauge(
+    "decisionforge_dedup_ratio",
+    "Share of rows skipped as duplicates in the last scoring call.",
+    ["domain"]
+)
+
+
+@dataclass
+class ScoreResult:
+    """
+    Output of one scoring call.
+
+    probabilities is the positive-class probability (0-1) for
+    classifiers and None for regressors. reasons holds the top
+    contributing input columns per row ("" when none) if explanations
+    were requested and the model type supports them.
+    """
+    predictions: np.ndarray
+    probabilities: np.ndarray = None
+    reasons: np.ndarray = None
+    stats: dict = field(default_factory=dict)
+
+
+def positive_probability(model, Xp):
+    """
+    Positive-class probability for a binary classifier.
+
+    Falls back to sigmoid(decision_function) when predict_proba is
+    unavailable or fails (e.g. LogisticRegression pickles from another
+    sklearn version), and to None when neither works.
+    """
+    try:
+        if hasattr(model, "predict_proba"):
+            return model.predict_proba(Xp)[:, 1]
+    except Exception:
+        pass
+
+    try:
+        if hasattr(model, "decision_function"):
+            return 1 / (1 + np.exp(-model.decision_function(Xp)))
+    except Exception:
+        pass
+
+    return None
+
+
+def unique_rows(X):
+    """
+    Positions of the distinct rows of X and, for every row, the index
+    of its distinct row (X == X.iloc[first].iloc[inverse]).
+
+    Rows are compared by a vectorized 64-bit hash of their values.
+    """
+    hashes = pd.util.hash_pandas_object(X, index=False).to_numpy()
+    _, first, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+    return first, inverse
+
+
+def score_frame(domain, model, preprocessor, X, chunk_rows=None, progress=None, dedup=None, explain=0, shadow=None):
+    """
+    Transform and score a feature frame in fixed-size chunks.
+
+    Parameters:
+    domain      : metrics label
+    X           : frame holding the model's input columns
+    chunk_rows  : rows per chunk (DECISIONFORGE_CHUNK_ROWS by default)
+    progress    : optional callback(rows_done, rows_total)
+    dedup       : score distinct rows only and scatter the results back
+                  (DECISIONFORGE_DEDUP by default)
+    explain     : number of top reasons per row (0 = no explanations)
+    shadow      : optional candidate model scored on the same transformed
+                  chunks for comparison only (see utils.shadow)
+    """
+    dedup = DEFAULT_DEDUP if dedup is None else dedup
+    n_rows = len(X)
+
+    inverse = None
+    if dedup and n_rows > 1:
+        with time_stage(domain, "dedup"):
+            first, inverse = unique_rows(X)
+        X = X.iloc[first]
+
+    n_unique = len(X)
+
+    if progress is not None and n_unique != n_rows:
+        # Report progress in original rows
+        scale = n_rows / n_unique
+        user_progress = progress
+        progress = lambda done, total: user_progress(min(round(done * scale), n_rows), n_rows)
+
+    result = _score_chunks(domain, model, preprocessor, X, chunk_rows, progress, explain, shadow)
+    record_rows_scored(domain, n_rows)
+
+    if inverse is not None:
+        result.predictions = result.predictions[inverse]
+        if result.probabilities is not None:
+            result.probabilities = result.probabilities[inverse]
+        if result.reasons is not None:
+            result.reasons = result.reasons[inverse]
+
+    ratio = 1 - n_unique / n_rows if n_rows else 0.0
+    DEDUP_RATIO.labels(domain=domain).set(ratio)
+
+    result.stats.update({"rows": n_rows, "unique_rows": n_unique, "dedup_ratio": ratio})
+    return result
+
+
+def _score_chunks(domain, model, preprocessor, X, chunk_rows, progress, explain=0, shadow=None):
+    chunk_rows = chunk_rows or DEFAULT_CHUNK_ROWS
+    n_rows = len(X)
+    classifier = is_classifier(model)
+    explainer = get_explainer(model, preprocessor, domain) if explain else None
+
+    predictions = []
+    probabilities = []
+    reasons = []
+
+    for start in range(0, n_rows, chunk_rows):
+        chunk = X.iloc[start:start + chunk_rows]
+
+        with time_stage(domain, "transform"):
+            Xp = transform_batch(preprocessor, chunk)
+
+        # The candidate reuses Xp: the transform is never paid twice
+        pending = start_shadow(shadow, Xp)
+
+        with time_stage(domain, "predict"):
+            predict_start = time.perf_counter()
+            predictions.append(np.asarray(model.predict(Xp)))
+            if classifier:
+                probabilities.append(positive_probability(model, Xp))
+            predict_seconds = time.perf_counter() - predict_start
+
+        finish_shadow(
+            domain, pending, predictions[-1],
+            probabilities[-1] if classifier else None,
+            predict_seconds
+        )
+
+        if explainer is not None:
+            with time_stage(domain, "explain"):
+                reasons.append(top_reasons(explainer.contributions(Xp), explainer.names, explain))
+
+        if progress is not None:
+            progress(min(start + chunk_rows, n_rows), n_rows)
+
+    if not predictions:
+        return ScoreResult(predictions=np.empty(0), probabilities=np.empty(0) if classifier else None)
+
+    probs = None
+    if classifier and all(p is not None for p in probabilities):
+        probs = np.concatenate(probabilities)
+
+    return ScoreResult(
+        predictions=np.concatenate(predictions),
+        probabilities=probs,
+        reasons=np.concatenate(reasons) if reasons else None,
+        stats={"chunks": len(predictions)}
+    )
+
+
+def score_cached(domain, model, preprocessor, X, version, cache=None, explain=0, shadow=None):
+    """
+    Score a handful of records (manual entry, single-record queries)
+    through the prediction memo cache; only cache misses reach the
+    model. The cache is keyed by the record values and model version.
+    """
+    cache = cache or PREDICTION_CACHE
+    columns = list(X.columns)
+    records = X.to_dict("records")
+    keys = [feature_key(domain, (version, explain), r, columns) for r in records]
+    cached = [cache.get(k) for k in keys]
+
+    missing = [i for i, hit in enumerate(cached) if hit is None]
+    if missing:
+        fresh = score_frame(domain, model, preprocessor, X.iloc[missing], dedup=False, explain=explain, shadow=shadow)
+        for j, i in enumerate(missing):
+            prob = None if fresh.probabilities is None else fresh.probabilities[j]
+            reason = None if fresh.reasons is None else fresh.reasons[j]
+            cached[i] = (fresh.predictions[j], prob, reason)
+            cache.put(keys[i], cached[i])
+
+    predictions = np.array([p for p, _, _ in cached])
+    probabilities = None
+    if is_classifier(model) and all(p is not None for _, p, _ in cached):
+        probabilities = np.array([p for _, p, _ in cached], dtype=float)
+    reasons = None
+    if explain and all(r is not None for _, _, r in cached):
+        reasons = np.array([r for _, _, r in cached], dtype=object)
+
+    return ScoreResult(
+        predictions=predictions,
+        probabilities=probabilities,
+        reasons=reasons,
+        stats={
+            "rows": len(records),
+            "cache_hits": len(records) - len(missing),
+            "cache_hit_rate": cache.stats()["hit_rate"]
+        }
+    )
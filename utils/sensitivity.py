@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+from sklearn.base import is_classifier
+
+from utils.matrix_layout import transform_batch
+from utils.metrics import time_stage
+from utils.scoring import positive_probability
+
+
+DEFAULT_POINTS = 50
+
+# Numeric sweeps span the training mean +/- this many standard deviations
+SPAN_STDS = 2.0
+
+
+# -------------------------------------------------
+# FEATURE RANGES
+# -------------------------------------------------
+def feature_ranges(preprocessor):
+    """
+    Sweepable inputs of a fitted ColumnTransformer.
+
+    Returns {column: ("numeric", (mean, std))} for scaled columns and
+    {column: ("categorical", categories)} for encoded ones;
+    dropped columns are left out since they cannot move the prediction.
+    """
+    ranges = {}
+
+    for name, transformer, columns in preprocessor.transformers_:
+        steps = getattr(transformer, "named_steps", {})
+
+        scaler = steps.get("scaler")
+        if scaler is not None:
+            for col, mean, scale in zip(columns, scaler.mean_, scaler.scale_):
+                ranges[col] = ("numeric", (float(mean), float(scale)))
+
+        # Hashed features keep no vocabulary to sweep over
+        encoder = steps.get("encoder")
+        if encoder is not None and hasattr(encoder, "categories_"):
+            for col, categories in zip(columns, encoder.categories_):
+                ranges[col] = ("categorical", list(categories))
+
+    return ranges
+
+
+def feature_values(preprocessor, feature, base_value, points=DEFAULT_POINTS):
+    """
+    Grid of values for one feature: every known category, or an even
+    numeric range around the training distribution that also covers
+    the base value.
+    """
+    kind, info = feature_ranges(preprocessor)[feature]
+
+    if kind == "categorical":
+        return np.array(info, dtype=object)
+
+    mean, std = info
+    lo = mean - SPAN_STDS * std
+    hi = mean + SPAN_STDS * std
+    if base_value is not None:
+        lo = min(lo, base_value)
+        hi = max(hi, base_value)
+        if base_value >= 0:
+            lo = max(lo, 0.0)
+
+    return np.linspace(lo, hi, points)
+
+
+# -------------------------------------------------
+# SWEEP
+# -------------------------------------------------
+def sweep_grid(base_record, grid):
+    """
+    Frame of what-if records: the base record repeated over the
+    cartesian product of the grid ({feature: values}, one or two features).
+    """
+    features = list(grid)
+    sizes = [len(grid[f]) for f in features]
+    n_rows = int(np.prod(sizes))
+
+    frame = pd.DataFrame({col: np.repeat(value, n_rows) for col, value in base_record.items()})
+
+    # Outer feature varies slowest, like np.meshgrid(..., indexing="ij")
+    repeat = n_rows
+    for feature, size in zip(features, sizes):
+        repeat //= size
+        values = np.asarray(grid[feature])
+        frame[feature] = np.tile(np.repeat(values, repeat), n_rows // (size * repeat))
+
+    return frame
+
+
+def sensitivity_sweep(domain, model, preprocessor, base_record, grid):
+    """
+    Score every point of the grid in one transform and one model call.
+
+    Returns the grid columns plus "response": the positive-class
+    probability for classifiers, the prediction for regressors.
+    """
+    frame = sweep_grid(base_record, grid)
+
+    with time_stage(domain, "sensitivity"):
+        Xp = transform_batch(preprocessor, frame)
+
+        response = None
+        if is_classifier(model):
+            response = positive_probability(model, Xp)
+        if response is None:
+            response = np.asarray(model.predict(Xp), dtype=float)
+
+    out = frame[list(grid)].copy()
+    out["response"] = response
+    return out
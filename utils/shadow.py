@@ -0,0 +1,175 @@
+import os
+import time
+import logging
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from sklearn.base import is_classifier
+
+from utils.metrics import counter, histogram
+
+
+logger = logging.getLogger(__name__)
+
+# DECISIONFORGE_SHADOW=0 turns shadow scoring off even if a candidate exists
+SHADOW_ENABLED = os.environ.get("DECISIONFORGE_SHADOW", "1") != "0"
+
+SHADOW_ROWS = counter(
+    "decisionforge_shadow_rows_total",
+    "Rows scored by both the production and the candidate model.",
+    ["domain"]
+)
+
+SHADOW_DISAGREEMENTS = counter(
+    "decisionforge_shadow_disagreements_total",
+    "Rows where the candidate's prediction differs from production.",
+    ["domain"]
+)
+
+SHADOW_PREDICT_SECONDS = histogram(
+    "decisionforge_shadow_predict_seconds",
+    "Predict time per chunk of the production and the candidate model.",
+    ["domain", "model"]
+)
+
+# Relative difference above which a regression prediction counts as a disagreement
+REGRESSION_TOLERANCE = 0.05
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Chunks waiting on the candidate before new ones skip shadow scoring
+MAX_PENDING = 8
+
+# domain -> running totals for shadow_report()
+_totals = {}
+_totals_lock = threading.Lock()
+_pending = 0
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="decisionforge-shadow")
+    return _pool
+
+
+# -------------------------------------------------
+# RUN
+# -------------------------------------------------
+def _candidate_predict(candidate, Xp):
+    global _pending
+    from utils.scoring import positive_probability
+
+    try:
+        start = time.perf_counter()
+        predictions = np.asarray(candidate.predict(Xp))
+        probabilities = positive_probability(candidate, Xp) if is_classifier(candidate) else None
+        return predictions, probabilities, time.perf_counter() - start
+    finally:
+        with _totals_lock:
+            _pending -= 1
+
+
+def start_shadow(candidate, Xp):
+    """
+    Start the candidate on an already transformed chunk in a worker
+    thread, so it overlaps the production predict wherever the model
+    releases the GIL. Returns a future for finish_shadow(), or None
+    while MAX_PENDING chunks still wait on a slow candidate.
+    """
+    global _pending
+    if candidate is None or not SHADOW_ENABLED:
+        return None
+
+    with _totals_lock:
+        if _pending >= MAX_PENDING:
+            return None
+        _pending += 1
+    return _get_pool().submit(_candidate_predict, candidate, Xp)
+
+
+def finish_shadow(domain, future, predictions, probabilities, seconds):
+    """
+    Compare the candidate with the production output of the same chunk
+    once the candidate is done, on its worker thread; returns at once,
+    so a slow candidate never delays the production results. Never
+    raises: the candidate must not affect the returned results.
+    """
+    if future is None:
+        return
+
+    # Copies: the caller may reuse its arrays before the candidate ends
+    predictions = np.array(predictions)
+    probabilities = None if probabilities is None else np.array(probabilities)
+    future.add_done_callback(
+        lambda done: _compare(domain, done, predictions, probabilities, seconds)
+    )
+
+
+def _compare(domain, future, predictions, probabilities, seconds):
+    try:
+        cand_predictions, cand_probabilities, cand_seconds = future.result()
+
+        if np.issubdtype(predictions.dtype, np.floating) and np.issubdtype(cand_predictions.dtype, np.floating):
+            scale = np.maximum(np.abs(predictions), 1e-9)
+            differs = np.abs(cand_predictions - predictions) / scale > REGRESSION_TOLERANCE
+        else:
+            differs = cand_predictions.astype(str) != predictions.astype(str)
+
+        prob_gap = None
+        if probabilities is not None and cand_probabilities is not None:
+            prob_gap = float(np.abs(cand_probabilities - probabilities).mean())
+
+    except Exception as exc:
+        logger.warning("Shadow candidate failed for %s: %s", domain, exc)
+        return
+
+    n_rows = len(predictions)
+    n_differs = int(differs.sum())
+
+    SHADOW_ROWS.labels(domain=domain).inc(n_rows)
+    SHADOW_DISAGREEMENTS.labels(domain=domain).inc(n_differs)
+    SHADOW_PREDICT_SECONDS.labels(domain=domain, model="production").observe(seconds)
+    SHADOW_PREDICT_SECONDS.labels(domain=domain, model="candidate").observe(cand_seconds)
+
+    with _totals_lock:
+        totals = _totals.setdefault(domain, {
+            "rows": 0, "disagreements": 0,
+            "production_seconds": 0.0, "candidate_seconds": 0.0
+        })
+        totals["rows"] += n_rows
+        totals["disagreements"] += n_differs
+        totals["production_seconds"] += seconds
+        totals["candidate_seconds"] += cand_seconds
+
+    logger.info(
+        "Shadow %s: %d rows, %.2f%% disagree%s, predict %.1fms vs candidate %.1fms (%+.1fms)",
+        domain,
+        n_rows,
+        100 * n_differs / max(n_rows, 1),
+        f", mean |dp| {prob_gap:.3f}" if prob_gap is not None else "",
+        seconds * 1000,
+        cand_seconds * 1000,
+        (cand_seconds - seconds) * 1000
+    )
+
+
+def shadow_report(domain):
+    """
+    Totals since start-up: rows, disagreement rate and predict time
+    of both models. None if nothing was shadow scored.
+    """
+    totals = _totals.get(domain)
+    if not totals:
+        return None
+
+    report = dict(totals)
+    report["disagreement_rate"] = totals["disagreements"] / max(totals["rows"], 1)
+    report["latency_delta_seconds"] = totals["candidate_seconds"] - totals["production_seconds"]
+    return report
@@ -0,0 +1,189 @@
+import os
+
+import numpy as np
+import scipy.sparse as sp
+
+from sklearn.neighbors import KDTree
+
+
+# Most similar stored claims returned per query
+SIMILAR_CLAIMS = int(os.environ.get("DECISIONFORGE_SIMILAR_CLAIMS", "5"))
+
+# Inserts are searched by brute force until the buffer holds this many
+# rows and this share of the tree's claims; then the tree is rebuilt
+DELTA_ROWS = 10000
+DELTA_SHARE = 0.05
+
+# Query x buffered-row distances computed per block
+BLOCK_CELLS = 4_000_000
+
+LEAF_SIZE = 40
+
+# Stored claims sampled to measure the typical neighbour distance
+REFERENCE_SAMPLE = 2000
+
+
+class SimilarityIndex:
+    """
+    Nearest-neighbour index of historical claims in the preprocessed
+    feature space (scaled numbers, encoded categories), so near-identical
+    claims (same categories, close amounts) are close.
+
+    Stored claims live in a KD-tree; inserted ones go to a delta buffer
+    searched by blocked brute force and are merged into the tree once the
+    buffer grows past DELTA_ROWS and DELTA_SHARE of the tree.
+
+    The density of a queried claim is the typical distance from a stored
+    claim to its k nearest others divided by the query's own: about 1
+    for an ordinary claim, well above 1 inside a cluster of similar
+    claims.
+
+    A queried claim that is itself stored (same feature vector, distance
+    0) is not its own neighbour: one exact match per query is skipped,
+    so scoring the historical claims does not list each claim next to
+    itself. Further identical copies still count.
+    """
+
+    def __init__(self, preprocessor=None, k=SIMILAR_CLAIMS, leaf_size=LEAF_SIZE):
+        self.preprocessor = preprocessor
+        self.k = k
+        self.leaf_size = leaf_size
+
+    # -------------------------------------------------
+    # STORE
+    # -------------------------------------------------
+    def _vectors(self, X):
+        if self.preprocessor is not None:
+            X = self.preprocessor.transform(X)
+        if sp.issparse(X):
+            X = X.toarray()
+        return np.ascontiguousarray(X, dtype=np.float64)
+
+    def fit(self, X, ids=None):
+        """
+        Index the claims of X (raw frame when a preprocessor is set,
+        else vectors); ids default to their row numbers.
+        """
+        vectors = self._vectors(X)
+        ids = np.arange(len(vectors)) if ids is None else np.asarray(ids)
+        self._delta, self._delta_ids = [], []
+        self._build(vectors, ids)
+        return self
+
+    def _build(self, vectors, ids):
+        self._tree = KDTree(vectors, leaf_size=self.leaf_size)
+        self._ids = ids
+        self.reference_distance_ = self._reference_distance(vectors)
+
+    def _reference_distance(self, vectors, random_state=42):
+        """
+        Median over sampled stored claims of the mean distance to their
+        k nearest other stored claims.
+        """
+        if len(vectors) < 2:
+            return 1.0
+        k = min(self.k, len(vectors) - 1)
+        rows = np.random.RandomState(random_state).choice(
+            len(vectors), min(REFERENCE_SAMPLE, len(vectors)), replace=False
+        )
+        distances, _ = self._tree.query(vectors[rows], k=k + 1)
+        # The nearest hit is the claim itself
+        return max(float(np.median(distances[:, 1:].mean(axis=1))), 1e-9)
+
+    def add(self, X, ids=None):
+        """
+        Insert claims; searchable at once, merged into the tree later.
+        """
+        vectors = self._vectors(X)
+        if ids is None:
+            ids = np.arange(self.size, self.size + len(vectors))
+        self._delta.append(vectors)
+        self._delta_ids.append(np.asarray(ids))
+
+        buffered = sum(len(v) for v in self._delta)
+        if buffered >= DELTA_ROWS and buffered >= DELTA_SHARE * self._tree.data.shape[0]:
+            self.rebuild()
+        return self
+
+    def rebuild(self):
+        """
+        Merge the delta buffer into a new tree.
+        """
+        if self._delta:
+            self._build(
+                np.vstack([np.asarray(self._tree.data)] + self._delta),
+                np.concatenate([self._ids] + self._delta_ids)
+            )
+            self._delta, self._delta_ids = [], []
+        return self
+
+    @property
+    def size(self):
+        return self._tree.data.shape[0] + sum(len(v) for v in self._delta)
+
+    # -------------------------------------------------
+    # QUERY
+    # -------------------------------------------------
+    def _query_delta(self, vectors, k):
+        """
+        k nearest buffered claims per query, by blocked brute force:
+        distances and buffer rows.
+        """
+        delta = np.vstack(self._delta)
+        k = min(k, len(delta))
+
+        delta_norms = (delta ** 2).sum(axis=1)
+        block = max(BLOCK_CELLS // len(delta), 1)
+        distances = np.empty((len(vectors), k))
+        found = np.empty((len(vectors), k), dtype=np.int64)
+
+        for start in range(0, len(vectors), block):
+            q = vectors[start:start + block]
+            d2 = (q ** 2).sum(axis=1)[:, None] + delta_norms - 2 * q @ delta.T
+            nearest = np.argpartition(d2, k - 1, axis=1)[:, :k]
+            distances[start:start + block] = np.sqrt(np.maximum(np.take_along_axis(d2, nearest, axis=1), 0))
+            found[start:start + block] = nearest
+
+        return distances, found
+
+    def query(self, X, k=None):
+        """
+        (ids, distances) of the k most similar stored claims per claim of
+        X, nearest first, and the claims' cluster density (see class
+        docstring). Missing neighbours (fewer than k stored) are -1 / inf.
+        """
+        k = k or self.k
+        vectors = self._vectors(X)
+        # One extra hit, in case the claim's own copy is among them
+        wanted = k + 1
+
+        distances, rows = self._tree.query(vectors, k=min(wanted, self._tree.data.shape[0]))
+        ids = self._ids[rows]
+
+        if self._delta:
+            delta_distances, delta_rows = self._query_delta(vectors, wanted)
+            distances = np.hstack([distances, delta_distances])
+            ids = np.hstack([ids, np.concatenate(self._delta_ids)[delta_rows]])
+            order = np.argsort(distances, axis=1, kind="stable")[:, :wanted]
+            distances = np.take_along_axis(distances, order, axis=1)
+            ids = np.take_along_axis(ids, order, axis=1)
+
+        # Skip the first hit identical to the query (distance 0), then keep k
+        own = distances == 0
+        own &= np.cumsum(own, axis=1) == 1
+        order = np.argsort(own, axis=1, kind="stable")[:, :k]
+        distances = np.where(np.take_along_axis(own, order, axis=1), np.inf, np.take_along_axis(distances, order, axis=1))
+        ids = np.take_along_axis(ids, order, axis=1)
+
+        if distances.shape[1] < k:
+            pad = k - distances.shape[1]
+            distances = np.hstack([distances, np.full((len(vectors), pad), np.inf)])
+            ids = np.hstack([ids, np.full((len(vectors), pad), -1, dtype=ids.dtype)])
+        ids = np.where(np.isfinite(distances), ids, -1)
+
+        found = np.isfinite(distances)
+        mean = np.where(found, distances, 0).sum(axis=1) / np.maximum(found.sum(axis=1), 1)
+        density = self.reference_distance_ / np.maximum(mean, 1e-3 * self.reference_distance_)
+        density = np.where(found.any(axis=1), density, 0.0)
+
+        return ids, distances, density
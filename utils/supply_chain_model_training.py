@@ -1,27 +1,57 @@
+import time
+
 import joblib
 
 from sklearn.linear_model import LinearRegression
 from sklearn.ensemble import RandomForestRegressor
-from xgboost import XGBRegressor
 
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 
-from utils.supply_chain_preprocessing import preprocess_supply_chain_data
+from utils.supply_chain_preprocessing import CATEGORICAL_FEATURES, NUMERICAL_FEATURES, preprocess_supply_chain_data
+from utils.model_selection import inference_costs, select_model
+from utils.pruning import prune_forest, pruning_summary
+from utils.matrix_layout import check_layout, set_layout
+from utils.encoding import (
+    DEFAULT_ENCODING,
+    NATIVE_MODEL,
+    add_native_speedups,
+    matrix_stats,
+    native_gradient_boosting
+)
+from utils.artifacts import artifact_paths, publish_version, stage_version
+from utils.distillation import distill_stage, should_distill
+from utils.drift import build_reference, save_reference
+from utils.validation import build_profile, save_profile
+from utils.importance import compute_importances, save_importances
+from utils.profiling import profiled
+from utils.lazy_imports import lazy_import
+
+# xgboost is only imported once a model is actually built
+xgboost = lazy_import("xgboost")
 
 
-def train_supply_chain_models(df):
+@profiled("train_supply_chain")
+def train_supply_chain_models(df, encoding=DEFAULT_ENCODING, distill=False):
     """
     Train and compare Supply Chain regression models.
     Saves the best model and preprocessor.
+
+    With distill, an ensemble winner is distilled into a compact
+    student that is served instead when its R2 stays within
+    DECISIONFORGE_DISTILL_TOLERANCE (see utils.distillation).
     """
 
     # -------------------------------------------------
     # PREPROCESS DATA
     # -------------------------------------------------
     X_train, X_test, y_train, y_test, preprocessor = (
-        preprocess_supply_chain_data(df)
+        preprocess_supply_chain_data(df, encoding=encoding)
     )
 
+    # Same split with categoricals as ordinal codes, for the native
+    # categorical candidate (no one-hot expansion)
+    X_train_native, X_test_native, _, _, native_preprocessor = preprocess_supply_chain_data(df, encoding="ordinal")
+
     # -------------------------------------------------
     # MODELS
     # -------------------------------------------------
@@ -32,13 +62,14 @@ def train_supply_chain_models(df):
             random_state=42,
             n_jobs=-1
         ),
-        "XGBoost": XGBRegressor(
+        "XGBoost": xgboost.XGBRegressor(
             n_estimators=200,
             learning_rate=0.05,
             max_depth=6,
             random_state=42,
             objective="reg:squarederror"
-        )
+        ),
+        NATIVE_MODEL: native_gradient_boosting(native_preprocessor, classifier=False)
     }
 
     results = {}
@@ -47,28 +78,126 @@ def train_supply_chain_models(df):
     # TRAIN & EVALUATE
     # -------------------------------------------------
     for name, model in models.items():
-        model.fit(X_train, y_train)
+        if name == NATIVE_MODEL:
+            X_fit, X_eval = X_train_native, X_test_native
+        else:
+            X_fit, X_eval = X_train, X_test
 
-        y_pred = model.predict(X_test)
+        start = time.perf_counter()
+        model.fit(X_fit, y_train)
+        fit_seconds = time.perf_counter() - start
+
+        # Keep only the trees (and depth) the forest needs, chosen on its
+        # out-of-bag rows (see utils.pruning)
+        if name == "Random Forest":
+            model = models[name] = prune_forest(model, X_fit, y_train)
+
+        start = time.perf_counter()
+        y_pred = model.predict(X_eval)
+        predict_seconds = time.perf_counter() - start
 
         mse = mean_squared_error(y_test, y_pred)
 
         results[name] = {
             "MAE": mean_absolute_error(y_test, y_pred),
             "RMSE": mse ** 0.5,   # ✅ FIXED
-            "R2": r2_score(y_test, y_pred)
+            "R2": r2_score(y_test, y_pred),
+            "fit_seconds": fit_seconds,
+            "predict_seconds": predict_seconds
         }
 
+        results[name].update(inference_costs(model, X_eval, predict_seconds))
+        results[name].update(matrix_stats(X_fit))
+        results[name].update(pruning_summary(model))
+
+    add_native_speedups(results, models[NATIVE_MODEL], X_train, y_train, X_test)
+
     # -------------------------------------------------
-    # SELECT BEST MODEL (BY R2 SCORE)
+    # SELECT BEST MODEL (R2 SCORE, LATENCY & SIZE; SEE utils.model_selection)
     # -------------------------------------------------
-    best_model_name = max(results, key=lambda x: results[x]["R2"])
+    best_model_name = select_model(results, "R2")
     best_model = models[best_model_name]
 
+    # -------------------------------------------------
+    # DISTILL AN ENSEMBLE WINNER INTO A COMPACT STUDENT
+    # -------------------------------------------------
+    # Fitted on this training split and judged on this test split, the
+    # teacher's own held-out rows
+    if distill and should_distill(best_model):
+        start = time.perf_counter()
+        student, report = distill_stage(best_model, preprocessor, X_train, X_test, y_test)
+        fit_seconds = time.perf_counter() - start
+
+        name = f"Distilled {best_model_name}"
+        y_pred = student.predict(X_test)
+        results[name] = {
+            "MAE": mean_absolute_error(y_test, y_pred),
+            "RMSE": mean_squared_error(y_test, y_pred) ** 0.5,
+            "R2": report["student"]["score"],
+            "fit_seconds": fit_seconds,
+            "predict_seconds": report["student"]["batch_us_per_row"] * X_test.shape[0] / 1e6,
+            "single_row_ms": report["student"]["single_row_ms"],
+            "batch_us_per_row": report["student"]["batch_us_per_row"],
+            "size_kb": report["student"]["size_kb"],
+            "distill_gap": report["gap"],
+            "distill_agreement": report["agreement"]
+        }
+        results[name].update(matrix_stats(X_train))
+
+        if report["accepted"]:
+            models[name] = best_model = student
+            best_model_name = name
+
+    # The native candidate is served with its own (ordinal) preprocessor
+    if best_model_name == NATIVE_MODEL:
+        preprocessor, X_test = native_preprocessor, X_test_native
+
+    # Serve transformed batches in the dtype & format (float32 / CSR by
+    # measured density) the model consumes without converting them
+    layout = set_layout(preprocessor, best_model, X_test)
+    check_layout(best_model, X_test, layout)
+
     # -------------------------------------------------
     # SAVE MODEL & PREPROCESSOR
     # -------------------------------------------------
-    joblib.dump(best_model, "models/supply_chain_model.pkl")
-    joblib.dump(preprocessor, "models/supply_chain_preprocessor.pkl")
+    # Written into a staging directory and published at the end, so a
+    # running app never loads a half-written version
+    staging = stage_version("supply_chain")
+    model_path, preprocessor_path = artifact_paths("supply_chain", staging)
+
+    joblib.dump(best_model, model_path)
+    joblib.dump(preprocessor, preprocessor_path)
+
+    # -------------------------------------------------
+    # GLOBAL FEATURE IMPORTANCES (RENDERED BY THE PAGE)
+    # -------------------------------------------------
+    save_importances(
+        "supply_chain",
+        compute_importances(best_model, preprocessor, X_test, y_test),
+        staging
+    )
+
+    # -------------------------------------------------
+    # REFERENCE PROFILE FOR DRIFT MONITORING
+    # -------------------------------------------------
+    save_reference(
+        "supply_chain",
+        build_reference(df, NUMERICAL_FEATURES, CATEGORICAL_FEATURES),
+        staging
+    )
+
+    # -------------------------------------------------
+    # DATA PROFILE FOR INPUT VALIDATION
+    # -------------------------------------------------
+    save_profile(
+        "supply_chain",
+        build_profile(df, NUMERICAL_FEATURES, CATEGORICAL_FEATURES),
+        staging
+    )
+
+    # -------------------------------------------------
+    # PUBLISH (ATOMIC SWAP, HOT-RELOADED BY RUNNING APPS)
+    # -------------------------------------------------
+    publish_version("supply_chain", staging)
 
     return results, best_model_name
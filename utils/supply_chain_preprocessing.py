@@ -1,17 +1,40 @@
 import pandas as pd
 
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import StandardScaler
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
 
+from utils.encoding import categorical_transformers
+
+
+# -------------------------------------------------
+# FEATURE SCHEMA
+# -------------------------------------------------
+CATEGORICAL_FEATURES = [
+    "ProductCategory",
+    "WarehouseLocation",
+    "Supplier"
+]
+
+NUMERICAL_FEATURES = [
+    "LeadTime",
+    "DailyDemand",
+    "MonthlyDemand",
+    "CurrentStock",
+    "ReorderPoint",
+    "HoldingCost",
+    "ShortageCost"
+]
+
 
 def preprocess_supply_chain_data(
     df: pd.DataFrame,
     target_column: str = "Sales",
     test_size: float = 0.2,
-    random_state: int = 42
+    random_state: int = 42,
+    encoding: str | dict = "onehot"
 ):
     """
     Supply Chain Data Preprocessing Pipeline
@@ -51,21 +74,8 @@ def preprocess_supply_chain_data(
     # -------------------------------------------------
     # FEATURE GROUPS (LOCKED)
     # -------------------------------------------------
-    categorical_features = [
-        "ProductCategory",
-        "WarehouseLocation",
-        "Supplier"
-    ]
-
-    numerical_features = [
-        "LeadTime",
-        "DailyDemand",
-        "MonthlyDemand",
-        "CurrentStock",
-        "ReorderPoint",
-        "HoldingCost",
-        "ShortageCost"
-    ]
+    categorical_features = CATEGORICAL_FEATURES
+    numerical_features = NUMERICAL_FEATURES
 
     # -------------------------------------------------
     # NUMERIC PIPELINE
@@ -75,21 +85,13 @@ def preprocess_supply_chain_data(
         ("scaler", StandardScaler())
     ])
 
-    # -------------------------------------------------
-    # CATEGORICAL PIPELINE
-    # -------------------------------------------------
-    categorical_pipeline = Pipeline(steps=[
-        ("imputer", SimpleImputer(strategy="most_frequent")),
-        ("encoder", OneHotEncoder(handle_unknown="ignore"))
-    ])
-
     # -------------------------------------------------
     # COLUMN TRANSFORMER
     # -------------------------------------------------
     preprocessor = ColumnTransformer(
         transformers=[
             ("num", numeric_pipeline, numerical_features),
-            ("cat", categorical_pipeline, categorical_features)
+            *categorical_transformers(categorical_features, encoding, target_type="continuous")
         ]
     )
 
@@ -106,7 +108,8 @@ def preprocess_supply_chain_data(
     # -------------------------------------------------
     # FIT & TRANSFORM
     # -------------------------------------------------
-    X_train_processed = preprocessor.fit_transform(X_train)
+    # y is only used by target encoding (out-of-fold on the training rows)
+    X_train_processed = preprocessor.fit_transform(X_train, y_train)
     X_test_processed = preprocessor.transform(X_test)
 
     return (
@@ -0,0 +1,161 @@
+import json
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from utils.artifacts import MODELS_DIR, profile_path
+
+
+# Reject the whole file when more rows than this cannot be scored
+MAX_ERROR_RATE = 0.5
+
+# Numeric values this far outside the training range (as a share of
+# the range) are flagged as out of range
+RANGE_TOLERANCE = 0.5
+
+
+# -------------------------------------------------
+# PROFILE (TRAINING TIME)
+# -------------------------------------------------
+def build_profile(df, numerical_features, categorical_features):
+    """
+    Compact schema & profile of the training inputs: dtype, null rate
+    and numeric range or allowed categories per model column.
+    """
+    columns = {}
+
+    for col in numerical_features:
+        values = pd.to_numeric(df[col], errors="coerce")
+        columns[col] = {
+            "kind": "numeric",
+            "dtype": str(df[col].dtype),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "null_rate": float(df[col].isna().mean())
+        }
+
+    for col in categorical_features:
+        columns[col] = {
+            "kind": "categorical",
+            "dtype": str(df[col].dtype),
+            "categories": sorted(df[col].dropna().astype(str).unique().tolist()),
+            "null_rate": float(df[col].isna().mean())
+        }
+
+    return {"rows": int(len(df)), "columns": columns}
+
+
+def save_profile(domain, profile, models_dir=MODELS_DIR):
+    with open(profile_path(domain, models_dir), "w", encoding="utf-8") as fh:
+        json.dump(profile, fh, indent=2)
+
+
+# -------------------------------------------------
+# VALIDATION
+# -------------------------------------------------
+@dataclass
+class ValidationResult:
+    """
+    Outcome of validate_frame().
+
+    errors   : rows that cannot be scored (e.g. text in a numeric column)
+    warnings : rows that score but lie outside the training data
+    reasons  : "; "-joined reasons per flagged row ("" when clean)
+    """
+    missing_columns: list
+    errors: np.ndarray = None
+    warnings: np.ndarray = None
+    reasons: pd.Series = None
+    column_issues: dict = field(default_factory=dict)
+
+    @property
+    def rejected(self):
+        return bool(self.missing_columns)
+
+    @property
+    def error_rate(self):
+        if self.errors is None or not len(self.errors):
+            return 0.0
+        return float(self.errors.mean())
+
+    def keep_mask(self, quarantine_warnings=False):
+        """
+        Rows to score: everything but errors (and warnings if requested).
+        """
+        mask = ~self.errors
+        if quarantine_warnings:
+            mask &= ~self.warnings
+        return mask
+
+
+def _add_reason(reasons, mask, text):
+    if mask.any():
+        reasons[mask] = reasons[mask] + text + "; "
+
+
+def validate_frame(df, feature_columns, profile=None, tolerance=RANGE_TOLERANCE):
+    """
+    Check an incoming frame against the training profile before any
+    transform work: one vectorized pass per column, no row loops.
+
+    Without a profile only the presence of the model columns is checked.
+    """
+    missing = [c for c in feature_columns if c not in df.columns]
+    if missing:
+        return ValidationResult(missing_columns=missing)
+
+    n_rows = len(df)
+    errors = np.zeros(n_rows, dtype=bool)
+    warnings = np.zeros(n_rows, dtype=bool)
+    reasons = np.full(n_rows, "", dtype=object)
+    column_issues = {}
+
+    columns = (profile or {}).get("columns", {})
+
+    for col in feature_columns:
+        spec = columns.get(col)
+        if spec is None:
+            continue
+
+        values = df[col]
+        present = values.notna().to_numpy()
+
+        if spec["kind"] == "numeric":
+            numeric = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+
+            bad = present & np.isnan(numeric)
+            errors |= bad
+            _add_reason(reasons, bad, f"{col}: not numeric")
+
+            span = (spec["max"] - spec["min"]) or abs(spec["max"]) or 1.0
+            lo = spec["min"] - tolerance * span
+            hi = spec["max"] + tolerance * span
+            with np.errstate(invalid="ignore"):
+                outside = (numeric < lo) | (numeric > hi)
+            warnings |= outside
+            _add_reason(reasons, outside, f"{col}: outside training range")
+
+            count = int(bad.sum() + outside.sum())
+        else:
+            unseen = present & ~values.astype(str).isin(spec["categories"]).to_numpy()
+            warnings |= unseen
+            _add_reason(reasons, unseen, f"{col}: unseen category")
+
+            count = int(unseen.sum())
+
+        null_rate = 1 - present.mean() if n_rows else 0.0
+        if null_rate > spec["null_rate"] + 0.2:
+            column_issues[col] = f"{null_rate:.0%} missing (training: {spec['null_rate']:.0%})"
+        if count:
+            column_issues.setdefault(col, f"{count:,} flagged rows")
+
+    reasons = pd.Series(reasons, index=df.index).str.rstrip("; ")
+    return ValidationResult(
+        missing_columns=[],
+        errors=errors,
+        warnings=warnings & ~errors,
+        reasons=reasons,
+        column_issues=column_issues
+    )
@@ -0,0 +1,225 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+
+# -------------------------------------------------
+# EVENT SCHEMA
+# -------------------------------------------------
+ACCOUNT_COLUMN = "AccountID"
+TIME_COLUMN = "Timestamp"
+AMOUNT_COLUMN = "TransactionAmount"
+
+VELOCITY_FEATURES = [
+    "VelocityCount",
+    "VelocityAmountSum",
+    "VelocityAmountMax",
+    "MinutesSinceLastTxn"
+]
+
+# Window: the transaction plus up to this many previous ones of the
+# account, no older than DECISIONFORGE_VELOCITY_MINUTES
+VELOCITY_EVENTS = int(os.environ.get("DECISIONFORGE_VELOCITY_EVENTS", "16"))
+VELOCITY_MINUTES = float(os.environ.get("DECISIONFORGE_VELOCITY_MINUTES", "60"))
+
+# Accounts the state arrays hold before they first grow (then doubling)
+INITIAL_ACCOUNTS = 1024
+
+
+def has_velocity_columns(df):
+    return all(c in df.columns for c in (ACCOUNT_COLUMN, TIME_COLUMN, AMOUNT_COLUMN))
+
+
+def velocity_columns(df):
+    """
+    Velocity features present in a frame (none for the static schema).
+    """
+    return [c for c in VELOCITY_FEATURES if c in df.columns]
+
+
+def _seconds(values):
+    """
+    Event times as float seconds: numbers are taken as epoch seconds,
+    anything else is parsed as datetimes. Unparseable times are NaN.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+
+    stamps = pd.to_datetime(values, errors="coerce")
+    if getattr(stamps.dt, "tz", None) is not None:
+        stamps = stamps.dt.tz_convert(None)
+    seconds = stamps.to_numpy(dtype="datetime64[ns]").view("int64") / 1e9
+    return np.where(stamps.isna().to_numpy(), np.nan, seconds)
+
+
+class VelocityEngine:
+    """
+    Per-account sliding-window aggregates over a transaction stream.
+
+    Every account owns one row of fixed-width ring buffers holding the
+    time & amount of its last `events` transactions, plus the position
+    of the newest one. State grows with accounts, not with events, and
+    recording an event writes one slot. A transaction's window is the
+    transaction itself plus the buffered ones of its account at most
+    `minutes` older, so its aggregates cost at most `events` reads.
+
+    Events are processed in batches, vectorized over the batch: within a
+    batch they are ordered by time, across batches each account's events
+    must arrive in time order. The engine pickles as a checkpoint (see
+    save / load) and carries on from where it stopped.
+    """
+
+    def __init__(self, events=VELOCITY_EVENTS, minutes=VELOCITY_MINUTES):
+        self.events = events
+        self.minutes = minutes
+        self.slots = {}
+        self.times = np.full((INITIAL_ACCOUNTS, events), np.nan)
+        self.amounts = np.zeros((INITIAL_ACCOUNTS, events), dtype=np.float32)
+        self.head = np.full(INITIAL_ACCOUNTS, events - 1, dtype=np.int64)
+        self.events_seen = 0
+
+    @property
+    def n_accounts(self):
+        return len(self.slots)
+
+    # -------------------------------------------------
+    # STATE
+    # -------------------------------------------------
+    def _register(self, accounts):
+        """
+        Slots for new accounts, growing the state arrays by doubling.
+        """
+        first = len(self.slots)
+        self.slots.update(zip(accounts, range(first, first + len(accounts))))
+
+        capacity = len(self.head)
+        if len(self.slots) > capacity:
+            grow = max(capacity, len(self.slots) - capacity)
+            self.times = np.vstack([self.times, np.full((grow, self.events), np.nan)])
+            self.amounts = np.vstack([self.amounts, np.zeros((grow, self.events), dtype=np.float32)])
+            self.head = np.r_[self.head, np.full(grow, self.events - 1, dtype=np.int64)]
+
+        return np.arange(first, first + len(accounts))
+
+    # -------------------------------------------------
+    # UPDATE
+    # -------------------------------------------------
+    def update(self, accounts, times, amounts, commit=True):
+        """
+        Velocity features (rows x VELOCITY_FEATURES) of a batch of events,
+        in input order. Each event sees the account's buffered history
+        and the events of the batch before it, never later ones.
+
+        commit=False computes the features without recording the batch,
+        so scoring the same rows twice gives the same answer.
+        """
+        n = len(times)
+        times = np.asarray(times, dtype=float)
+        amounts = np.nan_to_num(np.asarray(amounts, dtype=float))
+
+        groups, uniques = pd.factorize(np.asarray(accounts))
+        uniques = uniques.tolist()
+        slots = np.fromiter((self.slots.get(a, -1) for a in uniques), dtype=np.int64, count=len(uniques))
+        if commit and (slots < 0).any():
+            new = np.flatnonzero(slots < 0)
+            slots[new] = self._register([uniques[i] for i in new])
+
+        # Sorted by account, then time: an account's earlier events of the
+        # batch sit right before each event
+        order = np.lexsort((times, groups))
+        group, t, x = groups[order], times[order], amounts[order]
+        position = np.arange(n)
+        starts = np.r_[True, group[1:] != group[:-1]]
+        rank = position - np.maximum.accumulate(np.where(starts, position, 0))
+
+        slot = slots[group]
+        known = slot >= 0
+        slot = np.where(known, slot, 0)
+        head = self.head[slot]
+
+        window = self.minutes * 60
+        count = np.ones(n)
+        total = x.copy()
+        peak = x.copy()
+        since = np.full(n, np.nan)
+
+        # k-th previous event: from the batch while there is one, then
+        # from the account's ring buffer, newest first
+        for k in range(1, self.events + 1):
+            in_batch = rank >= k
+            earlier = np.maximum(position - k, 0)
+            ring = (head - (k - rank) + 1) % self.events
+
+            prev_t = np.where(in_batch, t[earlier], np.where(known, self.times[slot, ring], np.nan))
+            prev_x = np.where(in_batch, x[earlier], self.amounts[slot, ring])
+
+            gap = t - prev_t
+            if k == 1:
+                since = gap / 60
+
+            inside = gap <= window
+            if not inside.any():
+                break
+            count += inside
+            total += np.where(inside, prev_x, 0)
+            peak = np.maximum(peak, np.where(inside, prev_x, -np.inf))
+
+        if commit:
+            # Only an account's last `events` events of the batch stay buffered
+            sizes = np.bincount(group, minlength=len(uniques))
+            keep = rank >= sizes[group] - self.events
+            ring = (head[keep] + 1 + rank[keep]) % self.events
+            self.times[slot[keep], ring] = t[keep]
+            self.amounts[slot[keep], ring] = x[keep]
+            self.head[slots] = (self.head[slots] + sizes) % self.events
+            self.events_seen += n
+
+        out = np.empty((n, len(VELOCITY_FEATURES)))
+        out[order] = np.column_stack([count, total, peak, since])
+        return out
+
+    def features(self, df, commit=True):
+        """
+        Velocity features of a frame of transactions, indexed like it.
+
+        All-NaN (imputed downstream) for frames without account, time &
+        amount columns and for rows missing an account or a time.
+        """
+        values = np.full((len(df), len(VELOCITY_FEATURES)), np.nan)
+
+        if has_velocity_columns(df):
+            times = _seconds(df[TIME_COLUMN])
+            valid = df[ACCOUNT_COLUMN].notna().to_numpy() & ~np.isnan(times)
+            if valid.any():
+                amounts = pd.to_numeric(df[AMOUNT_COLUMN], errors="coerce").to_numpy(dtype=float)
+                values[valid] = self.update(
+                    df[ACCOUNT_COLUMN].to_numpy()[valid], times[valid], amounts[valid], commit
+                )
+
+        return pd.DataFrame(values, index=df.index, columns=VELOCITY_FEATURES)
+
+    def add_features(self, df, commit=True):
+        """
+        Copy of df with the VELOCITY_FEATURES columns added.
+        """
+        df = df.copy()
+        df[VELOCITY_FEATURES] = self.features(df, commit)
+        return df
+
+    # -------------------------------------------------
+    # CHECKPOINT
+    # -------------------------------------------------
+    def save(self, path):
+        """
+        Checkpoint the state; written to a temporary file and swapped in
+        with os.replace(), so a reader never sees a partial checkpoint.
+        """
+        tmp = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(self, tmp)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        return joblib.load(path)